@@ -0,0 +1,304 @@
+"""Offline accuracy and latency harness for the NL-to-filters graph.
+
+Runs the labeled queries in benchmarks/corpus.json through the full graph with
+a deterministic stub LLM, the real EmbeddingService and an in-memory filter
+store loaded with SAMPLE_FILTERS, so the only moving parts are embeddings,
+search thresholds and node logic. The stub answers concept extraction with
+each query's canned concepts and value filling with the labeled operator and
+value, so a wrong match surfaces as a false positive rather than being hidden
+by the LLM.
+
+Reports p50/p95 per stage (graph nodes and llm/embed/knn calls), throughput,
+precision/recall of the applied filters and operator/value accuracy. With
+--output the report is saved as JSON; --baseline compares against a saved
+report and exits 1 on a regression.
+
+Usage:
+    python -m benchmarks.accuracy_latency --repeat 5 --output results.json
+    python -m benchmarks.accuracy_latency --baseline results.json --latency-tolerance 0.25
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from scripts.sample_filters import SAMPLE_FILTERS
+from src.infrastructure.document_ids import filter_document_id
+from src.infrastructure.embedding_client import get_embedding_service
+from src.infrastructure.llm_client import LLMService
+from src.infrastructure.memory_store import InMemoryFilterStore
+from src.infrastructure.metrics import collect_timings
+from src.models.domain_models import ActiveFilter
+from src.services.catalog import load_catalog
+from src.services.fast_path import RuleBasedExtractor
+from src.services.graph import NLP2FiltersGraph
+from src.services.nodes import GraphNodes
+
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus.json")
+
+# Match entries of the value filling prompt (value_filling_matches.jinja2)
+FILL_MATCH_PATTERN = re.compile(r'"filter_name": "(?P<name>[^"]*)".*?"matched_concept": "(?P<concept>[^"]*)"', re.S)
+
+
+class StubCompletions:
+    """chat.completions stand-in answering from the labeled corpus"""
+
+    def __init__(self, corpus: List[Dict[str, Any]], latency: float = 0.0):
+        self.latency = latency
+        self.concepts = {entry["query"]: entry["concepts"] for entry in corpus}
+        # concept text -> {filter name: labeled operator/value}
+        self.fills: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for entry in corpus:
+            labels = {label["filter"]: label for label in entry["expected"]}
+            for concept in entry["concepts"]:
+                self.fills.setdefault(concept["text"], {}).update(labels)
+
+    def create(self, messages: List[Dict[str, str]], **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        system_prompt, user_prompt = messages[0]["content"], messages[-1]["content"]
+        if user_prompt:
+            content = self.concepts.get(user_prompt, [])
+        else:
+            content = [self._fill(m.group("name"), m.group("concept"))
+                       for m in FILL_MATCH_PATTERN.finditer(system_prompt)]
+
+        message = SimpleNamespace(content=json.dumps(content))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _fill(self, filter_name: str, concept: str) -> Dict[str, Any]:
+        label = self.fills.get(concept, {}).get(filter_name)
+        if label is None:
+            # Unlabeled match, answer something plausible so it lands as a false positive
+            return {"filter_display_name": filter_name, "matched_concept": concept, "operator": "EQUALS",
+                    "value": concept}
+        return {"filter_display_name": filter_name, "matched_concept": concept, "operator": label["operator"],
+                "value": label["value"]}
+
+
+class StubLLMService(LLMService):
+    """LLMService whose client answers from the corpus, generate_completion itself is unchanged"""
+
+    def __init__(self, corpus: List[Dict[str, Any]], latency: float = 0.0):
+        self.completions = StubCompletions(corpus, latency)
+        super().__init__()
+
+    def _create_client(self, config):
+        return SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+
+
+def build_graph(corpus: List[Dict[str, Any]], llm_latency: float, fast_path: bool) -> NLP2FiltersGraph:
+    embedding_service = get_embedding_service()
+    store = InMemoryFilterStore()
+    load_catalog(store, SAMPLE_FILTERS, embedding_service)
+
+    nodes = GraphNodes(
+        llm_service=StubLLMService(corpus, llm_latency),
+        embedding_service=embedding_service,
+        vector_store=store,
+        fast_path=RuleBasedExtractor(SAMPLE_FILTERS) if fast_path else None,
+    )
+    return NLP2FiltersGraph(nodes)
+
+
+def active_filters(labels: List[Dict[str, Any]]) -> List[ActiveFilter]:
+    by_name = {f["displayName"]: f for f in SAMPLE_FILTERS}
+    return [
+        ActiveFilter(
+            filter_id=filter_document_id(by_name[label["filter"]]),
+            filter_name=label["filter"],
+            description=by_name[label["filter"]].get("description", ""),
+            operator=label["operator"],
+            value=label["value"],
+        )
+        for label in labels
+    ]
+
+
+def initial_state(entry: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    return {
+        "query": entry["query"],
+        "active_filters": active_filters(entry.get("active_filters", [])),
+        "clarification_request": [],
+        "concepts": [],
+        "matched_filters": [],
+        "pii_mappings": {},
+        "session_id": session_id,
+        "message": "",
+        "fast_path_applied": False,
+    }
+
+
+def score(entry: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, int]:
+    """Counts for one query: filter name hits/misses, operator and value agreement, clarification match"""
+    expected = {label["filter"]: label for label in entry["expected"]}
+    applied = {f.filter_name: f for f in result.get("active_filters") or []}
+    hits = expected.keys() & applied.keys()
+
+    clarified = {option["filter_name"] for request in result.get("clarification_request") or []
+                 for option in request["options"]}
+    expected_clarification = set(entry.get("clarification", []))
+
+    return {
+        "true_positives": len(hits),
+        "false_positives": len(applied.keys() - expected.keys()),
+        "false_negatives": len(expected.keys() - applied.keys()),
+        "operator_correct": sum(applied[name].operator == expected[name]["operator"] for name in hits),
+        "value_correct": sum(applied[name].value == expected[name]["value"] for name in hits),
+        "clarification_correct": int(clarified == expected_clarification),
+        "exact": int(applied.keys() == expected.keys() and clarified == expected_clarification),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(graph: NLP2FiltersGraph, corpus: List[Dict[str, Any]], repeat: int):
+    stage_samples: Dict[str, List[float]] = {}
+    totals: Dict[str, int] = {}
+    failures = []
+
+    start = time.perf_counter()
+    for run_index in range(repeat):
+        for i, entry in enumerate(corpus):
+            with collect_timings() as timings:
+                query_start = time.perf_counter()
+                result = graph.invoke(initial_state(entry, f"bench-{run_index}-{i}"))
+                timings["total"] = time.perf_counter() - query_start
+
+            for stage, seconds in timings.items():
+                stage_samples.setdefault(stage, []).append(seconds)
+
+            counts = score(entry, result)
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+            if run_index == 0 and not counts["exact"]:
+                failures.append({
+                    "query": entry["query"],
+                    "expected": sorted(label["filter"] for label in entry["expected"]),
+                    "applied": sorted(f.filter_name for f in result.get("active_filters") or []),
+                    "clarification": sorted(option["filter_name"]
+                                            for request in result.get("clarification_request") or []
+                                            for option in request["options"]),
+                })
+    elapsed = time.perf_counter() - start
+
+    return stage_samples, totals, failures, elapsed
+
+
+def report(stage_samples, totals, failures, elapsed, queries: int) -> Dict[str, Any]:
+    tp, fp, fn = totals["true_positives"], totals["false_positives"], totals["false_negatives"]
+    return {
+        "queries": queries,
+        "throughput_qps": queries / elapsed if elapsed else 0.0,
+        "accuracy": {
+            "precision": tp / (tp + fp) if tp + fp else 1.0,
+            "recall": tp / (tp + fn) if tp + fn else 1.0,
+            "operator_accuracy": totals["operator_correct"] / tp if tp else 0.0,
+            "value_accuracy": totals["value_correct"] / tp if tp else 0.0,
+            "clarification_accuracy": totals["clarification_correct"] / queries if queries else 0.0,
+            "exact_match": totals["exact"] / queries if queries else 0.0,
+        },
+        "latency_ms": {
+            stage: {
+                "p50": statistics.median(samples) * 1000,
+                "p95": percentile(samples, 95) * 1000,
+                "count": len(samples),
+            }
+            for stage, samples in sorted(stage_samples.items())
+        },
+        "failures": failures,
+    }
+
+
+def print_report(results: Dict[str, Any]):
+    print(f"{results['queries']} queries, {results['throughput_qps']:.1f} queries/s\n")
+
+    for name, value in results["accuracy"].items():
+        print(f"  {name:<24} {value:.3f}")
+
+    print(f"\n{'stage':<24} | {'p50 ms':>9} | {'p95 ms':>9} | {'count':>6}")
+    print("-" * 58)
+    for stage, stats in results["latency_ms"].items():
+        print(f"{stage:<24} | {stats['p50']:>9.2f} | {stats['p95']:>9.2f} | {stats['count']:>6}")
+
+    if results["failures"]:
+        print(f"\n{len(results['failures'])} queries not matched exactly:")
+        for failure in results["failures"]:
+            print(f"  {failure['query']!r}: expected {failure['expected']}, applied {failure['applied']}"
+                  + (f", clarification {failure['clarification']}" if failure["clarification"] else ""))
+
+
+def regressions(results: Dict[str, Any], baseline: Dict[str, Any],
+                accuracy_tolerance: float, latency_tolerance: float, latency_floor_ms: float) -> List[str]:
+    """Accuracy metrics that dropped and stage p95s that grew beyond the tolerances.
+
+    Latency changes under latency_floor_ms are ignored, sub-millisecond stages are mostly noise.
+    """
+    found = []
+    for name, value in results["accuracy"].items():
+        previous = baseline["accuracy"].get(name)
+        if previous is not None and value < previous - accuracy_tolerance:
+            found.append(f"{name} {previous:.3f} -> {value:.3f}")
+
+    for stage, stats in results["latency_ms"].items():
+        previous = baseline["latency_ms"].get(stage)
+        if previous is None or stats["p95"] - previous["p95"] < latency_floor_ms:
+            continue
+        if stats["p95"] > previous["p95"] * (1 + latency_tolerance):
+            found.append(f"{stage} p95 {previous['p95']:.2f}ms -> {stats['p95']:.2f}ms")
+    return found
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Accuracy and latency of the NL-to-filters graph on a labeled corpus')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus, embeddings are cached after the first')
+    parser.add_argument('--llm-latency', type=float, default=0.0, help='Seconds the stub LLM sleeps per call')
+    parser.add_argument('--fast-path', action='store_true', help='Enable the rule-based extractor')
+    parser.add_argument('--output', help='Save the report as JSON')
+    parser.add_argument('--baseline', help='Saved report to compare against, exits 1 on regression')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.0)
+    parser.add_argument('--latency-tolerance', type=float, default=0.5, help='Allowed relative p95 increase')
+    parser.add_argument('--latency-floor-ms', type=float, default=1.0, help='Ignore p95 increases smaller than this')
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, encoding='utf-8') as f:
+        corpus = json.load(f)
+
+    graph = build_graph(corpus, args.llm_latency, args.fast_path)
+    stage_samples, totals, failures, elapsed = run(graph, corpus, args.repeat)
+    results = report(stage_samples, totals, failures, elapsed, len(corpus) * args.repeat)
+    results["config"] = {"corpus": args.corpus, "repeat": args.repeat,
+                         "llm_latency": args.llm_latency, "fast_path": args.fast_path}
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.accuracy_tolerance, args.latency_tolerance,
+                            args.latency_floor_ms)
+        if found:
+            print("\nRegressions against baseline:")
+            for line in found:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
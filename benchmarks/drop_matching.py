@@ -0,0 +1,93 @@
+"""Micro-benchmark: resolving drop requests against many active filters.
+
+Compares the previous per-drop substring rebuild of active_filters with
+ActiveFilterIndex (one index per request, all drops resolved in one pass),
+and checks the overlapping-name case ("SSN" vs "SSN 2") both ways.
+
+Usage:
+    python -m benchmarks.drop_matching --filters 100 500 1000 --drops 1 5 20
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from src.models.domain_models import ActiveFilter, ExtractedConcept
+from src.services.drop_matcher import ActiveFilterIndex
+
+
+WORDS = ["client", "age", "income", "contact", "date", "status", "account", "balance", "risk",
+         "city", "state", "product", "holding", "last", "open", "marital", "ssn", "region"]
+
+
+def substring_drops(active_filters: List[ActiveFilter], drops: List[ExtractedConcept]) -> List[ActiveFilter]:
+    """Previous handle_drops_node behaviour"""
+    for concept in drops:
+        concept_lower = concept.filter_name.lower()
+        active_filters = [f for f in active_filters if f.filter_name.lower() not in concept_lower]
+    return active_filters
+
+
+def indexed_drops(active_filters: List[ActiveFilter], drops: List[ExtractedConcept]) -> List[ActiveFilter]:
+    dropped = ActiveFilterIndex(active_filters).resolve_all(drops)
+    return [f for i, f in enumerate(active_filters) if i not in dropped]
+
+
+def make_filters(count: int, rng: random.Random) -> List[ActiveFilter]:
+    names = set()
+    while len(names) < count:
+        names.add(" ".join(w.title() for w in rng.sample(WORDS, rng.randint(1, 3))) + f" {len(names)}")
+    return [ActiveFilter(filter_id=str(i), filter_name=name, description="", operator="EQUALS", value=i)
+            for i, name in enumerate(sorted(names))]
+
+
+def drop(name: str) -> ExtractedConcept:
+    return ExtractedConcept(text=f"remove {name}", generated_keywords=[], action="drop", filter_name=name)
+
+
+def check_overlap():
+    active = [ActiveFilter(filter_id=str(i), filter_name=name, description="", operator="EQUALS", value=1)
+              for i, name in enumerate(["SSN", "SSN 2", "Client Age"])]
+    drops = [drop("SSN 2")]
+    print("drop 'SSN 2' from [SSN, SSN 2, Client Age]")
+    print(f"  substring keeps: {[f.filter_name for f in substring_drops(active, drops)]}")
+    print(f"  indexed keeps:   {[f.filter_name for f in indexed_drops(active, drops)]}\n")
+
+
+def measure(fn, active_filters, drops, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(active_filters, drops)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark drop resolution over active filters')
+    parser.add_argument('--filters', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--drops', type=int, nargs='+', default=[1, 5, 20], help='Drop concepts per request')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    check_overlap()
+
+    print(f"{'filters':>7} | {'drops':>5} | {'substring p50 us':>16} | {'indexed p50 us':>14} | {'speedup':>7}")
+    print("-" * 63)
+
+    for count in args.filters:
+        active_filters = make_filters(count, rng)
+        for num_drops in args.drops:
+            drops = [drop(f.filter_name) for f in rng.sample(active_filters, min(num_drops, count))]
+
+            substring_us = measure(substring_drops, active_filters, drops, args.repeat)
+            indexed_us = measure(indexed_drops, active_filters, drops, args.repeat)
+
+            print(f"{count:>7} | {num_drops:>5} | {substring_us:>16.1f} | {indexed_us:>14.1f} | "
+                  f"{substring_us / indexed_us:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Load test sync vs async LLM nodes against a local mock OpenAI-compatible server.
+
+The mock answers /v1/chat/completions after a fixed delay, so the numbers show
+how many chats a single process keeps in flight rather than model speed.
+
+Usage:
+    python -m benchmarks.llm_load_test --requests 200 --concurrency 100 --latency 1.5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from config.settings import LLMConfig
+from src.infrastructure.llm_client import LLMService, AsyncLLMService
+from src.models.domain_models import FilterState, FilterMatch, apply_update
+from src.services.nodes import GraphNodes
+
+
+CONCEPTS_RESPONSE = [
+    {"text": "clients with age over 59", "generated_keywords": ["age", "older than 59"], "action": "add"}
+]
+FILL_RESPONSE = [
+    {"filter_display_name": "Client Age", "operator": "GREATER_THAN", "value": 59}
+]
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    latency: float = 1.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        user_prompt = body["messages"][-1]["content"]
+
+        time.sleep(self.latency)
+
+        content = CONCEPTS_RESPONSE if user_prompt else FILL_RESPONSE
+        payload = json.dumps({
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(content)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def start_mock_server(latency: float) -> ThreadingHTTPServer:
+    handler = type('Handler', (MockOpenAIHandler,), {'latency': latency})
+    server = MockOpenAIServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_state() -> FilterState:
+    return FilterState(
+        query="clients with age over 59",
+        active_filters=[],
+        pii_mappings={},
+        concepts=[],
+        matched_filters=[FilterMatch(
+            filter_id="", filter_name="Client Age", operators=["GREATER_THAN", "LESS_THAN"],
+            options=[], description="Age of the client", confidence=0.9,
+            matched_concept="clients with age over 59"
+        )],
+        clarification_request=[],
+        session_id="load-test"
+    )
+
+
+def report(label: str, latencies: List[float], elapsed: float):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:>6} | {len(latencies) / elapsed:>8.1f} req/s | "
+          f"p50 {statistics.median(latencies):>6.2f}s | p95 {p95:>6.2f}s | total {elapsed:>6.2f}s")
+
+
+def run_sync(nodes: GraphNodes, num_requests: int, threads: int):
+    def chat(_):
+        start = time.perf_counter()
+        state = make_state()
+        state = apply_update(state, nodes.extract_concepts_node(state))
+        nodes.fill_values_node(state)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(chat, range(num_requests)))
+    report("sync", latencies, time.perf_counter() - start)
+
+
+async def run_async(nodes: GraphNodes, num_requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def chat():
+        async with semaphore:
+            start = time.perf_counter()
+            state = make_state()
+            state = apply_update(state, await nodes.aextract_concepts_node(state))
+            await nodes.afill_values_node(state)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(chat() for _ in range(num_requests)))
+    report("async", latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test LLM-bound graph nodes')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=100, help='In-flight chats for the async run')
+    parser.add_argument('--threads', type=int, default=8, help='Worker threads for the sync run (Flask-like)')
+    parser.add_argument('--latency', type=float, default=1.0, help='Mock LLM latency per call in seconds')
+    args = parser.parse_args()
+
+    server = start_mock_server(args.latency)
+
+    class MockLLMConfig(LLMConfig):
+        api_key = "mock"
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    nodes = GraphNodes(
+        llm_service=LLMService(MockLLMConfig),
+        embedding_service=None,
+        vector_store=None,
+        pii_service=None,
+        async_llm_service=AsyncLLMService(MockLLMConfig)
+    )
+
+    print(f"{args.requests} chats, 2 LLM calls each, {args.latency}s mock latency")
+    run_sync(nodes, args.requests, args.threads)
+    asyncio.run(run_async(nodes, args.requests, args.concurrency))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
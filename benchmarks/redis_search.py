@@ -0,0 +1,85 @@
+"""Compare sequential vs pipelined KNN search against a local Redis Stack.
+
+Usage:
+    docker run -d -p 6379:6379 redis/redis-stack-server
+    python -m benchmarks.redis_search --docs 2000 --repeat 50
+"""
+import argparse
+import statistics
+import time
+from typing import List
+
+import numpy as np
+
+from config.settings import RedisConfig
+from src.infrastructure.redis_client import RedisFilterStore
+
+
+class BenchmarkRedisConfig(RedisConfig):
+    redis_index_name: str = "bench_filter_index"
+
+
+def sequential_search(store: RedisFilterStore, embeddings: List[np.ndarray], top_k: int) -> List[List[dict]]:
+    """Previous behaviour: one FT.SEARCH round trip per concept"""
+    return [store.search_filters(embedding, top_k, score_threshold=2.0) for embedding in embeddings]
+
+
+def pipelined_search(store: RedisFilterStore, embeddings: List[np.ndarray], top_k: int) -> List[List[dict]]:
+    return store.search_filters_batch(embeddings, top_k, score_threshold=2.0)
+
+
+def populate(store: RedisFilterStore, num_docs: int, dimension: int, rng: np.random.Generator):
+    store.create_index()
+
+    texts = [f"benchmark filter {i}" for i in range(num_docs)]
+    metadatas = [{"id": str(i), "displayName": f"Filter {i}", "operators": ["EQUALS"]} for i in range(num_docs)]
+    embeddings = rng.standard_normal((num_docs, dimension), dtype=np.float32)
+
+    store.add_documents(texts, metadatas, embeddings)
+
+
+def measure(fn, store, embeddings, top_k: int, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(store, embeddings, top_k)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched Redis KNN search')
+    parser.add_argument('--docs', type=int, default=2000, help='Number of random documents to index')
+    parser.add_argument('--concepts', type=int, nargs='+', default=[1, 2, 4, 6, 8, 12])
+    parser.add_argument('--top-k', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--keep-index', action='store_true', help='Do not drop the benchmark index afterwards')
+    args = parser.parse_args()
+
+    config = BenchmarkRedisConfig
+    store = RedisFilterStore(config)
+    rng = np.random.default_rng(42)
+
+    populate(store, args.docs, config.redis_embedding_dimension, rng)
+
+    print(f"{'concepts':>8} | {'loop p50 ms':>12} | {'pipeline p50 ms':>15} | {'speedup':>7}")
+    print("-" * 52)
+
+    try:
+        for num_concepts in args.concepts:
+            embeddings = list(rng.standard_normal((num_concepts, config.redis_embedding_dimension), dtype=np.float32))
+
+            # Sanity check: both paths must return identical results
+            assert sequential_search(store, embeddings, args.top_k) == pipelined_search(store, embeddings, args.top_k)
+
+            loop_ms = statistics.median(measure(sequential_search, store, embeddings, args.top_k, args.repeat))
+            pipe_ms = statistics.median(measure(pipelined_search, store, embeddings, args.top_k, args.repeat))
+
+            print(f"{num_concepts:>8} | {loop_ms:>12.2f} | {pipe_ms:>15.2f} | {loop_ms / pipe_ms:>6.1f}x")
+    finally:
+        if not args.keep_index:
+            store.redis_client.ft(config.redis_index_name).dropindex(delete_documents=True)
+
+
+if __name__ == "__main__":
+    main()
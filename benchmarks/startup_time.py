@@ -0,0 +1,107 @@
+"""Measure how long `run.py` takes to become usable.
+
+console:  launch until the console banner is printed (the user can type)
+api-only: launch until /health answers ("serving") and until it reports the
+          chat service as built ("ready", models loaded by the warm-up hook)
+
+Usage:
+    python -m benchmarks.startup_time --modes console api-only --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import requests
+
+
+CONSOLE_READY_MARKER = "Commands:"
+
+
+def launch(mode: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, FLASK_PORT=str(port), PYTHONUNBUFFERED="1")
+    return subprocess.Popen(
+        [sys.executable, "run.py", "--mode", mode, "--api-url", f"http://localhost:{port}"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+    )
+
+
+def stop(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def time_console(port: int, timeout: float) -> Dict[str, float]:
+    start = time.perf_counter()
+    process = launch("console", port)
+    try:
+        for line in process.stdout:
+            if CONSOLE_READY_MARKER in line:
+                return {"prompt": time.perf_counter() - start}
+            if time.perf_counter() - start > timeout:
+                break
+        raise RuntimeError("Console banner never appeared")
+    finally:
+        stop(process)
+
+
+def time_api(port: int, timeout: float) -> Dict[str, float]:
+    start = time.perf_counter()
+    process = launch("api-only", port)
+    timings = {}
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"run.py exited with code {process.returncode}")
+            try:
+                health = requests.get(f"http://localhost:{port}/health", timeout=0.5).json()
+            except requests.RequestException:
+                time.sleep(0.02)
+                continue
+
+            timings.setdefault("serving", time.perf_counter() - start)
+            if health.get("ready", True):
+                timings["ready"] = time.perf_counter() - start
+                return timings
+            time.sleep(0.02)
+        raise RuntimeError("API did not become ready in time")
+    finally:
+        stop(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark run.py startup time')
+    parser.add_argument('--modes', nargs='+', choices=['console', 'api-only'], default=['console', 'api-only'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--port', type=int, default=5099, help='Port for the API started by run.py')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Seconds to wait per launch')
+    args = parser.parse_args()
+
+    runners = {"console": time_console, "api-only": time_api}
+
+    print(f"{'mode':>9} | {'milestone':>9} | {'p50 s':>7} | {'min s':>7} | {'max s':>7}")
+    print("-" * 52)
+
+    for mode in args.modes:
+        samples: Dict[str, List[float]] = {}
+        for _ in range(args.repeat):
+            for milestone, seconds in runners[mode](args.port, args.timeout).items():
+                samples.setdefault(milestone, []).append(seconds)
+
+        for milestone, values in samples.items():
+            print(f"{mode:>9} | {milestone:>9} | {statistics.median(values):>7.2f} | "
+                  f"{min(values):>7.2f} | {max(values):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Micro-benchmark: per-request state overhead of the non-LLM graph nodes.
+
+Compares the previous nodes, which rebuilt a full FilterState and copied every
+list in each node, with the partial updates they return now. It covers
+handle_drops (no drops), merging filled values and prepare_response, run
+against an increasing number of active filters, both called directly and
+through a compiled graph (where fewer written channels also means less
+LangGraph bookkeeping). It also compares the memory of slotted and regular
+dataclass instances.
+
+Usage:
+    python -m benchmarks.state_updates --filters 10 100 1000 5000 --matches 3
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from langgraph.graph import StateGraph, END
+
+from src.models.domain_models import ActiveFilter, FilterMatch, FilterState
+from src.services.nodes import GraphNodes
+from src.services.value_filling import fill_key
+
+
+@dataclass
+class DictActiveFilter:
+    """ActiveFilter without slots, as it was"""
+    filter_id: str
+    filter_name: str
+    description: str
+    operator: str
+    value: Any
+
+
+def rebuild(state: FilterState, **changes) -> FilterState:
+    fields = dict(query=state.query, pii_mappings=state.pii_mappings, concepts=state.concepts,
+                  matched_filters=state.matched_filters, clarification_request=state.clarification_request,
+                  active_filters=state.active_filters, message=state.message, session_id=state.session_id)
+    fields.update(changes)
+    return FilterState(**fields)
+
+
+def legacy_handle_drops(state: FilterState) -> FilterState:
+    concepts = state.concepts.copy() if state.concepts else []
+    active_filters = state.active_filters.copy() if state.active_filters else []
+    drop_concepts = [c for c in concepts if c.action == "drop"]
+    if not drop_concepts:
+        return state
+    return rebuild(state, concepts=concepts, active_filters=active_filters)
+
+
+def legacy_fill(state: FilterState, results: Dict[str, Dict[str, Any]]) -> FilterState:
+    new_active_filters = state.active_filters.copy() if state.active_filters else []
+    new_clarification_requests = state.clarification_request.copy() if state.clarification_request else []
+    for match in state.matched_filters:
+        result = results.get(match.filter_name, {})
+        active_filter = ActiveFilter(filter_id=match.filter_id, filter_name=match.filter_name,
+                                     description=match.description, operator=result.get('operator', 'EQUAL'),
+                                     value=result.get('value', ''))
+        new_active_filters = [f for f in new_active_filters if f.filter_name != match.filter_name]
+        new_active_filters.append(active_filter)
+    return rebuild(state, active_filters=new_active_filters, clarification_request=new_clarification_requests)
+
+
+def legacy_prepare_response(state: FilterState) -> FilterState:
+    active_filters = state.active_filters.copy() if state.active_filters else []
+    return rebuild(state, active_filters=active_filters, message=f"Applied {len(active_filters)} filter(s)")
+
+
+def legacy_nodes(nodes: GraphNodes, state: FilterState, results) -> FilterState:
+    state = legacy_handle_drops(state)
+    state = legacy_fill(state, results)
+    return legacy_prepare_response(state)
+
+
+def partial_nodes(nodes: GraphNodes, state: FilterState, results) -> Dict[str, Any]:
+    # Same input state for each node: none of them changes what the next one reads here
+    nodes.handle_drops_node(state)
+    update = nodes._with_filled_values(state, results, [])
+    nodes.prepare_response_node(state)
+    return update
+
+
+def build_graph(handle_drops, fill, prepare_response):
+    workflow = StateGraph(FilterState)
+    workflow.add_node("handle_drops", handle_drops)
+    workflow.add_node("fill_values", fill)
+    workflow.add_node("prepare_response", prepare_response)
+    workflow.add_edge("handle_drops", "fill_values")
+    workflow.add_edge("fill_values", "prepare_response")
+    workflow.add_edge("prepare_response", END)
+    workflow.set_entry_point("handle_drops")
+    return workflow.compile()
+
+
+def graph_runs(nodes: GraphNodes, results):
+    legacy = build_graph(legacy_handle_drops, lambda state: legacy_fill(state, results), legacy_prepare_response)
+    partial = build_graph(nodes.handle_drops_node, lambda state: nodes._with_filled_values(state, results, []),
+                          nodes.prepare_response_node)
+    return lambda _, state, __: legacy.invoke(state), lambda _, state, __: partial.invoke(state)
+
+
+def make_state(num_filters: int, num_matches: int):
+    active_filters = [ActiveFilter(filter_id=str(i), filter_name=f"Filter {i}", description="",
+                                   operator="EQUALS", value=i) for i in range(num_filters)]
+    matches = [FilterMatch(filter_id=f"new-{i}", filter_name=f"New Filter {i}", operators=["EQUALS"], options=[],
+                           description="", confidence=0.9, matched_concept=f"concept {i}")
+               for i in range(num_matches)]
+    results = {fill_key(m): {"filter_display_name": m.filter_name, "operator": "EQUALS", "value": 1}
+               for m in matches}
+    state = FilterState(query="q", active_filters=active_filters, pii_mappings={}, concepts=[],
+                        matched_filters=matches, clarification_request=[], session_id="bench")
+    return state, results
+
+
+def measure(fn, nodes, state, results, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(nodes, state, results)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    tracemalloc.start()
+    fn(nodes, state, results)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def instance_memory(cls, count: int) -> float:
+    tracemalloc.start()
+    items = [cls(str(i), f"Filter {i}", "", "EQUALS", i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark full-state rebuilds vs partial node updates')
+    parser.add_argument('--filters', type=int, nargs='+', default=[10, 100, 1000, 5000], help='Active filters')
+    parser.add_argument('--matches', type=int, default=3, help='New matches filled per request')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    nodes = GraphNodes(llm_service=None, embedding_service=None, vector_store=None)
+
+    print(f"bytes per filter instance: dict {instance_memory(DictActiveFilter, 10000):.0f}, "
+          f"slots {instance_memory(ActiveFilter, 10000):.0f}\n")
+
+    print(f"{'run':>5} | {'filters':>7} | {'rebuild p50 us':>14} | {'partial p50 us':>14} | {'speedup':>7} | "
+          f"{'rebuild KiB':>11} | {'partial KiB':>11}")
+    print("-" * 88)
+
+    for count in args.filters:
+        state, results = make_state(count, args.matches)
+        runs = {"nodes": (legacy_nodes, partial_nodes), "graph": graph_runs(nodes, results)}
+        for label, (legacy_fn, partial_fn) in runs.items():
+            legacy_us, legacy_kib = measure(legacy_fn, nodes, state, results, args.repeat)
+            partial_us, partial_kib = measure(partial_fn, nodes, state, results, args.repeat)
+
+            print(f"{label:>5} | {count:>7} | {legacy_us:>14.1f} | {partial_us:>14.1f} | "
+                  f"{legacy_us / partial_us:>6.1f}x | {legacy_kib:>11.1f} | {partial_kib:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
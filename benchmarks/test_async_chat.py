@@ -0,0 +1,144 @@
+"""Single-turn chats through the async graph share one event loop.
+
+GraphNodes and the compiled graph are real; the LLM is a stub that sleeps
+before answering, embeddings are bags of words and the catalog is one
+filter in an InMemoryFilterStore.
+
+Usage:
+    python -m pytest benchmarks/test_async_chat.py
+"""
+import asyncio
+import json
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from config.settings import BatchConfig, VectorStoreConfig
+from src.infrastructure.chat_client import ChatService
+from src.infrastructure.checkpointer import SessionCheckpointer
+from src.infrastructure.memory_store import InMemoryFilterStore
+from src.infrastructure.session_store import SessionStore
+from src.services.catalog import load_catalog
+from src.services.graph import NLP2FiltersGraph
+from src.services.nodes import GraphNodes
+
+
+LLM_LATENCY = 0.2
+TURNS = 10
+
+CATALOG = [{"id": "age", "displayName": "Client Age", "description": "client age", "type": "NUMBER",
+            "operators": ["GREATER_THAN", "LESS_THAN"]}]
+
+
+class StoreConfig(VectorStoreConfig):
+    memory_index_type = "exact"
+    memory_embedding_dimension = 64
+    category_prefilter = False
+
+
+class WordEmbeddings:
+    def embed_batch(self, texts):
+        vectors = np.zeros((len(texts), StoreConfig.memory_embedding_dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().replace(",", " ").split():
+                vectors[row, zlib.crc32(word.encode()) % vectors.shape[1]] = 1.0
+        return list(vectors)
+
+
+def _answer(system_prompt: str, json_mode: bool) -> str:
+    if json_mode:
+        return json.dumps([{"text": "client age", "generated_keywords": ["age"], "action": "add"}])
+    return json.dumps([{"filter_display_name": "Client Age", "operator": "GREATER_THAN", "value": 59}])
+
+
+class SlowLLM:
+    def generate_completion(self, system_prompt: str, user_prompt: str, json_mode: bool = False) -> str:
+        time.sleep(LLM_LATENCY)
+        return _answer(system_prompt, json_mode)
+
+
+class SlowAsyncLLM:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_completion(self, system_prompt: str, user_prompt: str, json_mode: bool = False) -> str:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(LLM_LATENCY)
+        finally:
+            self.in_flight -= 1
+        return _answer(system_prompt, json_mode)
+
+
+def chat_service(async_llm) -> ChatService:
+    embeddings = WordEmbeddings()
+    store = InMemoryFilterStore(StoreConfig)
+    load_catalog(store, CATALOG, embeddings)
+    nodes = GraphNodes(llm_service=SlowLLM(), embedding_service=embeddings, vector_store=store,
+                       async_llm_service=async_llm, search_config=StoreConfig)
+
+    # Only what the single-turn path touches, ChatService() would build the production workflow
+    service = ChatService.__new__(ChatService)
+    service.workflow = NLP2FiltersGraph(nodes, checkpointer=SessionCheckpointer())
+    service.session_store = SessionStore()
+    service.batch_config = BatchConfig
+    service.response_cache = None
+    service._loop = None
+    service._loop_lock = threading.Lock()
+    return service
+
+
+def test_concurrent_turns_share_one_loop():
+    async_llm = SlowAsyncLLM()
+    service = chat_service(async_llm)
+
+    async def run():
+        return await asyncio.gather(*(
+            service.aprocess_chat_request("clients with client age over 59") for _ in range(TURNS)
+        ))
+
+    start = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    # Two LLM round trips per turn; run one after another this would take TURNS times as long
+    assert elapsed < 4 * LLM_LATENCY
+    assert async_llm.peak == TURNS
+    for response in responses:
+        assert [(f.filter_name, f.operator, f.value) for f in response["active_filters"]] == \
+            [("Client Age", "GREATER_THAN", 59)]
+
+
+def test_sync_callers_run_on_the_service_loop():
+    async_llm = SlowAsyncLLM()
+    service = chat_service(async_llm)
+    responses = []
+
+    def turn():
+        responses.append(service.process_chat_request("clients with client age over 59"))
+
+    threads = [threading.Thread(target=turn) for _ in range(TURNS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 4 * LLM_LATENCY
+    assert async_llm.peak == TURNS
+    assert len(responses) == TURNS
+
+
+def test_stream_events_from_the_service_loop():
+    service = chat_service(SlowAsyncLLM())
+
+    events = list(service.stream_chat_request("clients with client age over 59"))
+
+    assert [event for event, _ in events] == \
+        ["concepts_extracted", "filters_dropped", "matches_found", "filters_filled", "done"]
+    assert events[-1][1]["active_filters"][0].operator == "GREATER_THAN"
@@ -0,0 +1,43 @@
+"""Sessions resumed from SessionCheckpointer with strict deserialization.
+
+Usage:
+    python -m pytest benchmarks/test_checkpointer.py
+"""
+import logging
+from dataclasses import dataclass
+
+from benchmarks.test_async_chat import SlowAsyncLLM, chat_service
+from src.infrastructure.checkpointer import SessionCheckpointer
+from src.models.domain_models import ActiveFilter, ExtractedConcept, FilterMatch
+
+
+@dataclass
+class Unlisted:
+    value: int
+
+
+def test_serializer_is_strict():
+    serde = SessionCheckpointer().serde
+
+    # Only allowlisted types are revived, anything else comes back as its raw payload
+    assert isinstance(serde.loads_typed(serde.dumps_typed(ActiveFilter("age", "Client Age", "", "EQUALS", 1))),
+                      ActiveFilter)
+    assert not isinstance(serde.loads_typed(serde.dumps_typed(Unlisted(1))), Unlisted)
+
+
+def test_resume_session_without_unregistered_types(caplog):
+    service = chat_service(SlowAsyncLLM())
+    workflow = service.workflow
+
+    with caplog.at_level(logging.WARNING, logger="langgraph"):
+        first = service.process_chat_request("clients with client age over 59")
+        second = service.process_chat_request("clients with client age over 59", session_id=first["session_id"])
+
+        state = workflow.graph.get_state(workflow._run_config({"session_id": first["session_id"]})).values
+
+    assert [record.getMessage() for record in caplog.records if record.name.startswith("langgraph")] == []
+    assert [(f.filter_name, f.operator, f.value) for f in second["active_filters"]] == \
+        [("Client Age", "GREATER_THAN", 59)]
+    assert all(isinstance(f, ActiveFilter) for f in state["active_filters"])
+    assert all(isinstance(c, ExtractedConcept) for c in state["concepts"])
+    assert all(isinstance(m, FilterMatch) for m in state["matched_filters"])
@@ -0,0 +1,40 @@
+"""Regression checks for ActiveFilterIndex, alongside benchmarks/drop_matching.py.
+
+Usage:
+    python -m pytest benchmarks/test_drop_matching.py
+"""
+from benchmarks.drop_matching import drop, substring_drops
+from src.models.domain_models import ActiveFilter
+from src.services.drop_matcher import ActiveFilterIndex
+
+
+def active(*names):
+    return [ActiveFilter(filter_id=str(i), filter_name=name, description="", operator="EQUALS", value=1)
+            for i, name in enumerate(names)]
+
+
+def kept(active_filters, phrase):
+    dropped = ActiveFilterIndex(active_filters).resolve_all([drop(phrase)])
+    return [f.filter_name for i, f in enumerate(active_filters) if i not in dropped]
+
+
+def test_exact_name_does_not_drop_longer_name():
+    assert kept(active("SSN", "SSN 2", "Client Age"), "SSN") == ["SSN 2", "Client Age"]
+    assert kept(active("SSN", "SSN 2", "Client Age"), "SSN 2") == ["SSN", "Client Age"]
+
+
+def test_drop_tokens_inside_filter_name():
+    assert kept(active("Client Age", "Income"), "age") == ["Income"]
+
+
+def test_filter_name_inside_drop_phrase():
+    # Dropped by the substring rule before the index, must still drop without an embedding service
+    filters = active("Client Age", "Income")
+    assert [f.filter_name for f in substring_drops(filters, [drop("client age restriction")])] == ["Income"]
+    assert kept(filters, "client age restriction") == ["Income"]
+    assert kept(filters, "the client age filter please") == ["Income"]
+
+
+def test_ambiguous_containment_drops_nothing():
+    assert kept(active("Client Age", "Income"), "client age and income") == ["Client Age", "Income"]
+    assert kept(active("Client Age", "Client Age"), "client age restriction") == []
@@ -0,0 +1,55 @@
+"""RuleBasedExtractor against the sample catalog.
+
+Usage:
+    python -m pytest benchmarks/test_fast_path.py
+"""
+import pytest
+
+from scripts.sample_filters import SAMPLE_FILTERS
+from src.services.fast_path import RuleBasedExtractor
+
+
+extractor = RuleBasedExtractor(SAMPLE_FILTERS)
+
+
+def extract(query):
+    filters = extractor.extract(query)
+    return None if filters is None else [(f.filter_name, f.operator, f.value) for f in filters]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("clients older than 59", ("Client Age", "GREATER_THAN", 59)),
+    ("age > 59", ("Client Age", "GREATER_THAN", 59)),
+    ("age under 30", ("Client Age", "LESS_THAN", 30)),
+    ("age < 30", ("Client Age", "LESS_THAN", 30)),
+    ("age = 30", ("Client Age", "EQUALS", 30)),
+    ("age exactly 30 years old", ("Client Age", "EQUALS", 30)),
+    ("balance over $100k", ("Account Balance", "GREATER_THAN", 100000)),
+    ("balance over 1,000,000", ("Account Balance", "GREATER_THAN", 1000000)),
+    ("age between 30 and 40", ("Client Age", "BETWEEN", [30, 40])),
+])
+def test_comparison_operators(query, expected):
+    assert extract(query) == [expected]
+
+
+@pytest.mark.parametrize("query", [
+    # No inclusive or negated operators in the catalog, these must not degrade to EQUALS/GREATER_THAN
+    "age >= 59",
+    "age <= 30",
+    "age != 30",
+    "age => 30",
+    "age == 30",
+    "balance >= 100k",
+    # Leftover digits and symbols are not covered
+    "age over 30 40",
+    "age over 30 #1",
+])
+def test_uncovered_symbols_fall_back(query):
+    assert extract(query) is None
+
+
+def test_sentence_punctuation_is_filler():
+    assert extract("Clients older than 50.") == [("Client Age", "GREATER_THAN", 50)]
+    assert extract("clients older than 50!") == [("Client Age", "GREATER_THAN", 50)]
+    assert extract("married clients, older than 50?") == \
+        [("Marital Status", "EQUALS", ["Married"]), ("Client Age", "GREATER_THAN", 50)]
@@ -0,0 +1,128 @@
+"""RedisFilterStore.search_filters_batch against fakeredis.
+
+fakeredis has no search module, so FT.SEARCH (brute-force cosine KNN over
+the index's hashes), FT.INFO and FT.DROPINDEX are added to its socket here,
+with the alias always pointing at INDEX. The client
+side, the pipeline with the catalog version GET, reply parsing and catalog
+hydration, is the real code.
+
+Usage:
+    python -m pytest benchmarks/test_redis_search.py
+"""
+import re
+
+import numpy as np
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from fakeredis._commands import command
+from fakeredis._socket import FakeSocket
+from fakeredis._clients._sync import FakeRedisConnection
+
+from config.settings import RedisConfig
+from src.infrastructure.redis_client import RedisFilterStore
+
+
+ALIAS = RedisConfig.redis_index_name
+INDEX = f"{ALIAS}_v1"
+
+_KNN = re.compile(r"^(?:\(@(\w+):\{(.*)\}\)|\*)=>\[KNN (\d+) @embedding \$vec AS score\]$")
+
+
+class SearchSocket(FakeSocket):
+    dropped = []
+
+    @command(name="FT.INFO", fixed=(bytes,))
+    def ft_info(self, index: bytes):
+        return [b"index_name", INDEX.encode(), b"indexing", 0, b"percent_indexed", b"1"]
+
+    @command(name="FT.DROPINDEX", fixed=(bytes,), repeat=(bytes,))
+    def ft_dropindex(self, index: bytes, *args: bytes):
+        self.dropped.append(index.decode())
+        return b"OK"
+
+    @command(name="FT.SEARCH", fixed=(bytes, bytes), repeat=(bytes,))
+    def ft_search(self, index: bytes, query: bytes, *args: bytes):
+        match = _KNN.match(query.decode())
+        tag_field, tag_value, top_k = match.group(1), match.group(2), int(match.group(3))
+        vec = np.frombuffer(args[list(args).index(b"vec") + 1], dtype=np.float32)
+
+        hits = []
+        for key in self._db.keys():
+            if not key.startswith(f"{INDEX}:".encode()):
+                continue
+            doc = self._db[key].value
+            if tag_field and doc.get(tag_field.encode(), b"").decode() != re.sub(r"\\(.)", r"\1", tag_value):
+                continue
+            embedding = np.frombuffer(doc[b"embedding"], dtype=np.float32)
+            distance = 1 - float(vec @ embedding / (np.linalg.norm(vec) * np.linalg.norm(embedding)))
+            hits.append((distance, key))
+
+        hits = sorted(hits)[:top_k]
+        reply = [len(hits)]
+        for distance, key in hits:
+            reply += [key, [b"score", repr(distance).encode()]]
+        return reply
+
+
+class SearchConnection(FakeRedisConnection):
+    def _connect(self):
+        return SearchSocket(self._server, db=self.db, lua_modules=self._lua_modules, client_class=self._client_class)
+
+
+@pytest.fixture
+def store():
+    store = RedisFilterStore()
+    store.redis_client = fakeredis.FakeRedis(connection_class=SearchConnection)
+    SearchSocket.dropped.clear()
+
+    metadatas = [
+        {"id": "age", "displayName": "Client Age", "category": "Client Info"},
+        {"id": "income", "displayName": "Income", "category": "Financial"},
+        {"id": "marital", "displayName": "Marital Status", "category": "Client Info"},
+    ]
+    embeddings = np.eye(3, RedisConfig.redis_embedding_dimension, dtype=np.float32)
+    store.write_documents([store.document_key(INDEX, m["id"]) for m in metadatas],
+                          [m["displayName"] for m in metadatas], metadatas, embeddings)
+    store.bump_catalog_version()
+    return store
+
+
+def _query(*weights):
+    query = np.zeros(RedisConfig.redis_embedding_dimension, dtype=np.float32)
+    query[:len(weights)] = weights
+    return query
+
+
+def test_batch_results_in_input_order(store):
+    results = store.search_filters_batch([_query(0, 1), _query(1)], top_k=1)
+
+    assert [[hit["display_name"] for hit in hits] for hits in results] == [["Income"], ["Client Age"]]
+    assert results[1][0]["filter_id"] == "age"
+    assert results[1][0]["confidence"] == pytest.approx(1.0)
+    assert store._catalog_version == 1
+
+
+def test_category_prefilter(store):
+    results = store.search_filters_batch([_query(0, 1, 1)], top_k=1, categories=["Client Info"])
+
+    assert [hit["display_name"] for hit in results[0]] == ["Marital Status"]
+
+
+def test_catalog_reloaded_after_version_bump(store):
+    store.search_filters([_query(1)])
+    store.write_documents([store.document_key(INDEX, "age")], ["Age"],
+                          [{"id": "age", "displayName": "Age"}], [_query(1)])
+    store.bump_catalog_version()
+
+    assert store.search_filters([_query(1)], top_k=1)[0]["display_name"] == "Age"
+    assert store._catalog_version == 2
+
+
+def test_versioned_index_never_replaces_live_index(store):
+    # Version counter reset while the alias still points at INDEX (_v1)
+    store.redis_client.delete(store._catalog_version_key())
+
+    assert store.create_versioned_index() == f"{ALIAS}_v2"
+    assert SearchSocket.dropped == [f"{ALIAS}_v2"]
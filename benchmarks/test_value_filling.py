@@ -0,0 +1,82 @@
+"""Value filling when several concepts of a query match the same filter.
+
+Usage:
+    python -m pytest benchmarks/test_value_filling.py
+"""
+import json
+import re
+
+from src.models.domain_models import ActiveFilter, FilterMatch, FilterState
+from src.services.nodes import GraphNodes
+from src.services.value_filling import fill_key, parse_fill_results
+
+
+FILLS = {
+    "older than 30": {"operator": "GREATER_THAN", "value": 30},
+    "younger than 60": {"operator": "LESS_THAN", "value": 60},
+}
+
+
+class FillingLLM:
+    """Answers a value filling prompt from FILLS, echoing each match's concept"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_completion(self, system_prompt: str, user_prompt: str, json_mode: bool = False) -> str:
+        self.calls += 1
+        tail = system_prompt.split("**FilterMatches:**")[-1]
+        matches = re.findall(r'"filter_name": "([^"]*)".*?"matched_concept": "([^"]*)"', tail, re.S)
+        return json.dumps([{"filter_display_name": name, "matched_concept": concept, **FILLS[concept]}
+                           for name, concept in matches])
+
+
+def age_match(concept):
+    return FilterMatch(filter_id="client-age", filter_name="Client Age", operators=["GREATER_THAN", "LESS_THAN"],
+                       options=[], description="Age of the client", confidence=0.9, matched_concept=concept)
+
+
+def state(matches, active_filters=(), fill_memo=None):
+    return FilterState(query="older than 30 but younger than 60", active_filters=list(active_filters),
+                       pii_mappings={}, concepts=[], matched_filters=matches, clarification_request=[],
+                       session_id="s", fill_memo=fill_memo or {})
+
+
+def test_two_concepts_fill_the_same_filter():
+    llm = FillingLLM()
+    nodes = GraphNodes(llm_service=llm, embedding_service=None, vector_store=None)
+    previous = ActiveFilter(filter_id="client-age", filter_name="Client Age", description="", operator="EQUALS",
+                            value=45)
+    matches = [age_match("older than 30"), age_match("younger than 60")]
+
+    update = nodes.fill_values_node(state(matches, [previous]))
+
+    assert [(f.filter_name, f.operator, f.value) for f in update["active_filters"]] == \
+        [("Client Age", "GREATER_THAN", 30), ("Client Age", "LESS_THAN", 60)]
+    assert set(update["fill_memo"]) == {fill_key(match) for match in matches}
+    assert llm.calls == 1
+
+    # Next turn, both come from the memo
+    update = nodes.fill_values_node(state(matches, fill_memo=update["fill_memo"]))
+    assert [(f.operator, f.value) for f in update["active_filters"]] == [("GREATER_THAN", 30), ("LESS_THAN", 60)]
+    assert llm.calls == 1
+
+
+def test_shared_filter_without_concept_is_retried():
+    matches = [age_match("older than 30"), age_match("younger than 60")]
+    response = json.dumps([{"filter_display_name": "Client Age", "operator": "GREATER_THAN", "value": 30}])
+
+    results, retry = parse_fill_results(response, matches)
+
+    assert results == {}
+    assert retry == matches
+
+
+def test_unique_filter_needs_no_concept():
+    match = age_match("older than 30")
+    response = json.dumps([{"filter_display_name": "Client Age", "operator": "GREATER_THAN", "value": 30}])
+
+    results, retry = parse_fill_results(response, [match])
+
+    assert results[fill_key(match)]["value"] == 30
+    assert retry == []
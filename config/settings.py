@@ -11,8 +11,19 @@ class LLMConfig:
     max_tokens: int = 3000
     llm_model: str = "gpt-4o-mini"
     api_key: str = os.getenv("OPENAI_API_KEY")
+    base_url: Optional[str] = os.getenv("OPENAI_BASE_URL")
     max_retries: int = 3
     max_delay: int = 1
+    # Value filling: one call for small requests, parallel fan-out for large ones
+    fill_max_matches_per_call: int = 6
+    fill_token_budget: int = 800  # estimated prompt tail + completion tokens per call
+    fill_max_parallel_calls: int = 4
+    fill_parse_retries: int = 1  # re-ask only for the items that failed to parse
+    # Record/replay of completions for offline load tests, see llm_cassette.py
+    cassette_mode: Optional[str] = os.getenv("LLM_CASSETTE_MODE")  # record | replay | None
+    cassette_path: str = os.getenv("LLM_CASSETTE_PATH", "llm_cassette.jsonl")
+    cassette_latency: str = os.getenv("LLM_CASSETTE_LATENCY", "recorded")  # recorded | sampled | none
+    cassette_latency_scale: float = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "1.0"))
 
 class EmbeddingConfig:
     embedding_model: str = "all-MiniLM-L6-v2"
@@ -25,8 +36,78 @@ class RedisConfig:
     redis_db: int = 0
     redis_index_name: str = "filter_index"
     redis_embedding_dimension: int = EmbeddingConfig.embedding_dimension
+    # One blocking pool per process, shared by the filter store, caches and session store
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    redis_pool_timeout: float = float(os.getenv("REDIS_POOL_TIMEOUT", 5))  # seconds to wait for a free connection
+    redis_socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+    redis_socket_connect_timeout: float = float(os.getenv("REDIS_CONNECT_TIMEOUT", 2))
+    redis_health_check_interval: int = 30  # seconds idle before a connection is PINGed on checkout
+    redis_retries: int = 3  # on connection errors and timeouts
+    redis_retry_backoff_base: float = 0.05  # seconds, exponential with jitter
+    redis_retry_backoff_cap: float = 1.0
+
+class IngestConfig:
+    ingest_batch_size: int = int(os.getenv("INGEST_BATCH_SIZE", 1000))  # documents per embed + write round
+    ingest_embed_batch_size: int = 64  # texts per model forward pass
+    ingest_index_timeout: float = 300.0  # seconds to wait for FT.INFO to report indexing done
+    ingest_poll_interval: float = 0.1
+
+class VectorStoreConfig:
+    vector_store_backend: str = os.getenv("VECTOR_STORE_BACKEND", "redis")  # redis | memory
+    memory_index_type: str = os.getenv("MEMORY_INDEX_TYPE", "exact")  # exact | hnsw
+    memory_embedding_dimension: int = EmbeddingConfig.embedding_dimension
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    # Narrow KNN to the concept's category when the LLM gives one, unfiltered search if that finds nothing
+    category_prefilter: bool = os.getenv("CATEGORY_PREFILTER", "True").lower() == "true"
+
+class FastPathConfig:
+    fast_path_enabled: bool = os.getenv("FAST_PATH_ENABLED", "True").lower() == "true"
+
+class CacheConfig:
+    embedding_cache_size: int = 10000
+    embedding_cache_backend: Optional[str] = os.getenv("EMBEDDING_CACHE_BACKEND")  # redis | disk | None
+    embedding_cache_dir: str = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+    embedding_cache_ttl: Optional[int] = None  # seconds, redis backend only
+    response_cache_enabled: bool = os.getenv("RESPONSE_CACHE_ENABLED", "False").lower() == "true"
+    response_cache_size: int = 5000
+    response_cache_ttl: int = 3600  # seconds
+    response_cache_similarity_threshold: Optional[float] = None  # e.g. 0.95 enables near-duplicate hits
+    concept_cache_enabled: bool = os.getenv("CONCEPT_CACHE_ENABLED", "True").lower() == "true"
+    concept_cache_backend: str = os.getenv("CONCEPT_CACHE_BACKEND", "memory")  # memory | redis
+    concept_cache_size: int = 10000
+    concept_cache_ttl: int = 24 * 3600  # seconds
+
+class SessionConfig:
+    # memory | redis, unset: memory, or redis when serving with more than one worker
+    session_store_backend: Optional[str] = os.getenv("SESSION_STORE_BACKEND")
+    session_max_sessions: int = 10000  # memory backend only
+    session_ttl: int = int(os.getenv("SESSION_TTL", 24 * 3600))  # seconds since last turn
+    # Graph checkpoints carry per-session match/fill memos between turns
+    session_checkpointer: str = os.getenv("SESSION_CHECKPOINTER", "memory")  # memory | redis | none
+
+class BatchConfig:
+    batch_max_concurrency: int = int(os.getenv("BATCH_MAX_CONCURRENCY", 16))  # in-flight LLM calls per batch
+    batch_max_size: int = int(os.getenv("BATCH_MAX_SIZE", 1000))  # queries per /api/chat/batch request
+
+class ObservabilityConfig:
+    # Upper bounds in seconds, from a Redis round trip up to a slow LLM call
+    latency_buckets: tuple = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    tracing_exporter: Optional[str] = os.getenv("TRACING_EXPORTER")  # otlp | file | None, needs the tracing extra
+    tracing_otlp_endpoint: str = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317")
+    tracing_file: str = os.getenv("TRACING_FILE", "traces.jsonl")
+    tracing_service_name: str = os.getenv("OTEL_SERVICE_NAME", "nlp-to-filters")
 
 class FlaskConfig:
     flask_host: str = os.getenv("FLASK_HOST", "0.0.0.0")
     flask_port: int = int(os.getenv("FLASK_PORT", 5001))
     flask_debug: bool = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+
+class ServerConfig:
+    workers: int = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    threads: int = int(os.getenv("SERVER_THREADS", 4))  # per worker
+    timeout: int = int(os.getenv("SERVER_TIMEOUT", 120))  # seconds, LLM calls are slow
+    graceful_timeout: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+    keepalive: int = 5
+    max_requests: int = int(os.getenv("SERVER_MAX_REQUESTS", 0))  # recycle workers, 0 disables
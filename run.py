@@ -1,7 +1,7 @@
 import threading
 import argparse
 import time
-from src.api.app import app
+import requests
 # from src.ui.gradio_app import gradio_app
 from src.ui.console_app import run_console_app
 from config.settings import FlaskConfig
@@ -9,7 +9,11 @@ from config.settings import FlaskConfig
 
 def run_flask():
     """Run Flask app"""
+    # Imported here so console-only code paths don't pay for the service stack
+    from src.api.app import create_app
+
     config = FlaskConfig()
+    app = create_app()
 
     app.run(
         host=config.flask_host,
@@ -19,6 +23,31 @@ def run_flask():
     )
 
 
+def warm_up():
+    """Build the chat service and load its models"""
+    from src.infrastructure.chat_client import warm_up as warm_up_chat_service
+    warm_up_chat_service()
+
+
+def start_warm_up():
+    """Load models in the background while the API and UI come up"""
+    warm_up_thread = threading.Thread(target=warm_up, daemon=True)
+    warm_up_thread.start()
+    return warm_up_thread
+
+
+def wait_for_api(api_url: str, timeout: float = 10.0):
+    """Poll /health until the API accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"{api_url}/health", timeout=0.5)
+            return True
+        except requests.RequestException:
+            time.sleep(0.05)
+    return False
+
+
 # def run_gradio():
 #     """Run Gradio app"""
 #     gradio_app.launch(
@@ -35,37 +64,49 @@ def main():
     parser = argparse.ArgumentParser(description='Filter Assistant Application')
     parser.add_argument(
         '--mode',
-        choices=['gradio', 'console', 'both', 'api-only'],
+        choices=['gradio', 'console', 'both', 'api-only', 'serve'],
         default='console',
-        help='Run mode: gradio (web UI), console (CLI), both, or api-only'
+        help='Run mode: gradio (web UI), console (CLI), both, api-only (dev server) '
+             'or serve (production, multi-worker)'
     )
     parser.add_argument(
         '--api-url',
         default=f'http://localhost:{config.flask_port}',
         help='API URL for console mode'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for serve mode (default: WEB_CONCURRENCY or CPU count)'
+    )
+    parser.add_argument(
+        '--threads',
+        type=int,
+        help='Threads per worker for serve mode'
+    )
 
     args = parser.parse_args()
 
-    # Always start Flask API except in 'console' mode where it will be started anyway below
-    if args.mode in ['both', 'gradio', 'api-only']:
-        flask_thread = threading.Thread(target=run_flask)
-        flask_thread.daemon = True
-        flask_thread.start()
+    if args.mode == 'serve':
+        from src.api.server import run_server
 
-        print("Starting Flask API...")
-        time.sleep(2)
-        print(f"Flask API running at: http://localhost:{config.flask_port}")
+        print(f"Serving Flask API at: http://localhost:{config.flask_port}")
+        run_server(workers=args.workers, threads=args.threads)
+        return
+
+    # Start Flask API in the background for the interactive modes; models load in parallel
+    if args.mode in ['both', 'gradio', 'console']:
+        start_warm_up()
 
-    if args.mode == 'console':
         flask_thread = threading.Thread(target=run_flask)
         flask_thread.daemon = True
         flask_thread.start()
 
         print("Starting Flask API...")
-        time.sleep(1)
+        wait_for_api(f"http://localhost:{config.flask_port}")
         print(f"Flask API running at: http://localhost:{config.flask_port}")
 
+    if args.mode == 'console':
         print("Starting Console Interface...")
         run_console_app(args.api_url)
 
@@ -87,11 +128,11 @@ def main():
     #     run_console_app()
 
     elif args.mode == 'api-only':
-        print("Running API only mode...")
+        print("Running API only mode (development server, use --mode serve in production)...")
         print("Press Ctrl+C to stop")
+        start_warm_up()
         try:
-            while True:
-                time.sleep(1)
+            run_flask()
         except KeyboardInterrupt:
             print("\nShutting down...")
 
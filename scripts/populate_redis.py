@@ -1,41 +1,153 @@
-from typing import List, Dict, Any
-import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+import argparse
+import hashlib
+import json
 import logging
+import time
 
-from src.infrastructure.redis_client import redis_store
-from src.infrastructure.embedding_client import embedding_service
+from config.settings import EmbeddingConfig, IngestConfig
+from src.infrastructure.redis_client import get_redis_store
+from src.infrastructure.embedding_client import get_embedding_service
+from src.infrastructure.document_ids import assign_document_ids
+from src.services.catalog import create_searchable_text
 from scripts.sample_filters import SAMPLE_FILTERS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def initialize_vector_db(filter_documents: List[Dict[str, Any]]):
+
+def read_filter_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield filter definitions from a JSONL file (streamed) or a JSON array file"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def content_hash(text: str, filter_doc: Dict[str, Any]) -> str:
+    """Hash of everything a stored document is built from, model included so a model change re-embeds"""
+    payload = json.dumps([EmbeddingConfig.embedding_model, text, filter_doc], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def ingest_catalog(filter_documents: Iterable[Dict[str, Any]],
+                   batch_size: int = IngestConfig.ingest_batch_size,
+                   force: bool = False,
+                   reindex: bool = False) -> Dict[str, int]:
+    """Stream filter definitions into Redis.
+
+    Documents are keyed by a stable id (filter id or display name slug) and
+    processed in fixed-size batches, each written in one MULTI/EXEC pipeline
+    while the next batch is embedded. Documents whose stored content hash
+    matches are not re-embedded.
+
+    By default the live index is updated in place and filters missing from
+    the input are deleted afterwards. With `reindex` (or on the first load) a
+    new index version is built next to the live one, unchanged embeddings are
+    copied over, and the search alias is swapped to it only once it is fully
+    indexed.
+    """
+    redis_store = get_redis_store()
+
+    live_index = redis_store.live_index_name()
+    index_name = redis_store.create_versioned_index() if reindex or live_index is None else live_index
+    in_place = index_name == live_index
+    logger.info(f"Loading into {'live index' if in_place else 'new index'} {index_name}")
+
+    embedding_service = None
+    seen_ids = set()
+    stats = {"documents": 0, "written": 0, "embedded": 0, "removed": 0}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending = None
+
+        for batch in batched(filter_documents, batch_size):
+            doc_ids = assign_document_ids(batch, seen_ids)
+            texts = [create_searchable_text(filter_doc) for filter_doc in batch]
+            hashes = [content_hash(text, filter_doc) for text, filter_doc in zip(texts, batch)]
+
+            stored_keys = [redis_store.document_key(live_index, doc_id) for doc_id in doc_ids] if live_index else None
+            stored = redis_store.content_hashes(stored_keys) if stored_keys and not force else [None] * len(batch)
+            unchanged = [i for i, (new, old) in enumerate(zip(hashes, stored)) if new == old]
+
+            embeddings = {}
+            if in_place:
+                to_write = sorted(set(range(len(batch))) - set(unchanged))
+            else:
+                # A new index version needs every document, unchanged ones keep their embedding
+                to_write = list(range(len(batch)))
+                copied = redis_store.stored_embeddings([stored_keys[i] for i in unchanged]) if unchanged else []
+                embeddings.update((i, e) for i, e in zip(unchanged, copied) if e is not None)
+
+            to_embed = [i for i in to_write if i not in embeddings]
+            if to_embed:
+                # Only loaded once something actually needs embedding
+                embedding_service = embedding_service or get_embedding_service()
+                encoded = embedding_service.embed_batch(
+                    [texts[i] for i in to_embed],
+                    batch_size=IngestConfig.ingest_embed_batch_size
+                )
+                embeddings.update(zip(to_embed, encoded))
+
+            if to_write:
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(
+                    redis_store.write_documents,
+                    [redis_store.document_key(index_name, doc_ids[i]) for i in to_write],
+                    [texts[i] for i in to_write],
+                    [batch[i] for i in to_write],
+                    [embeddings[i] for i in to_write],
+                    [hashes[i] for i in to_write],
+                )
+
+            stats["documents"] += len(batch)
+            stats["written"] += len(to_write)
+            stats["embedded"] += len(to_embed)
+            logger.info(f"Processed {stats['documents']} documents "
+                        f"({stats['written']} written, {stats['embedded']} embedded)")
+
+        if pending is not None:
+            pending.result()
+
+    timeout, poll_interval = IngestConfig.ingest_index_timeout, IngestConfig.ingest_poll_interval
+    if in_place:
+        stats["removed"] = redis_store.delete_stale_documents(index_name, seen_ids)
+        if stats["written"] or stats["removed"]:
+            redis_store.wait_for_indexing(index_name, timeout, poll_interval)
+            # Lets caches keyed on catalog contents notice the reindex
+            redis_store.bump_catalog_version()
+    else:
+        # Searches keep hitting the old version until the new one is complete
+        redis_store.wait_for_indexing(index_name, timeout, poll_interval)
+        redis_store.swap_index(index_name)
+        redis_store.bump_catalog_version()
+
+    logger.info(f"Ingested {stats['documents']} documents in {time.perf_counter() - start:.1f}s "
+                f"({stats['removed']} removed)")
+    return stats
+
+
+def initialize_vector_db(filter_documents: Iterable[Dict[str, Any]],
+                         batch_size: int = IngestConfig.ingest_batch_size,
+                         force: bool = False,
+                         reindex: bool = False):
     """Initialize Redis vector database with filter definitions"""
     try:
-        redis_store.create_index()
-
-        texts = []
-        metadatas = []
-
-        for filter_doc in filter_documents:
-            searchable_text = create_searchable_text(filter_doc)
-            texts.append(searchable_text)
-            metadatas.append(filter_doc)
-            logger.debug(f"Prepared text: {searchable_text[:100]}...")
-
-        embeddings = embedding_service.embed_batch(texts)
-        redis_store.add_documents(texts, metadatas, embeddings)
-
-        logger.info(f"Generating embeddings for {len(texts)} documents...")
-        embeddings = embedding_service.embed_batch(texts)
-
-        logger.info(f"Adding documents to Redis...")
-        redis_store.add_documents(texts, metadatas, embeddings)
-
-        # Wait for indexing to complete
-        time.sleep(2)
-
-        logger.info(f"Vector database initialized with {len(filter_documents)} filter definitions")
+        stats = ingest_catalog(filter_documents, batch_size, force, reindex)
+        logger.info(f"Vector database initialized with {stats['documents']} filter definitions")
 
         test_search()
 
@@ -43,25 +155,12 @@ def initialize_vector_db(filter_documents: List[Dict[str, Any]]):
         logger.error(f"Error initializing vector database: {e}")
         raise
 
-def create_searchable_text(filter_doc: Dict[str, Any]) -> str:
-    """Create searchable text from filter definition"""
-    parts = []
-
-    if "displayName" in filter_doc:
-        parts.append(filter_doc["displayName"])
-    if "description" in filter_doc:
-        parts.append(filter_doc["description"])
-    if "keywords" in filter_doc and isinstance(filter_doc["keywords"], list):
-        parts.extend(filter_doc["keywords"])
-
-    return ", ".join(parts)
-
-
 def test_search():
     """Test that the search is working"""
     try:
         from redis.commands.search.query import Query
         query = Query("*").return_fields("text").paging(0, 5)
+        redis_store = get_redis_store()
         results = redis_store.redis_client.ft(redis_store.config.redis_index_name).search(query)
         logger.info(f"Test search found {results.total} documents")
 
@@ -71,5 +170,20 @@ def test_search():
     except Exception as e:
         logger.error(f"Test search failed: {e}")
 
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Load filter definitions into the Redis vector index')
+    parser.add_argument('path', nargs='?', help='JSON array or JSONL file of filter definitions, '
+                                                'defaults to the bundled sample filters')
+    parser.add_argument('--batch-size', type=int, default=IngestConfig.ingest_batch_size)
+    parser.add_argument('--force', action='store_true', help='Re-embed and rewrite unchanged documents too')
+    parser.add_argument('--reindex', action='store_true',
+                        help='Build a new index version and swap the search alias to it when complete')
+    args = parser.parse_args(argv)
+
+    filter_documents = read_filter_documents(args.path) if args.path else SAMPLE_FILTERS
+    initialize_vector_db(filter_documents, args.batch_size, args.force, args.reindex)
+
+
 if __name__ == "__main__":
-    initialize_vector_db(SAMPLE_FILTERS)
\ No newline at end of file
+    main()
@@ -1,6 +1,20 @@
 import logging
-from flask import Flask, jsonify, request
-from src.infrastructure.chat_client import ChatService
+import time
+from contextlib import nullcontext
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+from config.settings import BatchConfig
+from src.infrastructure.chat_client import get_chat_service
+from src.infrastructure.metrics import REQUEST_SECONDS, collect_timings, render_metrics
+from src.infrastructure.session_store import UnknownSession
+
+
+def _debug_timings(data):
+    """Collect a per-stage timing breakdown when the request asks for it with "debug": true"""
+    return collect_timings() if data.get('debug') else nullcontext()
+
+def _unknown_session(error: UnknownSession):
+    """409 so the client resends its full active_filters instead of continuing without them"""
+    return jsonify({"error": str(error), "message": "Session not found, resend active_filters"}), 409
 
 def create_app():
     app = Flask(__name__)
@@ -8,23 +22,55 @@ def create_app():
     log = logging.getLogger('werkzeug')
     log.setLevel(logging.WARNING)
 
-    chat_service = ChatService()
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
 
+    @app.after_request
+    def record_latency(response):
+        # Streamed responses are recorded once the headers go out, not when the stream ends
+        if request.endpoint and 'request_start' in g:
+            REQUEST_SECONDS.observe(request.endpoint, time.perf_counter() - g.request_start)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus text format: stage and request latency histograms, Redis pool gauges"""
+        gauges = {}
+        if get_chat_service.is_initialized():
+            pools = {name: stats for name, stats in get_chat_service().cache_stats().items() if 'pool' in name}
+            gauges["nlp2filters_redis_pool_connections"] = {
+                f'pool="{name}",state="{state}"': value
+                for name, stats in pools.items() for state, value in stats.items()
+            }
+        return Response(render_metrics(gauges), mimetype='text/plain; version=0.0.4')
+
+    # Services are built on the first request or by chat_client.warm_up()
     @app.route('/health', methods=['GET'])
     def health_check():
-        return jsonify({"status": "healthy"}), 200
+        return jsonify({"status": "healthy", "ready": get_chat_service.is_initialized()}), 200
+
+    @app.route('/api/stats', methods=['GET'])
+    def stats():
+        return jsonify(get_chat_service().cache_stats()), 200
 
     @app.route('/api/chat', methods=['POST'])
     def chat():
         try:
             data = request.json
-            result = chat_service.process_chat_request(
-                user_query=data.get('query', ''),
-                active_filters=data.get('active_filters', []),
-                session_id=data.get('session_id')
-            )
+            with _debug_timings(data) as timings:
+                result = get_chat_service().process_chat_request(
+                    user_query=data.get('query', ''),
+                    active_filters=data.get('active_filters'),
+                    session_id=data.get('session_id'),
+                    filter_delta=data.get('filter_delta')
+                )
+            if timings is not None:
+                result = {**result, "timings": timings}
             return jsonify(result), 200
 
+        except UnknownSession as e:
+            return _unknown_session(e)
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -33,6 +79,100 @@ def create_app():
                 "message": "Sorry, I encountered an error processing your request."
             }), 500
 
-    return app
+    @app.route('/api/session/<session_id>', methods=['GET'])
+    def get_session(session_id):
+        session = get_chat_service().get_session(session_id)
+        if session is None:
+            return jsonify({"error": "Unknown or expired session"}), 404
+        return jsonify(session), 200
+
+    @app.route('/api/session/<session_id>', methods=['PATCH'])
+    def update_session(session_id):
+        """Apply a filter delta: {"add": [...], "remove": [names], "clear": true}"""
+        delta = request.json or {}
+        try:
+            return jsonify(get_chat_service().update_session(session_id, delta)), 200
+        except UnknownSession as e:
+            return _unknown_session(e)
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Invalid filter delta: {e}"}), 400
 
-app = create_app()
\ No newline at end of file
+    @app.route('/api/session/<session_id>', methods=['DELETE'])
+    def delete_session(session_id):
+        get_chat_service().delete_session(session_id)
+        return '', 204
+
+    @app.route('/api/chat/batch', methods=['POST'])
+    def chat_batch():
+        """Many queries in one call, results in request order with per-item errors"""
+        data = request.json or {}
+        queries = data.get('queries')
+
+        if not isinstance(queries, list) or not queries:
+            return jsonify({"error": "'queries' must be a non-empty list"}), 400
+        if len(queries) > BatchConfig.batch_max_size:
+            return jsonify({"error": f"At most {BatchConfig.batch_max_size} queries per batch"}), 400
+
+        max_concurrency = data.get('max_concurrency')
+        if max_concurrency is not None and (type(max_concurrency) is not int or max_concurrency < 1):
+            return jsonify({"error": "'max_concurrency' must be a positive integer"}), 400
+
+        try:
+            results = get_chat_service().process_batch(queries, max_concurrency)
+            return jsonify({"results": results}), 200
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                "error": str(e),
+                "message": "Sorry, I encountered an error processing your request."
+            }), 500
+
+    @app.route('/api/chat/stream', methods=['POST'])
+    def chat_stream():
+        """Server-Sent Events: one event per completed graph node, then "done" """
+        data = request.json or {}
+
+        # Resolved before the stream starts, an unknown session still gets a status code
+        try:
+            events = get_chat_service().stream_chat_request(
+                user_query=data.get('query', ''),
+                active_filters=data.get('active_filters'),
+                session_id=data.get('session_id'),
+                filter_delta=data.get('filter_delta')
+            )
+        except UnknownSession as e:
+            return _unknown_session(e)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({
+                "error": str(e),
+                "message": "Sorry, I encountered an error processing your request."
+            }), 500
+
+        def generate():
+            try:
+                with _debug_timings(data) as timings:
+                    for event, payload in events:
+                        if event == "done" and timings is not None:
+                            payload = {**payload, "timings": timings}
+                        yield f"event: {event}\ndata: {app.json.dumps(payload)}\n\n"
+
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                error = {
+                    "error": str(e),
+                    "message": "Sorry, I encountered an error processing your request."
+                }
+                yield f"event: error\ndata: {app.json.dumps(error)}\n\n"
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    return app
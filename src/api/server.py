@@ -0,0 +1,100 @@
+import gc
+import logging
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from config.settings import FlaskConfig, ServerConfig, SessionConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+def _limit_torch_threads(workers: int):
+    """Split cores between workers so torch doesn't oversubscribe the CPU"""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+
+def _shared_session_store(workers: int, session_config=SessionConfig):
+    """Sessions must be visible to every worker: default to redis, refuse an explicit memory store"""
+    if workers <= 1:
+        return
+    if session_config.session_store_backend == "memory":
+        raise ValueError(f"SESSION_STORE_BACKEND=memory keeps sessions per process, "
+                         f"use redis to serve with {workers} workers")
+    if session_config.session_store_backend is None:
+        session_config.session_store_backend = "redis"
+        logger.info(f"Serving with {workers} workers, sessions are kept in redis")
+
+
+class FilterAssistantServer(BaseApplication):
+    """Multi-process gunicorn server for the Flask API.
+
+    The app is warmed up (SentenceTransformer model, vector store, catalog)
+    once in the master before forking, so workers share those pages
+    copy-on-write instead of each loading its own copy.
+    """
+
+    def __init__(self, flask_config=FlaskConfig, server_config=ServerConfig, **overrides):
+        self.flask_config = flask_config
+        self.server_config = server_config
+        self.overrides = overrides
+        super().__init__()
+
+    def load_config(self):
+        workers = self.overrides.get('workers') or self.server_config.workers
+        _shared_session_store(workers)
+
+        options = {
+            'bind': f"{self.flask_config.flask_host}:{self.flask_config.flask_port}",
+            'workers': workers,
+            'worker_class': 'gthread',
+            'threads': self.overrides.get('threads') or self.server_config.threads,
+            'timeout': self.server_config.timeout,
+            'graceful_timeout': self.server_config.graceful_timeout,
+            'keepalive': self.server_config.keepalive,
+            'max_requests': self.server_config.max_requests,
+            'max_requests_jitter': self.server_config.max_requests // 10,
+            'preload_app': True,
+            'when_ready': self.when_ready,
+            'post_fork': lambda server, worker: _limit_torch_threads(workers),
+            'worker_exit': self.worker_exit,
+        }
+
+        for key, value in options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Fork-safe tokenizers; must be set before the model is loaded
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        from src.api.app import create_app
+        from src.infrastructure.chat_client import warm_up
+
+        app = create_app()
+        warm_up()
+
+        # Move everything loaded so far out of the GC's reach, otherwise the first
+        # collection in each worker touches every object and un-shares the pages
+        gc.collect()
+        gc.freeze()
+
+        return app
+
+    @staticmethod
+    def when_ready(server):
+        server.log.info("Models loaded, workers share them copy-on-write")
+
+    @staticmethod
+    def worker_exit(server, worker):
+        from src.infrastructure.redis_client import close_pools
+        close_pools()
+
+
+def run_server(workers: int = None, threads: int = None):
+    """Serve the API with gunicorn until SIGTERM/SIGINT, then drain in-flight requests"""
+    FilterAssistantServer(workers=workers, threads=threads).run()
@@ -1,34 +1,405 @@
-from typing import List
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import logging
+import threading
 import uuid
 
+from config.settings import CacheConfig, BatchConfig, SessionConfig
 from src.services.workflow import create_workflow
-from src.models.domain_models import ActiveFilter
+from src.models.domain_models import ActiveFilter, FilterState, apply_update
+from src.infrastructure.response_cache import ResponseCache
+from src.infrastructure.session_store import SessionStore, UnknownSession, apply_filter_delta, to_active_filter
+from src.infrastructure.lazy import lazy_singleton
+from src.infrastructure.metrics import timed
 
 
+logger = logging.getLogger(__name__)
+
+
+# Graph node -> (stream event name, state fields sent with it)
+STREAM_EVENTS = {
+    "fast_path": ("filters_filled", ["active_filters", "clarification_request"]),
+    "extract_concepts": ("concepts_extracted", ["concepts"]),
+    "handle_drops": ("filters_dropped", ["active_filters"]),
+    "match_filters": ("matches_found", ["matched_filters"]),
+    "fill_values": ("filters_filled", ["active_filters", "clarification_request"]),
+}
+
 
 class ChatService:
-    def __init__(self):
-        self.workflow = create_workflow()
+    def __init__(self, cache_config=CacheConfig, batch_config=BatchConfig, session_config=SessionConfig):
+        self.workflow = create_workflow(cache_config, session_config=session_config)
+        self.session_store = SessionStore.from_config(session_config)
+        self.batch_config = batch_config
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self.response_cache = None
+        if cache_config.response_cache_enabled:
+            self.response_cache = ResponseCache.from_config(self.workflow.nodes.embedding_service, cache_config)
 
-    def process_chat_request(self, user_query: str, active_filters: List[ActiveFilter], session_id: str = None):
-        session_id = session_id or str(uuid.uuid4())
+    def cache_stats(self):
+        nodes = self.workflow.nodes
+        stats = {}
+        if nodes.embedding_service.cache is not None:
+            stats["embedding_cache"] = nodes.embedding_service.cache.stats()
+        if nodes.concept_cache is not None:
+            stats["concept_cache"] = nodes.concept_cache.stats()
+        if self.response_cache is not None:
+            stats["response_cache"] = self.response_cache.stats()
+        pools = {"redis_pool": nodes.vector_store, "redis_async_pool": nodes.async_vector_store}
+        for name, store in pools.items():
+            pool = store.pool_stats() if hasattr(store, 'pool_stats') else None
+            if pool is not None:
+                stats[name] = pool
+        return stats
+
+    @staticmethod
+    def _to_active_filters(active_filters: List[Any]) -> List[ActiveFilter]:
+        return [to_active_filter(f) for f in active_filters or []]
+
+    def _session_filters(self,
+                         session_id: str,
+                         active_filters: Optional[List[Any]] = None,
+                         filter_delta: Optional[Dict[str, Any]] = None,
+                         new_session: bool = False) -> List[ActiveFilter]:
+        """Filters for this turn: the client's full list if it sent one, otherwise the
+        stored session, with the client's delta applied on top.
+
+        Raises UnknownSession when the client named a session that isn't stored,
+        so it can resend its filters instead of silently losing them.
+        """
+        if active_filters is None:
+            session = None if new_session else self.session_store.get(session_id)
+            if session is not None:
+                active_filters = session.active_filters
+            elif new_session or (filter_delta or {}).get('clear'):
+                active_filters = []
+            else:
+                raise UnknownSession(f"Unknown or expired session {session_id}, resend active_filters")
+
+        active_filters = self._to_active_filters(active_filters)
+        if filter_delta:
+            active_filters = apply_filter_delta(active_filters, filter_delta)
+        return active_filters
+
+    def _save_session(self, response: Dict[str, Any]):
+        self.session_store.save(response["session_id"], response["active_filters"], response["clarification_request"])
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session = self.session_store.get(session_id)
+        if session is None:
+            return None
+        return {
+            "active_filters": session.active_filters,
+            "clarification_request": session.clarification_request,
+            "session_id": session_id
+        }
+
+    def update_session(self, session_id: str, filter_delta: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a filter change made on the client, e.g. a picked suggestion or a cleared list.
+
+        A pending clarification is dropped: the user either answered it with
+        this change or moved on. Raises UnknownSession for a session that isn't
+        stored, unless the delta clears every filter anyway.
+        """
+        response = {
+            "active_filters": self._session_filters(session_id, filter_delta=filter_delta),
+            "clarification_request": [],
+            "session_id": session_id
+        }
+        self._save_session(response)
+        return response
 
-        initial_state = {
+    def delete_session(self, session_id: str):
+        self.session_store.delete(session_id)
+        self.workflow.delete_session(session_id)
+
+    def _initial_state(self, user_query: str, active_filters: List[ActiveFilter], session_id: str):
+        return {
             "query": user_query,
-            "active_filters": active_filters,
+            "active_filters": self._to_active_filters(active_filters),
             "clarification_request": [],
             "concepts": [],
             "matched_filters": [],
             "pii_mappings": {},
             "session_id": session_id,
-            "message": ""
+            "message": "",
+            "fast_path_applied": False
         }
 
-        result = self.workflow.invoke(initial_state)
-
+    def _format_result(self, result, session_id: str):
         return {
             "active_filters": result.get("active_filters", []),
             "clarification_request": result.get("clarification_request", []),
             "message": result.get("message", ""),
             "session_id": session_id
-        }
\ No newline at end of file
+        }
+
+    def _cached_response(self, user_query: str, active_filters: List[ActiveFilter], session_id: str):
+        if self.response_cache is None:
+            return None, None
+
+        catalog_version = self.workflow.nodes.vector_store.catalog_version()
+        cached = self.response_cache.get(user_query, active_filters, catalog_version)
+        if cached is not None:
+            cached["session_id"] = session_id
+        return cached, catalog_version
+
+    def _store_response(self, user_query: str, active_filters: List[ActiveFilter], response, catalog_version):
+        if self.response_cache is None:
+            return
+
+        cached = {key: value for key, value in response.items() if key != "session_id"}
+        self.response_cache.set(user_query, active_filters, cached, catalog_version)
+
+    def process_chat_request(self,
+                             user_query: str,
+                             active_filters: Optional[List[ActiveFilter]] = None,
+                             session_id: str = None,
+                             filter_delta: Optional[Dict[str, Any]] = None):
+        """Process one turn. Without active_filters the session's stored filters are used.
+
+        The turn runs on the service's event loop (see aprocess_chat_request),
+        the calling thread only waits for the result.
+        """
+        return self._run_on_loop(self.aprocess_chat_request(user_query, active_filters, session_id, filter_delta))
+
+    async def aprocess_chat_request(self,
+                                    user_query: str,
+                                    active_filters: Optional[List[ActiveFilter]] = None,
+                                    session_id: str = None,
+                                    filter_delta: Optional[Dict[str, Any]] = None):
+        """Async variant of process_chat_request, LLM calls are awaited so one loop serves many turns"""
+        new_session = not session_id
+        session_id = session_id or str(uuid.uuid4())
+        active_filters = await asyncio.to_thread(
+            self._session_filters, session_id, active_filters, filter_delta, new_session
+        )
+
+        cached, catalog_version = await asyncio.to_thread(self._cached_response, user_query, active_filters, session_id)
+        if cached is not None:
+            await asyncio.to_thread(self._save_session, cached)
+            return cached
+
+        result = await self.workflow.ainvoke(self._initial_state(user_query, active_filters, session_id))
+
+        response = self._format_result(result, session_id)
+        await asyncio.to_thread(self._finish_turn, user_query, active_filters, response, catalog_version)
+        return response
+
+    def _finish_turn(self, user_query: str, active_filters: List[ActiveFilter], response, catalog_version):
+        self._store_response(user_query, active_filters, response, catalog_version)
+        self._save_session(response)
+
+    def stream_chat_request(self,
+                            user_query: str,
+                            active_filters: Optional[List[ActiveFilter]] = None,
+                            session_id: str = None,
+                            filter_delta: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Run the workflow yielding (event, payload) as nodes complete, ends with a "done" event
+        carrying the same payload process_chat_request returns.
+
+        The session is resolved before the first event, an UnknownSession is
+        raised here rather than from inside the stream. The graph itself runs
+        on the service's event loop, each event is handed back to this thread.
+        """
+        new_session = not session_id
+        session_id = session_id or str(uuid.uuid4())
+        active_filters = self._session_filters(session_id, active_filters, filter_delta, new_session)
+        return self._iterate_on_loop(self._astream_events(user_query, active_filters, session_id))
+
+    async def _astream_events(self,
+                              user_query: str,
+                              active_filters: List[ActiveFilter],
+                              session_id: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        cached, catalog_version = await asyncio.to_thread(self._cached_response, user_query, active_filters, session_id)
+        if cached is not None:
+            await asyncio.to_thread(self._save_session, cached)
+            yield "done", cached
+            return
+
+        state = self._initial_state(user_query, active_filters, session_id)
+        async for node_name, update in self.workflow.astream(state):
+            state.update(update)
+
+            if node_name == "fast_path" and not update.get("fast_path_applied"):
+                continue
+
+            if node_name in STREAM_EVENTS:
+                event, fields = STREAM_EVENTS[node_name]
+                yield event, {field: state[field] for field in fields}
+
+        response = self._format_result(state, session_id)
+        await asyncio.to_thread(self._finish_turn, user_query, active_filters, response, catalog_version)
+        yield "done", response
+
+    @staticmethod
+    def _batch_error(error: Exception, session_id: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "error": str(error),
+            "message": "Sorry, I encountered an error processing your request.",
+            "session_id": session_id
+        }
+
+    def process_batch(self, requests: List[Any], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Process many queries in one call.
+
+        Each request is a query string or a dict shaped like the /api/chat body.
+        Results come back in request order; a failed item gets an "error" entry
+        instead of failing the whole batch.
+        """
+        return self._run_on_loop(self.aprocess_batch(requests, max_concurrency))
+
+    def _run_on_loop(self, coroutine):
+        # AsyncOpenAI's pooled connections belong to the loop that opened them, so
+        # every turn and batch runs on one long-lived loop instead of a fresh asyncio.run()
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _iterate_on_loop(self, events: AsyncIterator) -> Iterator:
+        """Drive an async generator on the service's loop from a sync caller, one item at a time"""
+        async def next_event():
+            return await events.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield self._run_on_loop(next_event())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run_on_loop(events.aclose())
+
+    async def aprocess_batch(self, requests: List[Any], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Async variant of process_batch.
+
+        Runs the same steps as the graph, but stage by stage across the whole
+        batch: concept extraction and value filling for different queries run
+        concurrently (bounded by max_concurrency), and all concepts are embedded
+        and searched together in one match_filters_batch call. Each item's
+        match/fill memos are read from its session checkpoint and written back
+        with the result, and every stage is timed under the graph's node.<name>
+        stages (the batched search as node.match_filters_batch).
+        """
+        nodes = self.workflow.nodes
+        limit = min(max_concurrency or self.batch_config.batch_max_concurrency,
+                    self.batch_config.batch_max_concurrency)
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        states: Dict[int, FilterState] = {}
+        cache_keys: Dict[int, Tuple[str, List[ActiveFilter], Any]] = {}
+
+        for index, item in enumerate(requests):
+            session_id = None
+            try:
+                if isinstance(item, str):
+                    item = {"query": item}
+                user_query = item.get('query', '')
+                new_session = not item.get('session_id')
+                session_id = item.get('session_id') or str(uuid.uuid4())
+                active_filters = self._session_filters(session_id, item.get('active_filters'),
+                                                       item.get('filter_delta'), new_session)
+
+                cached, catalog_version = self._cached_response(user_query, active_filters, session_id)
+                if cached is not None:
+                    self._save_session(cached)
+                    results[index] = cached
+                    continue
+
+                states[index] = FilterState(**self._initial_state(user_query, active_filters, session_id))
+                cache_keys[index] = (user_query, active_filters, catalog_version)
+            except Exception as e:
+                results[index] = self._batch_error(e, session_id)
+
+        async def run_limited(name, node, state):
+            async with semaphore:
+                with timed(f"node.{name}"):
+                    return await node(state)
+
+        async def run_concurrently(name, node, indexes):
+            outcomes = await asyncio.gather(
+                *(run_limited(name, node, states[index]) for index in indexes), return_exceptions=True
+            )
+            for index, outcome in zip(indexes, outcomes):
+                if isinstance(outcome, Exception):
+                    results[index] = self._batch_error(outcome, states.pop(index).session_id)
+                else:
+                    states[index] = apply_update(states[index], outcome)
+
+        def run_sync(name, node, index):
+            with timed(f"node.{name}"):
+                states[index] = apply_update(states[index], node(states[index]))
+
+        # Memos the graph would restore from the session's checkpoint
+        indexes = list(states)
+        memos = await asyncio.gather(
+            *(asyncio.to_thread(self.workflow.load_memos, states[index].session_id) for index in indexes),
+            return_exceptions=True
+        )
+        for index, memo in zip(indexes, memos):
+            try:
+                if isinstance(memo, Exception):
+                    raise memo
+                states[index] = replace(states[index], **memo)
+                run_sync("fast_path", nodes.fast_path_node, index)
+            except Exception as e:
+                results[index] = self._batch_error(e, states.pop(index).session_id)
+
+        llm_indexes = [index for index, state in states.items() if not state.fast_path_applied]
+        await run_concurrently("extract_concepts", nodes.aextract_concepts_node, llm_indexes)
+
+        llm_indexes = [index for index in llm_indexes if index in states]
+        try:
+            for index in llm_indexes:
+                run_sync("handle_drops", nodes.handle_drops_node, index)
+            with timed("node.match_filters_batch"):
+                matched = await nodes.amatch_filters_batch([states[index] for index in llm_indexes])
+            states.update((index, apply_update(states[index], update))
+                          for index, update in zip(llm_indexes, matched))
+        except Exception as e:
+            for index in llm_indexes:
+                results[index] = self._batch_error(e, states.pop(index).session_id)
+            llm_indexes = []
+
+        await run_concurrently("fill_values", nodes.afill_values_node, llm_indexes)
+
+        for index in states:
+            run_sync("prepare_response", nodes.prepare_response_node, index)
+        saved = await asyncio.gather(
+            *(asyncio.to_thread(self.workflow.save_state, state) for state in states.values()), return_exceptions=True
+        )
+        for error in saved:
+            if isinstance(error, Exception):
+                # The turn's result stands, the session only loses this turn's memos
+                logger.warning(f"Session checkpoint write failed: {error}")
+
+        for index, state in states.items():
+            user_query, active_filters, catalog_version = cache_keys[index]
+            response = self._format_result(vars(state), state.session_id)
+            self._store_response(user_query, active_filters, response, catalog_version)
+            self._save_session(response)
+            results[index] = response
+
+        return results
+
+
+@lazy_singleton
+def get_chat_service() -> ChatService:
+    """Shared ChatService, the workflow and its models are built on first use"""
+    return ChatService()
+
+
+def warm_up():
+    """Build the chat service ahead of the first request.
+
+    Loads the embedding model, connects the vector store and runs one encode
+    so the first user query doesn't pay for model initialization.
+    """
+    chat_service = get_chat_service()
+    chat_service.workflow.nodes.embedding_service.embed_documents("warm up")
+    return chat_service
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from typing import Optional
+import asyncio
+import logging
+import threading
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from config.settings import SessionConfig
+from src.models import domain_models
+
+
+logger = logging.getLogger(__name__)
+
+# State values are the dataclasses of src.models.domain_models (ActiveFilter, FilterMatch, ...).
+# Listed explicitly, checkpoints deserialize these plus langgraph's own safe types and nothing else
+CHECKPOINT_TYPES = tuple(
+    obj for obj in vars(domain_models).values()
+    if isinstance(obj, type) and is_dataclass(obj) and obj.__module__ == domain_models.__name__
+)
+
+
+class SessionCheckpointer(InMemorySaver):
+    """InMemorySaver that only keeps what the next turn needs.
+
+    The stock saver keeps every checkpoint of every thread forever. Here each
+    session keeps its latest checkpoint (plus the channel blobs it references)
+    and the least recently used sessions are dropped beyond max_sessions.
+    """
+
+    def __init__(self, max_sessions: int = 10000):
+        super().__init__(serde=JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES))
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, set]" = OrderedDict()  # thread_id -> blob keys
+        self._lock = threading.Lock()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        saved = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        current_versions = checkpoint["channel_versions"]
+
+        with self._lock:
+            blob_keys = self._sessions.setdefault(thread_id, set())
+            self._sessions.move_to_end(thread_id)
+            blob_keys.update((thread_id, checkpoint_ns, channel, version) for channel, version in new_versions.items())
+
+            checkpoints = self.storage[thread_id][checkpoint_ns]
+            for checkpoint_id in [cid for cid in checkpoints if cid != checkpoint["id"]]:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+            stale = {key for key in blob_keys if key[1] == checkpoint_ns and current_versions.get(key[2]) != key[3]}
+            for key in stale:
+                self.blobs.pop(key, None)
+            blob_keys -= stale
+
+            evicted = []
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False))
+
+        for evicted_thread, evicted_blobs in evicted:
+            self._drop(evicted_thread, evicted_blobs)
+
+        return saved
+
+    def _drop(self, thread_id: str, blob_keys: set):
+        checkpoints = self.storage.pop(thread_id, {})
+        for checkpoint_ns, by_id in checkpoints.items():
+            for checkpoint_id in by_id:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for key in blob_keys:
+            self.blobs.pop(key, None)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            blob_keys = self._sessions.pop(thread_id, set())
+        self._drop(thread_id, blob_keys)
+
+
+def create_checkpointer(config=SessionConfig) -> Optional[object]:
+    """Graph checkpointer selected by SESSION_CHECKPOINTER, None disables checkpointing"""
+    backend = config.session_checkpointer
+
+    if backend == "none":
+        return None
+
+    if backend == "memory":
+        return SessionCheckpointer(max_sessions=config.session_max_sessions)
+
+    if backend == "redis":
+        try:
+            from langgraph.checkpoint.redis import RedisSaver
+            from langgraph.checkpoint.redis.jsonplus_redis import JsonPlusRedisSerializer
+        except ImportError:
+            raise ImportError("session_checkpointer='redis' requires langgraph-checkpoint-redis: "
+                              "pip install langgraph-checkpoint-redis")
+        from src.infrastructure.redis_client import create_redis_client
+
+        class ThreadedRedisSaver(RedisSaver):
+            """RedisSaver for ainvoke/astream too: the async methods run the pooled sync ones on a thread"""
+
+            async def aget_tuple(self, config):
+                return await asyncio.to_thread(self.get_tuple, config)
+
+            async def aput(self, config, checkpoint, metadata, new_versions):
+                return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+            async def aput_writes(self, config, writes, task_id, task_path=""):
+                return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+            async def alist(self, config, *, filter=None, before=None, limit=None):
+                for item in await asyncio.to_thread(list, self.list(config, filter=filter, before=before, limit=limit)):
+                    yield item
+
+            async def adelete_thread(self, thread_id):
+                return await asyncio.to_thread(self.delete_thread, thread_id)
+
+        saver = ThreadedRedisSaver(
+            redis_client=create_redis_client(),
+            ttl={"default_ttl": max(1, config.session_ttl // 60), "refresh_on_read": True}  # minutes
+        )
+        # Checkpoints are JSON, values that need msgpack (bytes) fall back to it with the same allowlist
+        saver.serde = JsonPlusRedisSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES)
+        saver.setup()
+        logger.info("Using Redis graph checkpointer")
+        return saver
+
+    raise ValueError(f"Unknown session checkpointer: {backend}")
@@ -0,0 +1,98 @@
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import threading
+
+from config.settings import CacheConfig
+from src.infrastructure.cache import LRUCache
+from src.infrastructure.response_cache import normalize_query
+from src.models.domain_models import ExtractedConcept
+
+
+logger = logging.getLogger(__name__)
+
+
+class ConceptCache:
+    """Memoized concept extraction results keyed on query and active filter names.
+
+    Entries hold the parsed concepts plus the latency of the LLM call that
+    produced them, so hits can report how much time they saved. With a Redis
+    client the cache is shared across workers, otherwise it is process-local.
+    """
+
+    def __init__(self,
+                 max_size: int = 10000,
+                 ttl: Optional[int] = None,
+                 redis_client=None,
+                 prefix: str = "concept_cache"):
+        self.memory = LRUCache(max_size, ttl=ttl) if redis_client is None else None
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config=CacheConfig) -> "ConceptCache":
+        redis_client = None
+        if config.concept_cache_backend == "redis":
+            from src.infrastructure.redis_client import create_redis_client
+            redis_client = create_redis_client()
+        elif config.concept_cache_backend != "memory":
+            raise ValueError(f"Unknown concept cache backend: {config.concept_cache_backend}")
+
+        return cls(max_size=config.concept_cache_size, ttl=config.concept_cache_ttl, redis_client=redis_client)
+
+    def _key(self, query: str, filter_names: List[str]) -> str:
+        payload = json.dumps([normalize_query(query), sorted(filter_names)])
+        return f"{self.prefix}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.redis_client is None:
+            return self.memory.get(key)
+
+        try:
+            value = self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Concept cache lookup failed: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    def get(self, query: str, filter_names: List[str]) -> Optional[List[ExtractedConcept]]:
+        entry = self._load(self._key(query, filter_names))
+
+        with self._stats_lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_seconds += entry["latency"]
+
+        return [ExtractedConcept(**c) for c in entry["concepts"]]
+
+    def set(self, query: str, filter_names: List[str], concepts: List[ExtractedConcept], latency: float):
+        key = self._key(query, filter_names)
+        entry = {"concepts": [asdict(c) for c in concepts], "latency": latency}
+
+        if self.redis_client is None:
+            self.memory.set(key, entry)
+            return
+
+        try:
+            self.redis_client.set(key, json.dumps(entry), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Concept cache write failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
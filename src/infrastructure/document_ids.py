@@ -0,0 +1,42 @@
+from typing import List, Dict, Any, Set
+import hashlib
+import json
+import logging
+import re
+
+
+logger = logging.getLogger(__name__)
+
+
+_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def filter_document_id(filter_doc: Dict[str, Any]) -> str:
+    """Stable document id: the filter's own id, else a slug of its display name, else a content hash"""
+    if filter_doc.get("id"):
+        return str(filter_doc["id"])
+
+    slug = _SLUG_SEPARATORS.sub("-", str(filter_doc.get("displayName", "")).lower()).strip("-")
+    if slug:
+        return slug
+
+    return hashlib.sha1(json.dumps(filter_doc, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def assign_document_ids(filter_documents: List[Dict[str, Any]], seen: Set[str]) -> List[str]:
+    """Stable ids for a batch of filter definitions, unique across everything in `seen`.
+
+    The first filter with a given id keeps it, later ones sharing it get a
+    content hash suffix rather than a position, so reordering or removing
+    other filters never renames a document.
+    """
+    doc_ids = []
+    for filter_doc in filter_documents:
+        doc_id = filter_document_id(filter_doc)
+        if doc_id in seen:
+            digest = hashlib.sha1(json.dumps(filter_doc, sort_keys=True).encode('utf-8')).hexdigest()
+            doc_id = f"{doc_id}-{digest[:8]}"
+            logger.warning(f"Duplicate filter id for '{filter_doc.get('displayName')}', stored as {doc_id}")
+        seen.add(doc_id)
+        doc_ids.append(doc_id)
+    return doc_ids
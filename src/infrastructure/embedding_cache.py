@@ -0,0 +1,162 @@
+from typing import Dict, List, Optional
+from pathlib import Path
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from config.settings import CacheConfig
+from src.infrastructure.cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisEmbeddingStore:
+    """Shared embedding store, vectors saved as raw float32 bytes"""
+
+    def __init__(self, redis_client, ttl: Optional[int] = None, prefix: str = "embedding_cache"):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, digest: str) -> str:
+        return f"{self.prefix}:{digest}"
+
+    def get_many(self, digests: List[str]) -> Dict[str, np.ndarray]:
+        values = self.redis_client.mget([self._key(d) for d in digests])
+        return {
+            digest: np.frombuffer(value, dtype=np.float32)
+            for digest, value in zip(digests, values)
+            if value is not None
+        }
+
+    def set_many(self, items: Dict[str, np.ndarray]):
+        pipe = self.redis_client.pipeline(transaction=False)
+        for digest, embedding in items.items():
+            pipe.set(self._key(digest), np.asarray(embedding, dtype=np.float32).tobytes(), ex=self.ttl)
+        pipe.execute()
+
+
+class DiskEmbeddingStore:
+    """Local embedding store, one .npy file per vector"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}.npy"
+
+    def get_many(self, digests: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for digest in digests:
+            path = self._path(digest)
+            if path.exists():
+                try:
+                    found[digest] = np.load(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable embedding cache file {path}: {e}")
+        return found
+
+    def set_many(self, items: Dict[str, np.ndarray]):
+        for digest, embedding in items.items():
+            path = self._path(digest)
+            path.parent.mkdir(exist_ok=True)
+
+            # Write then rename so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(embedding, dtype=np.float32))
+            os.replace(tmp_path, path)
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-process LRU in front of an optional persistent store.
+
+    Entries are keyed by a hash of model name and text, so switching models
+    never serves stale vectors.
+    """
+
+    def __init__(self, model_name: str, max_size: int = 10000, store=None):
+        self.model_name = model_name
+        self.memory = LRUCache(max_size)
+        self.store = store
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, model_name: str, config=CacheConfig) -> "EmbeddingCache":
+        store = None
+        if config.embedding_cache_backend == "redis":
+            from src.infrastructure.redis_client import create_redis_client
+            store = RedisEmbeddingStore(create_redis_client(), ttl=config.embedding_cache_ttl)
+        elif config.embedding_cache_backend == "disk":
+            store = DiskEmbeddingStore(config.embedding_cache_dir)
+        elif config.embedding_cache_backend:
+            raise ValueError(f"Unknown embedding cache backend: {config.embedding_cache_backend}")
+
+        return cls(model_name, max_size=config.embedding_cache_size, store=store)
+
+    def _digest(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for the given texts, misses are left out"""
+        found = {}
+        pending = {}
+
+        for text in texts:
+            digest = self._digest(text)
+            embedding = self.memory.get(digest)
+            if embedding is not None:
+                found[text] = embedding
+            else:
+                pending[digest] = text
+
+        memory_hits = len(found)
+        store_hits = 0
+
+        if pending and self.store is not None:
+            try:
+                for digest, embedding in self.store.get_many(list(pending)).items():
+                    self.memory.set(digest, embedding)
+                    found[pending[digest]] = embedding
+                    store_hits += 1
+            except Exception as e:
+                logger.warning(f"Embedding cache store lookup failed: {e}")
+
+        with self._stats_lock:
+            self.memory_hits += memory_hits
+            self.store_hits += store_hits
+            self.misses += len(texts) - memory_hits - store_hits
+
+        return found
+
+    def set_many(self, texts: List[str], embeddings: List[np.ndarray]):
+        items = {self._digest(text): embedding for text, embedding in zip(texts, embeddings)}
+
+        for digest, embedding in items.items():
+            self.memory.set(digest, embedding)
+
+        if self.store is not None:
+            try:
+                self.store.set_many(items)
+            except Exception as e:
+                logger.warning(f"Embedding cache store write failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.store_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+        }
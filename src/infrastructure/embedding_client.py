@@ -1,16 +1,22 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from typing import List, Union
-from config.settings import EmbeddingConfig
+from config.settings import EmbeddingConfig, CacheConfig
+from src.infrastructure.embedding_cache import EmbeddingCache
+from src.infrastructure.lazy import lazy_singleton
+from src.infrastructure.metrics import instrumented
 
 
 class EmbeddingService:
-    def __init__(self, config = EmbeddingConfig):
+    def __init__(self, config = EmbeddingConfig, cache_config = CacheConfig):
+        # torch/transformers take seconds to import, only pay for it when the service is built
+        from sentence_transformers import SentenceTransformer
+
         self.model_name = config.embedding_model
         # self.local_model_path = './models/all-MiniLM-L6-v2'
         # self.model = SentenceTransformer(self.local_model_path)
         self.model = SentenceTransformer(self.model_name)
         self.dimension = self.model.get_sentence_embedding_dimension()
+        self.cache = EmbeddingCache.from_config(self.model_name, cache_config) if cache_config.embedding_cache_size else None
 
     def embed_documents(self, text: Union[str, List[str]]) -> np.ndarray:
         """Generate embeddings for text or list of texts"""
@@ -20,18 +26,34 @@ class EmbeddingService:
         embeddings = self.model.encode(text, convert_to_numpy=True)
         return embeddings if len(embeddings) > 1 else embeddings[0]
 
+    @instrumented("embed")
     def embed_batch(self, texts: List[str], batch_size: int = 8) -> List[np.ndarray]:
-        """Embed multiple texts in batches"""
+        """Embed multiple texts in batches, only cache misses are encoded"""
         if not texts:
             return []
 
-        embeddings = self.model.encode(
+        if self.cache is None:
+            return list(self._encode(texts, batch_size))
+
+        embeddings = self.cache.get_many(texts)
+
+        # dict.fromkeys keeps order and drops repeated texts within the batch
+        misses = [text for text in dict.fromkeys(texts) if text not in embeddings]
+        if misses:
+            encoded = self._encode(misses, batch_size)
+            self.cache.set_many(misses, encoded)
+            embeddings.update(zip(misses, encoded))
+
+        return [embeddings[text] for text in texts]
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        return self.model.encode(
             texts,
             batch_size=batch_size,
             convert_to_numpy=True,
         )
 
-        return [embedding for embedding in embeddings]
-
-
-embedding_service = EmbeddingService()
\ No newline at end of file
+@lazy_singleton
+def get_embedding_service() -> EmbeddingService:
+    """Shared EmbeddingService, the model is loaded on first use"""
+    return EmbeddingService()
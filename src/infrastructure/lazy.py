@@ -0,0 +1,28 @@
+import functools
+import threading
+from typing import Callable, TypeVar
+
+
+T = TypeVar("T")
+
+
+def lazy_singleton(factory: Callable[[], T]) -> Callable[[], T]:
+    """Turn a zero-argument factory into a provider that builds its instance on first call.
+
+    Creation is guarded by a lock, so concurrent first requests (e.g. a warm-up
+    thread racing the first chat) share one instance instead of loading a
+    model twice. `provider.is_initialized()` tells whether it has been built.
+    """
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def provider() -> T:
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    provider.is_initialized = lambda: bool(instance)
+    return provider
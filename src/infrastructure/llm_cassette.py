@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from config.settings import LLMConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class CassetteMiss(LookupError):
+    """Replayed request that was never recorded, not worth retrying"""
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Hash of everything that decides the completion: model, messages, sampling parameters"""
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCassette:
+    """Recorded completions, one JSON line per call: {"key", "content", "latency"}.
+
+    A prompt recorded several times keeps every take, replay cycles through
+    them so repeated prompts keep their spread of latencies.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.latencies: List[float] = []
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        self._add(json.loads(line))
+            logger.info(f"Loaded {len(self.latencies)} recorded completions from {path}")
+
+    def _add(self, entry: Dict[str, Any]):
+        self.entries.setdefault(entry["key"], []).append(entry)
+        self.latencies.append(entry["latency"])
+
+    def record(self, key: str, content: str, latency: float):
+        entry = {"key": key, "content": content, "latency": latency}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._add(entry)
+            # Appended one line per write, so several workers can record into the same file
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def lookup(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            takes = self.entries.get(key)
+            if not takes:
+                raise CassetteMiss(f"No recorded completion for request {key[:12]} in {self.path}")
+            index = self._next.get(key, 0)
+            self._next[key] = index + 1
+            return takes[index % len(takes)]
+
+
+_cassettes: Dict[str, LLMCassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str) -> LLMCassette:
+    """One cassette per file, shared by the sync and async services"""
+    with _cassettes_lock:
+        if path not in _cassettes:
+            _cassettes[path] = LLMCassette(path)
+        return _cassettes[path]
+
+
+def _completion(content: str):
+    """Just the parts of an OpenAI ChatCompletion the LLM services read"""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _Recorder:
+    def __init__(self, completions, cassette: LLMCassette):
+        self.completions = completions
+        self.cassette = cassette
+
+    def create(self, **kwargs):
+        start = time.perf_counter()
+        response = self.completions.create(**kwargs)
+        self.cassette.record(request_key(kwargs), response.choices[0].message.content, time.perf_counter() - start)
+        return response
+
+
+class _AsyncRecorder(_Recorder):
+    async def create(self, **kwargs):
+        start = time.perf_counter()
+        response = await self.completions.create(**kwargs)
+        self.cassette.record(request_key(kwargs), response.choices[0].message.content, time.perf_counter() - start)
+        return response
+
+
+class _Player:
+    def __init__(self, cassette: LLMCassette, latency: str, scale: float):
+        if latency not in ("recorded", "sampled", "none"):
+            raise ValueError(f"Unknown cassette latency mode: {latency}")
+        self.cassette = cassette
+        self.latency = latency
+        self.scale = scale
+
+    def _delay(self, entry: Dict[str, Any]) -> float:
+        if self.latency == "none":
+            return 0.0
+        if self.latency == "sampled":
+            # Any recorded call's latency, not this prompt's: same distribution, less replay-order bias
+            return random.choice(self.cassette.latencies) * self.scale
+        return entry["latency"] * self.scale
+
+    def create(self, **kwargs):
+        entry = self.cassette.lookup(request_key(kwargs))
+        time.sleep(self._delay(entry))
+        return _completion(entry["content"])
+
+
+class _AsyncPlayer(_Player):
+    async def create(self, **kwargs):
+        entry = self.cassette.lookup(request_key(kwargs))
+        await asyncio.sleep(self._delay(entry))
+        return _completion(entry["content"])
+
+
+def cassette_client(create_client, config=LLMConfig, asynchronous: bool = False):
+    """OpenAI client as configured by config.cassette_mode.
+
+    record: the real client, every completion is appended to the cassette
+            with its observed latency
+    replay: no client or network at all, completions come from the cassette
+            after the recorded (or sampled) latency times cassette_latency_scale
+    None:   the real client untouched
+    """
+    mode = config.cassette_mode
+    if not mode:
+        return create_client()
+
+    cassette = get_cassette(config.cassette_path)
+    if mode == "record":
+        client = create_client()
+        recorder = (_AsyncRecorder if asynchronous else _Recorder)(client.chat.completions, cassette)
+        return SimpleNamespace(chat=SimpleNamespace(completions=recorder))
+
+    if mode == "replay":
+        player = (_AsyncPlayer if asynchronous else _Player)(
+            cassette, config.cassette_latency, config.cassette_latency_scale
+        )
+        return SimpleNamespace(chat=SimpleNamespace(completions=player))
+
+    raise ValueError(f"Unknown LLM cassette mode: {mode}")
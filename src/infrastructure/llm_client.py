@@ -1,59 +1,76 @@
-from openai import OpenAI
 from config.settings import LLMConfig
+from src.infrastructure.lazy import lazy_singleton
+from src.infrastructure.llm_cassette import CassetteMiss, cassette_client
+from src.infrastructure.metrics import instrumented
 from typing import List, Dict, Any, Optional
+import asyncio
 import json
 import time
 
 
 class LLMService:
+    asynchronous = False
+
     def __init__(self, config=LLMConfig):
-        self.client = OpenAI(api_key=config.api_key)
+        # Recorded or replayed through the cassette when LLM_CASSETTE_MODE is set
+        self.client = cassette_client(lambda: self._create_client(config), config, self.asynchronous)
         self.model = config.llm_model
         self.temperature = config.temperature
         self.max_tokens = config.max_tokens
         self.max_retries = config.max_retries
         self.retry_delay = config.max_delay
 
-    def generate_completion(self,
-                            system_prompt: str,
-                            user_prompt: str,
-                            json_mode: bool = True) -> str:
-        """Generate completion using OpenAI API with retry logic"""
+    def _create_client(self, config):
+        from openai import OpenAI
+        return OpenAI(api_key=config.api_key, base_url=config.base_url)
 
+    def _build_request(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
 
-        kwargs = {
+        return {
             "model": self.model,
             "messages": messages,
             "temperature": self.temperature,
             "max_tokens": self.max_tokens
         }
 
+    def _process_content(self, content: str, json_mode: bool) -> str:
+        content = content.strip()
+
+        if json_mode:
+            try:
+                # Validate it's proper JSON and return as-is if valid
+                json.loads(content)
+                return content
+            except json.JSONDecodeError:
+                # If not valid JSON, try to extract JSON or wrap it
+                extracted_json = self.extract_json_from_response(content)
+                if extracted_json:
+                    return json.dumps(extracted_json)
+                else:
+                    # Last resort: wrap in object
+                    return json.dumps({"response": content})
+
+        return content
+
+    @instrumented("llm")
+    def generate_completion(self,
+                            system_prompt: str,
+                            user_prompt: str,
+                            json_mode: bool = True) -> str:
+        """Generate completion using OpenAI API with retry logic"""
+        kwargs = self._build_request(system_prompt, user_prompt)
 
         for attempt in range(self.max_retries):
             try:
                 response = self.client.chat.completions.create(**kwargs)
-                content = response.choices[0].message.content.strip()
-
-                if json_mode:
-                    try:
-                        # Validate it's proper JSON and return as-is if valid
-                        json.loads(content)
-                        return content
-                    except json.JSONDecodeError:
-                        # If not valid JSON, try to extract JSON or wrap it
-                        extracted_json = self.extract_json_from_response(content)
-                        if extracted_json:
-                            return json.dumps(extracted_json)
-                        else:
-                            # Last resort: wrap in object
-                            return json.dumps({"response": content})
-
-                return content
+                return self._process_content(response.choices[0].message.content, json_mode)
 
+            except CassetteMiss:
+                raise
             except Exception as e:
                 if attempt < self.max_retries - 1:
                     print(f"LLM API error (attempt {attempt + 1}): {str(e)}")
@@ -91,4 +108,44 @@ class LLMService:
             return {}
 
 
-llm_service = LLMService()
\ No newline at end of file
+class AsyncLLMService(LLMService):
+    """AsyncOpenAI-backed variant, lets one event loop keep many completions in flight"""
+    asynchronous = True
+
+    def _create_client(self, config):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+
+    @instrumented("llm")
+    async def generate_completion(self,
+                                  system_prompt: str,
+                                  user_prompt: str,
+                                  json_mode: bool = True) -> str:
+        """Generate completion using OpenAI API with retry logic"""
+        kwargs = self._build_request(system_prompt, user_prompt)
+
+        for attempt in range(self.max_retries):
+            try:
+                response = await self.client.chat.completions.create(**kwargs)
+                return self._process_content(response.choices[0].message.content, json_mode)
+
+            except CassetteMiss:
+                raise
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    print(f"LLM API error (attempt {attempt + 1}): {str(e)}")
+                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                else:
+                    raise Exception(f"LLM API failed after {self.max_retries} attempts: {str(e)}")
+
+
+@lazy_singleton
+def get_llm_service() -> LLMService:
+    """Shared LLMService, built on first use"""
+    return LLMService()
+
+
+@lazy_singleton
+def get_async_llm_service() -> AsyncLLMService:
+    """Shared AsyncLLMService, built on first use"""
+    return AsyncLLMService()
@@ -0,0 +1,191 @@
+import numpy as np
+from typing import List, Dict, Any, Optional
+import logging
+
+from config.settings import VectorStoreConfig
+from src.infrastructure.metrics import instrumented
+from src.infrastructure.redis_client import metadata_to_filter
+from src.infrastructure.document_ids import assign_document_ids
+
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class InMemoryFilterStore:
+    """In-process vector index with the same search contract as RedisFilterStore.
+
+    Embeddings are kept L2-normalized in one contiguous float32 matrix, so an
+    exact cosine search for a whole batch is a single matrix multiply. With
+    `memory_index_type = "hnsw"` an hnswlib index is built instead for larger
+    catalogs. Scores are cosine distances, same as the Redis COSINE metric.
+    """
+
+    def __init__(self, config=VectorStoreConfig):
+        self.config = config
+        self.index_type = config.memory_index_type
+        self.dimension = config.memory_embedding_dimension
+
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.doc_ids: List[str] = []
+        self.categories = np.empty(0, dtype=object)
+        self.embeddings = np.empty((0, self.dimension), dtype=np.float32)
+        self.ann_index = None
+        self.version = 0
+
+    def catalog_version(self) -> int:
+        """Counter bumped on every catalog load"""
+        return self.version
+
+    def create_index(self):
+        """Kept for interface parity with RedisFilterStore, nothing to create up front"""
+        if self.index_type not in ("exact", "hnsw"):
+            raise ValueError(f"Unknown memory index type: {self.index_type}")
+
+    def add_documents(self, texts: List[str], metadatas: List[Dict], embeddings: List[List[float]]):
+        """Load documents into the index.
+
+        Like RedisFilterStore.add_documents, loading a catalog replaces the
+        previous one.
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+
+        self.texts = list(texts)
+        self.metadatas = list(metadatas)
+        self.doc_ids = assign_document_ids(self.metadatas, set())
+        # Lowercased to match Redis TAG fields, which are case-insensitive
+        self.categories = np.array([(m.get('category') or '').lower() for m in metadatas], dtype=object)
+        self.embeddings = np.ascontiguousarray(_normalize_rows(matrix))
+        self.dimension = self.embeddings.shape[1]
+
+        if self.index_type == "hnsw":
+            self._build_ann_index()
+
+        self.version += 1
+
+        logger.info(f"Loaded {len(texts)} documents into in-memory {self.index_type} index")
+
+    def _build_ann_index(self):
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImportError("memory_index_type='hnsw' requires hnswlib: pip install hnswlib")
+
+        num_docs = len(self.embeddings)
+        index = hnswlib.Index(space='cosine', dim=self.dimension)
+        index.init_index(
+            max_elements=max(num_docs, 1),
+            M=self.config.hnsw_m,
+            ef_construction=self.config.hnsw_ef_construction
+        )
+        if num_docs:
+            index.add_items(self.embeddings, np.arange(num_docs))
+        index.set_ef(self.config.hnsw_ef_search)
+        self.ann_index = index
+
+    def search_filters(self,
+                       query_embedding: np.ndarray,
+                       top_k: int = 5,
+                       category: Optional[str] = None,
+                       score_threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """Search filters by vector similarity"""
+        return self.search_filters_batch([query_embedding], top_k, category, score_threshold)[0]
+
+    @instrumented("memory.knn")
+    def search_filters_batch(self,
+                             query_embeddings: List[np.ndarray],
+                             top_k: int = 1,
+                             category: Optional[str] = None,
+                             score_threshold: float = 0.5,
+                             categories: Optional[List[Optional[str]]] = None) -> List[List[Dict[str, Any]]]:
+        """Search filters for multiple query embeddings at once, optionally one category per embedding"""
+
+        if not query_embeddings:
+            return []
+
+        if categories is None:
+            return self._search_batch(query_embeddings, top_k, category, score_threshold)
+
+        # One search per distinct category, results put back in input order
+        groups = {}
+        for i, c in enumerate(categories):
+            groups.setdefault(c, []).append(i)
+        batch_results = [None] * len(query_embeddings)
+        for c, indexes in groups.items():
+            group_results = self._search_batch([query_embeddings[i] for i in indexes], top_k, c, score_threshold)
+            for i, filters in zip(indexes, group_results):
+                batch_results[i] = filters
+        return batch_results
+
+    def _search_batch(self,
+                      query_embeddings: List[np.ndarray],
+                      top_k: int,
+                      category: Optional[str],
+                      score_threshold: float) -> List[List[Dict[str, Any]]]:
+        category = category.lower() if category else None
+
+        num_docs = len(self.metadatas)
+        if num_docs == 0:
+            return [[] for _ in query_embeddings]
+
+        queries = _normalize_rows(
+            np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1)
+        )
+        k = min(top_k, num_docs)
+
+        if self.index_type == "hnsw":
+            indices, distances = self._search_ann(queries, k, category)
+        else:
+            indices, distances = self._search_exact(queries, k, category)
+
+        batch_results = []
+        for row_indices, row_distances in zip(indices, distances):
+            filters = []
+            for doc_index, score in zip(row_indices, row_distances):
+                if doc_index < 0 or score > score_threshold:
+                    continue
+                filters.append(metadata_to_filter(self.metadatas[doc_index], float(score), self.doc_ids[doc_index]))
+            batch_results.append(filters)
+
+        return batch_results
+
+    def _search_exact(self, queries: np.ndarray, k: int, category: Optional[str]):
+        similarities = queries @ self.embeddings.T
+
+        if category:
+            similarities[:, self.categories != category] = -np.inf
+
+        if k < similarities.shape[1]:
+            candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(similarities.shape[1]), (len(queries), 1))
+
+        candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')
+
+        indices = np.take_along_axis(candidates, order, axis=1)
+        distances = 1 - np.take_along_axis(candidate_scores, order, axis=1)
+        # Candidates masked out by the category filter have infinite distance
+        indices = np.where(np.isfinite(distances), indices, -1)
+
+        return indices, distances
+
+    def _search_ann(self, queries: np.ndarray, k: int, category: Optional[str]):
+        if category:
+            allowed = self.categories == category
+            k = min(k, int(allowed.sum()))
+            if k == 0:
+                return np.empty((len(queries), 0), dtype=int), np.empty((len(queries), 0))
+            labels, distances = self.ann_index.knn_query(
+                queries, k=k, num_threads=1, filter=lambda label: bool(allowed[label])
+            )
+        else:
+            labels, distances = self.ann_index.knn_query(queries, k=k)
+
+        return labels.astype(int), distances
@@ -0,0 +1,181 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config.settings import ObservabilityConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Labelled latency histogram rendered in the Prometheus text format.
+
+    Kept in-process and per worker: each gunicorn worker exposes its own
+    series, the scraper (or a sum() in the query) aggregates them.
+    """
+
+    def __init__(self, name: str, documentation: str, label: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[str, List[float]] = {}  # label value -> bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {value: list(series) for value, series in self._series.items()}
+
+        for value, series in sorted(snapshot.items()):
+            label = f'{self.label}="{value}"'
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {series[-1]}')
+            lines.append(f'{self.name}_sum{{{label}}} {series[-2]}')
+            lines.append(f'{self.name}_count{{{label}}} {series[-1]}')
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "nlp2filters_stage_duration_seconds",
+    "Time spent in graph nodes (node.*) and external calls (llm, embed, redis.knn, ...)",
+    "stage",
+    ObservabilityConfig.latency_buckets,
+)
+REQUEST_SECONDS = Histogram(
+    "nlp2filters_request_duration_seconds",
+    "Time to serve an API request",
+    "endpoint",
+    ObservabilityConfig.latency_buckets,
+)
+
+
+# Per-request breakdown, only collected while a collect_timings() block is active
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+_timings_lock = threading.Lock()
+
+_tracer = None
+_tracer_pid = None
+_tracer_lock = threading.Lock()
+
+
+def _create_tracer(config=ObservabilityConfig):
+    """OpenTelemetry tracer for the configured exporter, None when tracing is off"""
+    if not config.tracing_exporter:
+        return None
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        raise ImportError("TRACING_EXPORTER requires OpenTelemetry: pip install '.[tracing]'")
+
+    if config.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter(endpoint=config.tracing_otlp_endpoint, insecure=True)
+    elif config.tracing_exporter == "file":
+        exporter = ConsoleSpanExporter(
+            out=open(config.tracing_file, "a"),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    else:
+        raise ValueError(f"Unknown tracing exporter: {config.tracing_exporter}")
+
+    provider = TracerProvider(resource=Resource.create({"service.name": config.tracing_service_name}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    logger.info(f"Exporting traces via {config.tracing_exporter}")
+    return provider.get_tracer(__name__)
+
+
+def get_tracer():
+    # Rebuilt after a fork, the span processor's export thread doesn't survive it
+    global _tracer, _tracer_pid
+    if _tracer_pid != os.getpid():
+        with _tracer_lock:
+            if _tracer_pid != os.getpid():
+                _tracer = _create_tracer()
+                _tracer_pid = os.getpid()
+    return _tracer
+
+
+@contextmanager
+def timed(stage: str):
+    """Record how long the block took: histogram, request breakdown and (if enabled) a span"""
+    tracer = get_tracer()
+    with tracer.start_as_current_span(stage) if tracer is not None else nullcontext():
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            STAGE_SECONDS.observe(stage, elapsed)
+            timings = _request_timings.get()
+            if timings is not None:
+                # Parallel calls of one stage (e.g. value filling chunks) add up
+                with _timings_lock:
+                    timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def instrumented(stage: str):
+    """Decorator form of timed(), for sync and async functions"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """Collect a {stage: seconds} breakdown of everything timed inside the block"""
+    timings: Dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def render_metrics(gauges: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    """Prometheus text exposition of the latency histograms plus point-in-time gauges.
+
+    gauges: {metric name: {'label="value",...': value}}
+    """
+    lines = STAGE_SECONDS.render() + REQUEST_SECONDS.render()
+    for name, series in (gauges or {}).items():
+        if not series:
+            continue
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in series.items():
+            lines.append(f"{name}{{{labels}}} {value}")
+    return "\n".join(lines) + "\n"
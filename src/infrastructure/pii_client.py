@@ -1,8 +1,7 @@
-from presidio_analyzer import AnalyzerEngine
-from presidio_analyzer.nlp_engine import NlpEngineProvider
-from presidio_anonymizer import AnonymizerEngine
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
+from src.infrastructure.lazy import lazy_singleton
+from src.infrastructure.metrics import instrumented
 
 
 @dataclass
@@ -16,6 +15,11 @@ class PIIEntity:
 class PIIService:
     """Presidio-based PII detection and masking"""
     def __init__(self):
+        # presidio pulls in spaCy, import it together with the en_core_web_lg load
+        from presidio_analyzer import AnalyzerEngine
+        from presidio_analyzer.nlp_engine import NlpEngineProvider
+        from presidio_anonymizer import AnonymizerEngine
+
         nlp_configuration = {
             "nlp_engine_name": "spacy",
             "models": [{"lang_code": "en", "model_name": "en_core_web_lg"}],
@@ -55,6 +59,7 @@ class PIIService:
 
         return sorted(entities, key=lambda x: x.start)
 
+    @instrumented("pii")
     def mask_text(self, text: str) -> Tuple[str, Dict[str, str]]:
         """Mask PII in text and return mappings"""
         entities = self.detect_pii(text)
@@ -90,4 +95,7 @@ class PIIService:
         return unmasked_text
 
 
-pii_service = PIIService()
\ No newline at end of file
+@lazy_singleton
+def get_pii_service() -> PIIService:
+    """Shared PIIService, spaCy model is loaded on first use"""
+    return PIIService()
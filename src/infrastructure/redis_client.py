@@ -1,35 +1,143 @@
 import redis
+import redis.asyncio
+import asyncio
 import json
+import re
+import threading
 import time
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import logging
 
-from redis.commands.search.field import TextField, VectorField
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.commands.search.field import TagField, TextField, VectorField
 from redis.commands.search.index_definition import IndexDefinition, IndexType
 from redis.commands.search.query import Query
+from redis.commands.search.result import Result
+from redis.retry import Retry
 from config.settings import RedisConfig
+from src.infrastructure.lazy import lazy_singleton
+from src.infrastructure.metrics import instrumented
+from src.infrastructure.document_ids import assign_document_ids
 
 
 logger = logging.getLogger(__name__)
 
+
+# Filter definition fields indexed as TAGs for KNN pre-filtering, also stored as plain hash fields
+TAG_FIELDS = ("category", "type", "controlType")
+
+_TAG_SPECIAL = re.compile(r"([^A-Za-z0-9_])")
+
+
+def escape_tag(value: str) -> str:
+    """Escape a TAG query value, spaces and punctuation would otherwise split or break the query"""
+    return _TAG_SPECIAL.sub(r"\\\1", value)
+
+
+def metadata_to_filter(metadata: Dict[str, Any], score: float, doc_id: str = '') -> Dict[str, Any]:
+    """Convert stored filter definition and cosine distance into a search hit"""
+    return {
+        "filter_id": metadata.get('id') or doc_id,
+        "display_name": metadata.get('displayName', ''),
+        "type": metadata.get('type', ''),
+        "control_type": metadata.get('controlType', ''),
+        "category": metadata.get('category', ''),
+        "description": metadata.get('description', ''),
+        "operators": metadata.get('operators', []),
+        "options": metadata.get('options', []),
+        "confidence": 1 - score
+    }
+
+
+def _connection_kwargs(config, retry_class) -> Dict[str, Any]:
+    return dict(
+        host=config.redis_host,
+        port=config.redis_port,
+        db=config.redis_db,
+        password=config.redis_password,
+        socket_timeout=config.redis_socket_timeout,
+        socket_connect_timeout=config.redis_socket_connect_timeout,
+        health_check_interval=config.redis_health_check_interval,
+        retry=retry_class(
+            ExponentialWithJitterBackoff(base=config.redis_retry_backoff_base, cap=config.redis_retry_backoff_cap),
+            config.redis_retries
+        ),
+        retry_on_error=[redis.ConnectionError, redis.TimeoutError],
+        decode_responses=False
+    )
+
+
+_pools: Dict[Any, redis.BlockingConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_redis_pool(config=RedisConfig) -> redis.BlockingConnectionPool:
+    """Process-wide blocking pool per config, threads wait for a free connection instead of opening more"""
+    with _pools_lock:
+        if config not in _pools:
+            _pools[config] = redis.BlockingConnectionPool(
+                max_connections=config.redis_max_connections,
+                timeout=config.redis_pool_timeout,
+                **_connection_kwargs(config, Retry)
+            )
+        return _pools[config]
+
+
+def close_pools():
+    """Disconnect every pooled sync connection, e.g. when a server worker exits"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.disconnect()
+
+
+def create_redis_client(config=RedisConfig) -> redis.Redis:
+    return redis.Redis(connection_pool=get_redis_pool(config))
+
+
+def create_async_redis_client(config=RedisConfig) -> redis.asyncio.Redis:
+    """asyncio client with its own pool, usable only from the event loop that first uses it"""
+    pool = redis.asyncio.BlockingConnectionPool(
+        max_connections=config.redis_max_connections,
+        timeout=config.redis_pool_timeout,
+        **_connection_kwargs(config, AsyncRetry)
+    )
+    return redis.asyncio.Redis(connection_pool=pool)
+
+
+def pool_stats(pool) -> Optional[Dict[str, int]]:
+    """Connection counts of a sync or asyncio redis pool, None if redis-py's pool internals changed"""
+    try:
+        if isinstance(pool, redis.asyncio.ConnectionPool):
+            in_use = len(pool._in_use_connections)
+            idle = len(pool._available_connections)
+        else:
+            idle = sum(connection is not None for connection in list(pool.pool.queue))
+            in_use = len(pool._connections) - idle
+        return {"max_connections": pool.max_connections, "in_use": in_use, "idle": idle}
+    except (AttributeError, TypeError) as e:
+        logger.debug(f"Pool stats unavailable: {e}")
+        return None
+
+
 class RedisFilterStore:
     def __init__(self,  config = RedisConfig):
         self.config = config
-        self.redis_client = redis.Redis(
-            host=config.redis_host,
-            port=config.redis_port,
-            db=config.redis_db,
-            password=config.redis_password, # Add password
-            decode_responses=False
-        )
-
-    def create_index(self):
-        """Create Redis search index"""
+        self.redis_client = create_redis_client(config)
+
+        # Filter definitions by document id, searches only return ids and scores
+        self._catalog: Dict[str, Dict[str, Any]] = {}
+        self._catalog_version: Optional[int] = None
+        self._catalog_lock = threading.Lock()
+
+    def create_index(self, index_name: Optional[str] = None):
+        """Create Redis search index, documents are the hashes under `{index_name}:`"""
+        index_name = index_name or self.config.redis_index_name
         try:
             try:
-                self.redis_client.ft(self.config.redis_index_name).info()
-                logger.info(f"Index {self.config.redis_index_name} already exists")
+                self.redis_client.ft(index_name).info()
+                logger.info(f"Index {index_name} already exists")
                 return
             except:
                 pass
@@ -41,39 +149,89 @@ class RedisFilterStore:
                     "DISTANCE_METRIC": "COSINE"
                 }),
                 TextField("text"),
-                TextField("metadata")
+                TextField("metadata"),
+                *(TagField(name) for name in TAG_FIELDS)
             ]
 
-            self.redis_client.ft(self.config.redis_index_name).create_index(
+            self.redis_client.ft(index_name).create_index(
                 schema,
                 definition=IndexDefinition(
-                    prefix=[f"{self.config.redis_index_name}:"],
+                    prefix=[f"{index_name}:"],
                     index_type=IndexType.HASH
                 )
             )
-            logger.info(f"Created Redis index: {self.config.redis_index_name}")
+            logger.info(f"Created Redis index: {index_name}")
 
         except Exception as e:
             logger.error(f"Error creating Redis index: {e}")
 
-    def add_documents(self, texts: List[str], metadatas: List[Dict], embeddings: List[List[float]]):
-        """Add documents to Redis"""
+    def live_index_name(self) -> Optional[str]:
+        """Index that searches currently hit through the redis_index_name alias, None before the first load"""
+        try:
+            info = self.redis_client.ft(self.config.redis_index_name).info()
+        except redis.ResponseError:
+            return None
+        return info.get('index_name') or self.config.redis_index_name
+
+    def create_versioned_index(self) -> str:
+        """Empty index for the next catalog version, built next to the live one.
+
+        The alias target is never reused, even when the version counter was
+        reset or lags the alias; its name is skipped for the next version.
+        """
+        live = self.live_index_name()
+        version = self.catalog_version() + 1
+        index_name = f"{self.config.redis_index_name}_v{version}"
+        while index_name == live:
+            version += 1
+            index_name = f"{self.config.redis_index_name}_v{version}"
+
         try:
-            for i, (text, metadata, embedding) in enumerate(zip(texts, metadatas, embeddings)):
-                doc_id = f"{self.config.redis_index_name}:{i}"
+            # Left over from a build that never got swapped in, the alias points elsewhere
+            self.redis_client.ft(index_name).dropindex(delete_documents=True)
+            logger.info(f"Dropped orphaned index {index_name}")
+        except redis.ResponseError:
+            pass
+        self.create_index(index_name)
+        return index_name
+
+    def swap_index(self, index_name: str):
+        """Atomically point the search alias at index_name, then drop the index it replaced"""
+        alias = self.config.redis_index_name
+        previous = self.live_index_name()
+
+        if previous == alias:
+            # Pre-alias deployments have a real index under the alias name, it must go before the alias exists
+            logger.warning(f"Replacing unaliased index {alias}, searches fail until the alias is added")
+            self.redis_client.ft(alias).dropindex(delete_documents=True)
+
+        self.redis_client.ft(index_name).aliasupdate(alias)
+        logger.info(f"Alias {alias} now points to {index_name}")
+
+        if previous not in (None, alias, index_name):
+            self.redis_client.ft(previous).dropindex(delete_documents=True)
+            logger.info(f"Dropped previous index {previous}")
+
+    @staticmethod
+    def document_key(index_name: str, doc_id: str) -> str:
+        return f"{index_name}:{doc_id}"
 
-                embedding_bytes = np.array(embedding, dtype=np.float32).tobytes()
+    def add_documents(self, texts: List[str], metadatas: List[Dict], embeddings: List[List[float]]):
+        """Replace the catalog: build a new index version and swap it in"""
+        try:
+            index_name = self.create_versioned_index()
 
-                self.redis_client.hset(doc_id, mapping={
-                    b"text": text.encode('utf-8'),
-                    b"metadata": json.dumps(metadata).encode('utf-8'),
-                    b"embedding": embedding_bytes
-                })
+            doc_ids = assign_document_ids(metadatas, set())
+            doc_keys = [self.document_key(index_name, doc_id) for doc_id in doc_ids]
+            self.write_documents(doc_keys, texts, metadatas, embeddings)
 
             logger.info(f"Added {len(texts)} documents to Redis")
 
-            # Wait for indexing
-            time.sleep(2)
+            self.wait_for_indexing(index_name)
+            self.swap_index(index_name)
+
+            # Lets caches keyed on catalog contents notice the reindex
+            self.bump_catalog_version()
 
             # Force a check
             self._check_index_status()
@@ -82,11 +240,86 @@ class RedisFilterStore:
             logger.error(f"Error adding documents to Redis: {e}")
             raise
 
+    def write_documents(self,
+                        doc_keys: List[str],
+                        texts: List[str],
+                        metadatas: List[Dict],
+                        embeddings: List[List[float]],
+                        content_hashes: Optional[List[str]] = None):
+        """Write documents in one MULTI/EXEC round trip, a batch lands in the index all or nothing"""
+        pipe = self.redis_client.pipeline(transaction=True)
+        for i, (doc_key, text, metadata, embedding) in enumerate(zip(doc_keys, texts, metadatas, embeddings)):
+            mapping = {
+                b"text": text.encode('utf-8'),
+                b"metadata": json.dumps(metadata).encode('utf-8'),
+                b"embedding": np.asarray(embedding, dtype=np.float32).tobytes()
+            }
+            for name in TAG_FIELDS:
+                if metadata.get(name):
+                    mapping[name.encode('utf-8')] = str(metadata[name]).encode('utf-8')
+            if content_hashes is not None:
+                mapping[b"content_hash"] = content_hashes[i].encode('utf-8')
+            pipe.hset(doc_key, mapping=mapping)
+        pipe.execute()
+
+    def content_hashes(self, doc_keys: List[str]) -> List[Optional[str]]:
+        """Content hash stored with each document, None for missing or unhashed ones"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for doc_key in doc_keys:
+            pipe.hget(doc_key, b"content_hash")
+        return [value.decode('utf-8') if value else None for value in pipe.execute()]
+
+    def stored_embeddings(self, doc_keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Embeddings already stored under doc_keys, so a reindex can copy instead of re-embedding"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for doc_key in doc_keys:
+            pipe.hget(doc_key, b"embedding")
+        return [np.frombuffer(value, dtype=np.float32) if value else None for value in pipe.execute()]
+
+    def delete_stale_documents(self, index_name: str, keep_ids: Set[str], chunk_size: int = 1000) -> int:
+        """Delete the index's documents whose id is not in keep_ids, returns how many went"""
+        prefix = f"{index_name}:"
+        stale = [
+            key for key in self.redis_client.scan_iter(match=f"{prefix}*", count=chunk_size)
+            if key.decode('utf-8')[len(prefix):] not in keep_ids
+        ]
+        for start in range(0, len(stale), chunk_size):
+            self.redis_client.unlink(*stale[start:start + chunk_size])
+        return len(stale)
+
+    def wait_for_indexing(self, index_name: Optional[str] = None,
+                          timeout: float = 60.0, poll_interval: float = 0.1) -> bool:
+        """Poll FT.INFO until background indexing has caught up with the written hashes"""
+        index_name = index_name or self.config.redis_index_name
+        deadline = time.monotonic() + timeout
+        while True:
+            info = self.redis_client.ft(index_name).info()
+            indexing = int(info.get('indexing', 0) or 0)
+            percent = float(info.get('percent_indexed', 1) or 0)
+            if not indexing and percent >= 1:
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning(f"Index {index_name} still indexing ({percent:.0%}) after {timeout}s")
+                return False
+            time.sleep(poll_interval)
+
+    def _catalog_version_key(self) -> str:
+        # Outside the index key prefix so it is never indexed as a document
+        return f"catalog_version:{self.config.redis_index_name}"
+
+    def bump_catalog_version(self):
+        self.redis_client.incr(self._catalog_version_key())
+
+    def catalog_version(self) -> int:
+        """Counter bumped on every catalog load"""
+        return int(self.redis_client.get(self._catalog_version_key()) or 0)
+
     def _check_index_status(self):
         """Check index status and document count"""
         try:
             info = self.redis_client.ft(self.config.redis_index_name).info()
-            print(f"Index info: {info}")
+            logger.debug(f"Index {info.get('index_name')}: {info.get('num_docs')} docs, "
+                         f"{float(info.get('percent_indexed', 1) or 0):.0%} indexed")
 
             query = Query("*").return_fields("text").paging(0, 5)
             results = self.redis_client.ft(self.config.redis_index_name).search(query)
@@ -95,83 +328,210 @@ class RedisFilterStore:
         except Exception as e:
             logger.error(f"Error checking index: {e}")
 
-    def search_filters(self,
-                       query_embedding: np.ndarray,
-                       top_k: int = 5,
-                       category: Optional[str] = None,
-                       score_threshold: float = 0.5) -> List[Dict[str, Any]]:
-        """Search filters by vector similarity"""
-
-        # Build query
-        base_query = f"*=>[KNN {top_k} @embedding $vec AS score]"
-        if category:
-            base_query = f"@category:{category} {base_query}"
+    def _build_knn_query(self, top_k: int, category: Optional[str] = None) -> Query:
+        """Build KNN query for the filter index, pre-filtered to a category when given"""
+        prefilter = f"(@category:{{{escape_tag(category)}}})" if category else "*"
+        base_query = f"{prefilter}=>[KNN {top_k} @embedding $vec AS score]"
 
-        query = Query(base_query) \
+        # Only ids and scores come back, definitions are hydrated from the in-process catalog
+        return Query(base_query) \
             .sort_by("score") \
             .paging(0, top_k) \
-            .return_fields("text", "metadata", "score") \
+            .return_fields("score") \
             .dialect(2)
 
-        # Execute search
-        results = self.redis_client.ft(self.config.redis_index_name).search(
-            query,
-            query_params={"vec": query_embedding.astype(np.float32).tobytes()}
-        )
+    def _ensure_catalog(self, version: int):
+        """Reload the in-process catalog when the stored catalog version moved on"""
+        if version == self._catalog_version:
+            return
+        with self._catalog_lock:
+            if version == self._catalog_version:
+                return
+            index_name = self.live_index_name() or self.config.redis_index_name
+            self._catalog = self._read_metadata(
+                list(self.redis_client.scan_iter(match=f"{index_name}:*", count=1000))
+            )
+            self._catalog_version = version
+            logger.info(f"Loaded {len(self._catalog)} filter definitions from {index_name}")
+
+    def _read_metadata(self, doc_keys: List, chunk_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """Stored filter definitions by document id"""
+        catalog = {}
+        for start in range(0, len(doc_keys), chunk_size):
+            chunk = doc_keys[start:start + chunk_size]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for doc_key in chunk:
+                pipe.hget(doc_key, b"metadata")
+            for doc_key, value in zip(chunk, pipe.execute()):
+                if value:
+                    doc_key = doc_key.decode('utf-8') if isinstance(doc_key, bytes) else doc_key
+                    catalog[doc_key.split(':', 1)[1]] = json.loads(value)
+        return catalog
+
+    def _hydrate(self, results, score_threshold: float) -> List[Dict[str, Any]]:
+        """Turn FT.SEARCH ids and scores into filter dicts from the catalog"""
+        hits = []
+        for doc in getattr(results, 'docs', None) or []:
+            score = float(getattr(doc, 'score', 1.0))
+            if score <= score_threshold:
+                hits.append((doc.id, score))
+
+        # Written after the catalog was loaded, fetched once and kept
+        missing = [doc_key for doc_key, _ in hits if doc_key.split(':', 1)[1] not in self._catalog]
+        if missing:
+            self._catalog.update(self._read_metadata(missing))
 
-        # Parse results
         filters = []
-        if hasattr(results, 'docs') and results.docs:
-            for doc in results.docs:
-                try:
-                    score = float(getattr(doc, 'score', 1.0))
-
-                    if score > score_threshold:
-                        continue
-
-                    # Parse metadata
-                    metadata_str = getattr(doc, 'metadata', '{}')
-                    if isinstance(metadata_str, bytes):
-                        metadata_str = metadata_str.decode('utf-8')
-
-                    metadata = json.loads(metadata_str)
-
-                    filter_data = {
-                        "filter_id": metadata.get('id', ''),
-                        "display_name": metadata.get('displayName', ''),
-                        "type": metadata.get('type', ''),
-                        "control_type": metadata.get('controlType', ''),
-                        "category": metadata.get('category', ''),
-                        "description": metadata.get('description', ''),
-                        "operators": metadata.get('operators', []),
-                        "options": metadata.get('options', []),
-                        "confidence": 1 - score
-                    }
-                    filters.append(filter_data)
-
-                except Exception as e:
-                    logger.error(f"Error parsing document: {e}")
-                    continue
+        for doc_key, score in hits:
+            doc_id = doc_key.split(':', 1)[1]
+            metadata = self._catalog.get(doc_id)
+            if metadata is None:
+                logger.error(f"No filter definition stored for {doc_key}")
+                continue
+            filters.append(metadata_to_filter(metadata, score, doc_id))
 
         return filters
 
+    def search_filters(self,
+                       query_embedding: np.ndarray,
+                       top_k: int = 5,
+                       category: Optional[str] = None,
+                       score_threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """Search filters by vector similarity"""
+        return self.search_filters_batch([query_embedding], top_k, category, score_threshold)[0]
+
+    @instrumented("redis.knn")
     def search_filters_batch(self,
                              query_embeddings: List[np.ndarray],
                              top_k: int = 1,
                              category: Optional[str] = None,
-                             score_threshold: float = 0.5) -> List[List[Dict[str, Any]]]:
-        """Search filters for multiple query embeddings"""
+                             score_threshold: float = 0.5,
+                             categories: Optional[List[Optional[str]]] = None) -> List[List[Dict[str, Any]]]:
+        """Search filters for multiple query embeddings in a single round trip.
+
+        All KNN queries are queued on one non-transactional pipeline, together
+        with a read of the catalog version, and the replies are split back per
+        embedding, in input order. `categories` gives each embedding its own
+        category pre-filter instead of `category`.
+        """
 
         if not query_embeddings:
             return []
 
-        # Just call the single search method for each embedding
+        queries = self._knn_queries(len(query_embeddings), top_k, category, categories)
+
+        # A plain pipeline, the one from ft() turns get() into FT.MGET
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.get(self._catalog_version_key())
+        for embedding, query in zip(query_embeddings, queries):
+            pipe.execute_command("FT.SEARCH", *self._search_args(query, embedding))
+        version, *raw_results = pipe.execute()
+
+        self._ensure_catalog(int(version or 0))
+        return self._hydrate_batch(raw_results, queries, score_threshold)
+
+    def _knn_queries(self, count: int, top_k: int, category: Optional[str],
+                     categories: Optional[List[Optional[str]]]) -> List[Query]:
+        categories = categories or [category] * count
+        queries = {c: self._build_knn_query(top_k, c) for c in set(categories)}
+        return [queries[c] for c in categories]
+
+    def _search_args(self, query: Query, embedding: np.ndarray) -> List[Any]:
+        """FT.SEARCH arguments for a raw pipelined call"""
         return [
-            self.search_filters(embedding, top_k, category, score_threshold)
-            for embedding in query_embeddings
+            self.config.redis_index_name,
+            *query.get_args(),
+            "PARAMS", 2, "vec", np.asarray(embedding, dtype=np.float32).tobytes(),
         ]
 
+    def _hydrate_batch(self, raw_results: List[Any], queries: List[Query],
+                       score_threshold: float) -> List[List[Dict[str, Any]]]:
+        batch_results = []
+        for raw, query in zip(raw_results, queries):
+            # Pipelined replies come back unparsed, wrap them the same way Search.search does
+            results = Result(
+                raw,
+                True,
+                has_payload=query._with_payloads,
+                with_scores=query._with_scores,
+                field_encodings=query._return_fields_decode_as,
+            )
+            batch_results.append(self._hydrate(results, score_threshold))
+
+        return batch_results
+
+    def pool_stats(self) -> Optional[Dict[str, int]]:
+        return pool_stats(self.redis_client.connection_pool)
+
+
+class AsyncRedisFilterStore:
+    """redis.asyncio front end for RedisFilterStore's batched KNN search.
+
+    Query building, the in-process catalog and hydration are shared with the
+    sync store, only the pipeline round trip is awaited. The asyncio pool is
+    bound to the event loop that first searches; calls from any other loop
+    run the sync search on a worker thread instead.
+    """
+
+    def __init__(self, store: RedisFilterStore, config=RedisConfig):
+        self.store = store
+        self.config = config
+        self.redis_client: Optional[redis.asyncio.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client(self) -> Optional[redis.asyncio.Redis]:
+        loop = asyncio.get_running_loop()
+        if self.redis_client is None:
+            self.redis_client = create_async_redis_client(self.config)
+            self._loop = loop
+        return self.redis_client if loop is self._loop else None
+
+    @instrumented("redis.knn")
+    async def search_filters_batch(self,
+                                   query_embeddings: List[np.ndarray],
+                                   top_k: int = 1,
+                                   category: Optional[str] = None,
+                                   score_threshold: float = 0.5,
+                                   categories: Optional[List[Optional[str]]] = None) -> List[List[Dict[str, Any]]]:
+        """Async variant of RedisFilterStore.search_filters_batch"""
+        if not query_embeddings:
+            return []
+
+        client = self._client()
+        if client is None:
+            return await asyncio.to_thread(
+                self.store.search_filters_batch, query_embeddings, top_k, category, score_threshold, categories
+            )
+
+        queries = self.store._knn_queries(len(query_embeddings), top_k, category, categories)
+
+        pipe = client.pipeline(transaction=False)
+        pipe.get(self.store._catalog_version_key())
+        for embedding, query in zip(query_embeddings, queries):
+            pipe.execute_command("FT.SEARCH", *self.store._search_args(query, embedding))
+        version, *raw_results = await pipe.execute()
+
+        version = int(version or 0)
+        if version != self.store._catalog_version:
+            # Catalog reloads use the sync pool, keep them off the loop
+            await asyncio.to_thread(self.store._ensure_catalog, version)
+        return self.store._hydrate_batch(raw_results, queries, score_threshold)
+
+    def pool_stats(self) -> Optional[Dict[str, int]]:
+        return pool_stats(self.redis_client.connection_pool) if self.redis_client is not None else None
+
+    async def aclose(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+
+
+@lazy_singleton
+def get_redis_store() -> RedisFilterStore:
+    """Shared RedisFilterStore, built on first use"""
+    return RedisFilterStore()
 
 
-# Singleton instance
-redis_store = RedisFilterStore()
\ No newline at end of file
+@lazy_singleton
+def get_async_redis_store() -> AsyncRedisFilterStore:
+    """Shared AsyncRedisFilterStore on top of get_redis_store()"""
+    return AsyncRedisFilterStore(get_redis_store())
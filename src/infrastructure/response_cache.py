@@ -0,0 +1,151 @@
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import re
+import threading
+
+import numpy as np
+
+from config.settings import CacheConfig
+from src.infrastructure.cache import LRUCache
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    return re.sub(r"\s+", " ", query or "").strip().rstrip(".!?").strip().lower()
+
+
+def _canonical_filters(active_filters: List[Any]) -> List[str]:
+    canonical = []
+    for active_filter in active_filters or []:
+        data = asdict(active_filter) if is_dataclass(active_filter) else dict(active_filter)
+        canonical.append(json.dumps(data, sort_keys=True, default=str))
+    return sorted(canonical)
+
+
+def _hash(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Response cache for the chat workflow.
+
+    Exact hits are keyed by a canonical hash of the normalized query and
+    active filters. With a similarity threshold set, a miss falls back to the
+    most similar cached query embedding under the same active filters.
+    Everything is dropped when the filter catalog version changes.
+    """
+
+    def __init__(self,
+                 max_entries: int = 5000,
+                 ttl: Optional[float] = 3600,
+                 similarity_threshold: Optional[float] = None,
+                 embedding_service=None):
+        self.entries = LRUCache(max_entries, ttl=ttl)
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embedding_service = embedding_service if similarity_threshold else None
+
+        # filters hash -> [(entry key, unit query embedding)]
+        self._semantic_index: Dict[str, List[Tuple[str, np.ndarray]]] = {}
+        self._catalog_version = None
+        self._lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, embedding_service=None, config=CacheConfig) -> "ResponseCache":
+        return cls(
+            max_entries=config.response_cache_size,
+            ttl=config.response_cache_ttl,
+            similarity_threshold=config.response_cache_similarity_threshold,
+            embedding_service=embedding_service
+        )
+
+    def _keys(self, query: str, active_filters: List[Any]) -> Tuple[str, str, str]:
+        normalized = normalize_query(query)
+        filters_key = _hash(_canonical_filters(active_filters))
+        return normalized, filters_key, _hash([normalized, filters_key])
+
+    def _embed(self, normalized_query: str) -> np.ndarray:
+        embedding = np.asarray(self.embedding_service.embed_batch([normalized_query])[0], dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _check_catalog_version(self, catalog_version: Any):
+        with self._lock:
+            if catalog_version != self._catalog_version:
+                self.entries.clear()
+                self._semantic_index.clear()
+                self._catalog_version = catalog_version
+
+    def get(self, query: str, active_filters: List[Any], catalog_version: Any = None) -> Optional[Dict[str, Any]]:
+        self._check_catalog_version(catalog_version)
+        normalized, filters_key, key = self._keys(query, active_filters)
+
+        response = self.entries.get(key)
+        if response is not None:
+            self.exact_hits += 1
+            return dict(response)
+
+        if self.embedding_service is not None and normalized:
+            response = self._semantic_lookup(normalized, filters_key)
+            if response is not None:
+                self.semantic_hits += 1
+                return dict(response)
+
+        self.misses += 1
+        return None
+
+    def _semantic_lookup(self, normalized: str, filters_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            candidates = list(self._semantic_index.get(filters_key, []))
+        if not candidates:
+            return None
+
+        query_embedding = self._embed(normalized)
+        similarities = np.stack([embedding for _, embedding in candidates]) @ query_embedding
+
+        for index in np.argsort(-similarities):
+            if similarities[index] < self.similarity_threshold:
+                break
+            response = self.entries.get(candidates[index][0])
+            if response is not None:
+                return response
+
+        return None
+
+    def set(self, query: str, active_filters: List[Any], response: Dict[str, Any], catalog_version: Any = None):
+        self._check_catalog_version(catalog_version)
+        normalized, filters_key, key = self._keys(query, active_filters)
+
+        self.entries.set(key, dict(response))
+
+        if self.embedding_service is not None and normalized:
+            embedding = self._embed(normalized)
+            with self._lock:
+                # Drop keys the LRU already evicted or expired, keep the index bounded
+                candidates = [
+                    (k, e) for k, e in self._semantic_index.get(filters_key, [])
+                    if k != key and k in self.entries
+                ]
+                candidates.append((key, embedding))
+                self._semantic_index[filters_key] = candidates[-self.max_entries:]
+
+    def invalidate(self):
+        with self._lock:
+            self.entries.clear()
+            self._semantic_index.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
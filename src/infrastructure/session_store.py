@@ -0,0 +1,133 @@
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, List, Optional
+import json
+import logging
+
+from config.settings import SessionConfig
+from src.infrastructure.cache import LRUCache
+from src.models.domain_models import ActiveFilter, SessionState
+
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownSession(LookupError):
+    """A client-supplied session_id with no stored session: expired, evicted or on another worker"""
+
+
+def _filter_to_dict(active_filter: Any) -> Dict[str, Any]:
+    return asdict(active_filter) if is_dataclass(active_filter) else dict(active_filter)
+
+
+def to_active_filter(data: Any) -> ActiveFilter:
+    """API clients send plain dicts, nodes work with ActiveFilter"""
+    if isinstance(data, ActiveFilter):
+        return data
+    return ActiveFilter(
+        filter_id=data.get('filter_id', ''),
+        filter_name=data.get('filter_name', ''),
+        description=data.get('description', ''),
+        operator=data.get('operator', ''),
+        value=data.get('value', '')
+    )
+
+
+def apply_filter_delta(active_filters: List[ActiveFilter], delta: Dict[str, Any]) -> List[ActiveFilter]:
+    """Apply a client-side change to the session's filters.
+
+    delta keys, applied in this order:
+        clear:  true drops every filter
+        remove: filter names to drop
+        add:    filters to set, replacing any active filter with the same name
+    """
+    if delta.get('clear'):
+        active_filters = []
+
+    removed = set(delta.get('remove') or [])
+    added = [to_active_filter(f) for f in delta.get('add') or []]
+    replaced = removed | {f.filter_name for f in added}
+
+    return [f for f in active_filters if f.filter_name not in replaced] + added
+
+
+class SessionStore:
+    """Active filters and pending clarifications per session_id.
+
+    Sessions expire `ttl` seconds after their last update. With a Redis client
+    sessions are shared across workers, otherwise they live in a process-local
+    LRU bounded by max_size.
+    """
+
+    def __init__(self,
+                 max_size: int = 10000,
+                 ttl: Optional[int] = None,
+                 redis_client=None,
+                 prefix: str = "session"):
+        self.memory = LRUCache(max_size, ttl=ttl) if redis_client is None else None
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_config(cls, config=SessionConfig) -> "SessionStore":
+        backend = config.session_store_backend or "memory"
+        redis_client = None
+        if backend == "redis":
+            from src.infrastructure.redis_client import create_redis_client
+            redis_client = create_redis_client()
+        elif backend != "memory":
+            raise ValueError(f"Unknown session store backend: {backend}")
+
+        return cls(max_size=config.session_max_sessions, ttl=config.session_ttl, redis_client=redis_client)
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}:{session_id}"
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        key = self._key(session_id)
+
+        if self.redis_client is None:
+            entry = self.memory.get(key)
+        else:
+            try:
+                value = self.redis_client.get(key)
+            except Exception as e:
+                logger.warning(f"Session lookup failed: {e}")
+                return None
+            entry = json.loads(value) if value is not None else None
+
+        if entry is None:
+            return None
+
+        return SessionState(
+            active_filters=[ActiveFilter(**f) for f in entry["active_filters"]],
+            clarification_request=entry["clarification_request"]
+        )
+
+    def save(self, session_id: str, active_filters: List[Any], clarification_request: List[Dict[str, Any]]):
+        key = self._key(session_id)
+        entry = {
+            "active_filters": [_filter_to_dict(f) for f in active_filters],
+            "clarification_request": clarification_request,
+        }
+
+        if self.redis_client is None:
+            self.memory.set(key, entry)
+            return
+
+        try:
+            self.redis_client.set(key, json.dumps(entry, default=_filter_to_dict), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Session write failed: {e}")
+
+    def delete(self, session_id: str):
+        key = self._key(session_id)
+
+        if self.redis_client is None:
+            self.memory.pop(key)
+            return
+
+        try:
+            self.redis_client.delete(key)
+        except Exception as e:
+            logger.warning(f"Session delete failed: {e}")
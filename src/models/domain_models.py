@@ -1,8 +1,22 @@
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass
+from typing import Annotated, List, Dict, Any, Optional, Union
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
-@dataclass
+# Per-session memo entries kept in the checkpoint, oldest are dropped first
+MEMO_MAX_ENTRIES = 256
+
+
+def merge_memo(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """State reducer: nodes return only new memo entries, they are merged into the session's memo"""
+    if not update:
+        return current
+    merged = {**current, **update}
+    if len(merged) > MEMO_MAX_ENTRIES:
+        merged = dict(list(merged.items())[-MEMO_MAX_ENTRIES:])
+    return merged
+
+
+@dataclass(slots=True)
 class ExtractedConcept:
     """What the LLM extracts from user query"""
     text: str  # "age > 59"
@@ -11,7 +25,7 @@ class ExtractedConcept:
     filter_name: Optional[str] = None
     category: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class FilterMatch:
     """Result of RAG matching concept to filter"""
     filter_id: str
@@ -22,7 +36,7 @@ class FilterMatch:
     confidence: float  # From RAG similarity
     matched_concept: str  # Which concept matched this
 
-@dataclass
+@dataclass(slots=True)
 class ActiveFilter:
     """A filter ready to be applied"""
     filter_id: str
@@ -50,6 +64,29 @@ class FilterState:
     session_id: str
     # timestamp: datetime
     message: str = ""
+    fast_path_applied: bool = False  # Rule-based extractor covered the whole query
+    # Survive between turns through the graph checkpointer (thread_id = session_id)
+    match_memo: Annotated[Dict[str, List[Dict[str, Any]]], merge_memo] = field(default_factory=dict)  # concept -> search hits
+    fill_memo: Annotated[Dict[str, Dict[str, Any]], merge_memo] = field(default_factory=dict)  # concept + filter -> filled value
+
+# FilterState fields merged by a reducer rather than replaced
+REDUCED_FIELDS = {"match_memo": merge_memo, "fill_memo": merge_memo}
+
+
+def apply_update(state: FilterState, update: Dict[str, Any]) -> FilterState:
+    """Apply a node's partial update the way the graph does, for callers running nodes directly"""
+    if not update:
+        return state
+    return replace(state, **{
+        key: REDUCED_FIELDS[key](getattr(state, key), value) if key in REDUCED_FIELDS else value
+        for key, value in update.items()
+    })
+
+@dataclass
+class SessionState:
+    """What the server remembers between turns of a session"""
+    active_filters: List[ActiveFilter]
+    clarification_request: List[Dict[str, Any]]
 
 @dataclass
 class Message:
@@ -0,0 +1,30 @@
+from typing import List, Dict, Any
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_searchable_text(filter_doc: Dict[str, Any]) -> str:
+    """Create searchable text from filter definition"""
+    parts = []
+
+    if "displayName" in filter_doc:
+        parts.append(filter_doc["displayName"])
+    if "description" in filter_doc:
+        parts.append(filter_doc["description"])
+    if "keywords" in filter_doc and isinstance(filter_doc["keywords"], list):
+        parts.extend(filter_doc["keywords"])
+
+    return ", ".join(parts)
+
+
+def load_catalog(vector_store, filter_documents: List[Dict[str, Any]], embedding_service):
+    """Embed filter definitions and load them into a vector store"""
+    texts = [create_searchable_text(filter_doc) for filter_doc in filter_documents]
+
+    logger.info(f"Generating embeddings for {len(texts)} documents...")
+    embeddings = embedding_service.embed_batch(texts)
+
+    vector_store.create_index()
+    vector_store.add_documents(texts, filter_documents, embeddings)
@@ -0,0 +1,158 @@
+import re
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from src.models.domain_models import ActiveFilter, ExtractedConcept
+
+
+# Words users wrap around a filter name ("remove the age filter")
+NOISE_WORDS = {"the", "a", "an", "my", "all", "filter", "filters", "criteria", "criterion"}
+
+# Cosine similarity a drop phrase needs to match an active filter name by embedding
+EMBEDDING_MATCH_THRESHOLD = 0.75
+
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+def name_key(text: str) -> str:
+    """Lowercased drop phrase with whitespace collapsed, compared against lowercased filter names"""
+    return " ".join((text or "").lower().split())
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _SEPARATORS.split((text or "").lower()) if t and t not in NOISE_WORDS]
+
+
+class ActiveFilterIndex:
+    """Index over a request's active filters for resolving drop requests.
+
+    Each drop concept resolves exact-first:
+      1. exact filter name ignoring case, whitespace and filler words,
+         e.g. "SSN" never matches "SSN 2"
+      2. token containment, the only filter name containing every drop
+         token ("age" -> "Client Age")
+      3. the reverse, the only filter name whose tokens all appear in the
+         drop phrase ("client age restriction" -> "Client Age")
+      4. embedding similarity of the drop phrase and filter names, only when
+         an embedding service is given and tokens found nothing
+    Ambiguous token or embedding matches drop nothing rather than guess.
+    """
+
+    def __init__(self, active_filters: List[ActiveFilter], embedding_service=None):
+        self.filters = active_filters
+        self.embedding_service = embedding_service
+
+        # Catalog display names are already single-spaced, lower() is enough and keeps the build cheap
+        self.names = [f.filter_name.lower() for f in active_filters]
+        self.by_name: Dict[str, List[int]] = {}
+        for index, name in enumerate(self.names):
+            self.by_name.setdefault(name, []).append(index)
+
+        # Built on the first drop that isn't an exact name
+        self._by_token: Optional[Dict[str, Set[int]]] = None
+        self._by_token_name: Optional[Dict[str, List[int]]] = None
+        self._filter_tokens: Optional[List[Set[str]]] = None
+        self._name_embeddings: Optional[np.ndarray] = None
+
+    def resolve(self, concept: ExtractedConcept) -> Set[int]:
+        """Indexes of the active filters a drop concept refers to"""
+        phrase = concept.filter_name or concept.text
+
+        exact = self.by_name.get(name_key(phrase))
+        if exact:
+            return set(exact)
+
+        tokens = _tokens(phrase)
+        if not tokens:
+            return set()
+
+        self._build_token_index()
+        exact = self._by_token_name.get(" ".join(tokens))
+        if exact:
+            return set(exact)
+
+        by_token = self._resolve_tokens(set(tokens))
+        if by_token is not None:
+            return by_token
+
+        contained = self._resolve_contained(set(tokens))
+        if contained is not None:
+            return contained
+
+        if self.embedding_service is not None:
+            return self._resolve_embedding(phrase)
+
+        return set()
+
+    def resolve_all(self, concepts: List[ExtractedConcept]) -> Set[int]:
+        dropped = set()
+        for concept in concepts:
+            dropped |= self.resolve(concept)
+        return dropped
+
+    def _build_token_index(self):
+        if self._by_token is not None:
+            return
+
+        self._by_token, self._by_token_name, self._filter_tokens = {}, {}, []
+        for index, active_filter in enumerate(self.filters):
+            tokens = _tokens(active_filter.filter_name)
+            self._filter_tokens.append(set(tokens))
+            self._by_token_name.setdefault(" ".join(tokens), []).append(index)
+            for token in tokens:
+                self._by_token.setdefault(token, set()).add(index)
+
+    def _resolve_tokens(self, tokens: Set[str]) -> Optional[Set[int]]:
+        postings = [self._by_token.get(token) for token in tokens]
+        if not all(postings):
+            return None
+
+        candidates = set.intersection(*postings)
+        if not candidates:
+            return None
+
+        # Several filters with the same name drop together, different names are ambiguous
+        if len({self.names[i] for i in candidates}) > 1:
+            return set()
+        return candidates
+
+    def _resolve_contained(self, tokens: Set[str]) -> Optional[Set[int]]:
+        candidates = set().union(*(self._by_token.get(token, ()) for token in tokens))
+        candidates = {i for i in candidates if self._filter_tokens[i] <= tokens}
+        if not candidates:
+            return None
+
+        if len({self.names[i] for i in candidates}) > 1:
+            return set()
+        return candidates
+
+    def _resolve_embedding(self, phrase: str) -> Set[int]:
+        if not self.filters:
+            return set()
+
+        if self._name_embeddings is None:
+            names = [f.filter_name for f in self.filters]
+            self._name_embeddings = self._normalized(self.embedding_service.embed_batch(names))
+
+        query = self._normalized(self.embedding_service.embed_batch([phrase]))[0]
+        similarities = self._name_embeddings @ query
+
+        order = np.argsort(-similarities, kind='stable')
+        best = int(order[0])
+        if similarities[best] < EMBEDDING_MATCH_THRESHOLD:
+            return set()
+        name = self.names[best]
+        runner_up = int(order[1]) if len(order) > 1 else None
+        if (runner_up is not None and np.isclose(similarities[runner_up], similarities[best])
+                and self.names[runner_up] != name):
+            return set()
+        return set(self.by_name[name])
+
+    @staticmethod
+    def _normalized(embeddings) -> np.ndarray:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
@@ -0,0 +1,217 @@
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.models.domain_models import ActiveFilter
+from src.infrastructure.document_ids import filter_document_id
+
+
+NUMBER = r"\$?(\d+(?:[.,]\d+)*)\s*(k|m|thousand|million)?\b"
+
+COMPARATORS = {
+    "GREATER_THAN": ["greater than", "more than", "older than", "higher than", "larger than", "over", "above", ">"],
+    "LESS_THAN": ["less than", "fewer than", "younger than", "lower than", "smaller than", "under", "below", "<"],
+    "EQUALS": ["equal to", "equals", "exactly", "="],
+}
+
+COMPARISON_PATTERN = re.compile(
+    r"(?P<comparator>" + "|".join(
+        re.escape(phrase) for phrases in COMPARATORS.values() for phrase in sorted(phrases, key=len, reverse=True)
+    ) + r")\s*" + NUMBER + r"(?:\s+years?(?:\s+old)?)?"
+)
+BETWEEN_PATTERN = re.compile(r"between\s+" + NUMBER + r"\s+(?:and|to|-)\s+" + NUMBER + r"(?:\s+years?(?:\s+old)?)?")
+DATE_RANGE_PATTERN = re.compile(r"(?:in|within|during)\s+(?:the\s+)?(?:last|past)\s+(\d+)\s+(day|week|month|year)s?\b")
+
+# Queries touching these need the LLM (drops, negations we can't express, free text)
+UNSUPPORTED_WORDS = {"remove", "drop", "delete", "clear", "without", "except", "exclude", "excluding",
+                     "instead", "replace", "change", "named", "called", "like", "contains", "starts", "ends"}
+
+STOPWORDS = {"find", "me", "show", "get", "list", "give", "search", "for", "all", "any", "clients", "client",
+             "customers", "customer", "people", "with", "who", "whose", "that", "which", "are", "is", "was",
+             "have", "has", "had", "been", "a", "an", "the", "of", "please", "and", "their", "those",
+             "them", "status", "in", "whom", "i", "want", "need", "only"}
+
+MULTIPLIERS = {"k": 1_000, "thousand": 1_000, "m": 1_000_000, "million": 1_000_000}
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z]+", text)
+
+
+def _tokens(text: str) -> List[str]:
+    # Words plus every other character on its own, so a stray ">" or "!" counts as uncovered.
+    # Periods are sentence punctuation, numbers keep theirs inside NUMBER matches
+    return re.findall(r"[a-z]+|[^\sa-z.]", text)
+
+
+def _parse_number(digits: str, suffix: Optional[str]):
+    value = float(digits.replace(",", ""))
+    value *= MULTIPLIERS.get(suffix or "", 1)
+    return int(value) if value.is_integer() else value
+
+
+class RuleBasedExtractor:
+    """Deterministic extractor for simple, unambiguous queries.
+
+    Handles numeric comparisons, last-N-days date ranges and option matches
+    against the operators/options metadata of the filter catalog. Returns
+    filters only when every word of the query is accounted for, otherwise
+    None so the caller falls back to the LLM.
+    """
+
+    def __init__(self, filter_documents: List[Dict[str, Any]]):
+        self.filters = filter_documents
+        self.terms: List[Set[str]] = [
+            {_stem(w) for w in _words(" ".join([doc.get("displayName", "")] + doc.get("keywords", [])).lower())}
+            for doc in filter_documents
+        ]
+
+        # option word -> (filter index, option label); options shared by several filters are ambiguous
+        option_owners: Dict[str, List[Tuple[int, str]]] = {}
+        for index, doc in enumerate(filter_documents):
+            for option in doc.get("options", []):
+                option_owners.setdefault(option.lower(), []).append((index, option))
+        self.options = {word: owners[0] for word, owners in option_owners.items() if len(owners) == 1}
+        self.option_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(word) for word in sorted(self.options, key=len, reverse=True)) + r")\b"
+        ) if self.options else None
+
+    def extract(self, query: str) -> Optional[List[ActiveFilter]]:
+        """Return filters covering the whole query, or None to fall back to the LLM"""
+        # "!" survives only as part of "!=", which must not be read as "="
+        text = re.sub(r"[^\w\s$<>=.,!-]|!(?!=)", " ", query.lower())
+        if not text.strip() or UNSUPPORTED_WORDS & set(_words(text)):
+            return None
+
+        # Protect "between X and Y" before splitting clauses on "and"
+        text = BETWEEN_PATTERN.sub(lambda m: m.group(0).replace(" and ", " to "), text)
+
+        filters = []
+        for clause in re.split(r"\band\b|,(?!\d)|;", text):
+            clause_filters = self._extract_alternatives(clause)
+            if clause_filters is None:
+                return None
+            filters.extend(clause_filters)
+
+        names = [f.filter_name for f in filters]
+        if not filters or len(names) != len(set(names)):
+            return None
+
+        return filters
+
+    def _extract_alternatives(self, clause: str) -> Optional[List[ActiveFilter]]:
+        """A clause whose "or" may only join options of one filter, e.g. "divorced or widowed".
+
+        "or" between different filters is a disjunction the filter list can't
+        express, so the query goes to the LLM instead of being read as "and".
+        """
+        alternatives = [self._extract_clause(part) for part in re.split(r"\bor\b", clause)]
+        if any(filters is None for filters in alternatives):
+            return None
+        if len(alternatives) == 1:
+            return alternatives[0]
+
+        if any(len(filters) != 1 for filters in alternatives):
+            return None
+        first = alternatives[0][0]
+        for (active_filter,) in alternatives:
+            if (active_filter.filter_name != first.filter_name or active_filter.operator != "EQUALS"
+                    or not isinstance(active_filter.value, list)):
+                return None
+
+        labels = [label for (active_filter,) in alternatives for label in active_filter.value]
+        return [ActiveFilter(filter_id=first.filter_id, filter_name=first.filter_name, description=first.description,
+                             operator=first.operator, value=list(dict.fromkeys(labels)))]
+
+    def _extract_clause(self, clause: str) -> Optional[List[ActiveFilter]]:
+        clause_terms = {_stem(w) for w in _words(clause) if w not in STOPWORDS}
+        remaining = clause
+        found = []
+
+        # Option values, e.g. "married", "single or divorced"
+        option_values: Dict[int, List[str]] = {}
+        if self.option_pattern is not None:
+            for match in self.option_pattern.finditer(clause):
+                index, label = self.options[match.group(1)]
+                option_values.setdefault(index, []).append(label)
+            remaining = self.option_pattern.sub(" ", remaining)
+        for index, labels in option_values.items():
+            found.append((index, None, list(dict.fromkeys(labels))))
+
+        # Numeric comparisons, at most one per clause
+        numeric = list(BETWEEN_PATTERN.finditer(remaining))
+        comparisons = list(COMPARISON_PATTERN.finditer(remaining))
+        if len(numeric) + len(comparisons) > 1:
+            return None
+        if numeric:
+            match = numeric[0]
+            operator = "BETWEEN"
+            value = [_parse_number(match.group(1), match.group(2)), _parse_number(match.group(3), match.group(4))]
+            remaining = remaining.replace(match.group(0), " ")
+        elif comparisons:
+            match = comparisons[0]
+            operator = next(op for op, phrases in COMPARATORS.items() if match.group("comparator") in phrases)
+            value = _parse_number(match.group(2), match.group(3))
+            remaining = remaining.replace(match.group(0), " ")
+        if numeric or comparisons:
+            index = self._best_filter(clause_terms, "NUMBER", operator)
+            if index is None:
+                return None
+            found.append((index, operator, value))
+
+        # Relative date ranges, e.g. "not contacted in the last 90 days"
+        dates = list(DATE_RANGE_PATTERN.finditer(remaining))
+        if len(dates) > 1:
+            return None
+        if dates:
+            match = dates[0]
+            negated = "not" in _words(remaining)
+            operator = "NOT_WITHIN" if negated else "WITHIN"
+            index = self._best_filter(clause_terms, "DATE", operator)
+            if index is None:
+                return None
+            amount, unit = match.group(1), match.group(2)
+            found.append((index, operator, f"{amount} {unit}" + ("" if amount == "1" else "s")))
+            remaining = remaining.replace(match.group(0), " ")
+            if negated:
+                remaining = re.sub(r"\bnot\b", " ", remaining)
+
+        # Full coverage: whatever is left must be filler or names of the filters we picked. Digits and
+        # symbols never are, e.g. the ">" of ">=" or the "!" of "!=" left next to a matched "="
+        covered = set().union(*(self.terms[index] for index, _, _ in found)) if found else set()
+        leftover = [t for t in _tokens(remaining) if t not in STOPWORDS and _stem(t) not in covered]
+        if leftover:
+            return None
+
+        return [self._active_filter(index, operator, value) for index, operator, value in found]
+
+    def _best_filter(self, clause_terms: Set[str], filter_type: str, operator: str) -> Optional[int]:
+        scored = [
+            (len(clause_terms & self.terms[index]), index)
+            for index, doc in enumerate(self.filters)
+            if doc.get("type") == filter_type and operator in doc.get("operators", [])
+        ]
+        scored = [item for item in scored if item[0] > 0]
+        if not scored:
+            return None
+
+        scored.sort(reverse=True)
+        if len(scored) > 1 and scored[0][0] == scored[1][0]:
+            return None
+        return scored[0][1]
+
+    def _active_filter(self, index: int, operator: Optional[str], value: Any) -> ActiveFilter:
+        doc = self.filters[index]
+        return ActiveFilter(
+            filter_id=filter_document_id(doc),
+            filter_name=doc.get("displayName", ""),
+            description=doc.get("description", ""),
+            operator=operator or "EQUALS",
+            value=value
+        )
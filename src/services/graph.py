@@ -1,11 +1,16 @@
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
+from src.infrastructure.metrics import instrumented
 from src.models.domain_models import FilterState
-from nodes import GraphNodes
+from src.services.nodes import GraphNodes
 
 class NLP2FiltersGraph:
-    def __init__(self, nodes: GraphNodes):
+    def __init__(self, nodes: GraphNodes, checkpointer=None):
         self.nodes = nodes
+        self.checkpointer = checkpointer
         self.graph = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
@@ -13,23 +18,88 @@ class NLP2FiltersGraph:
         workflow = StateGraph(FilterState)
 
         # workflow.add_node("mask_pii", mask_pii_node)
-        workflow.add_node("extract_concepts", self.nodes.extract_concepts_node)
-        workflow.add_node("handle_drops", self.nodes.handle_drops_node)
-        workflow.add_node("match_filters", self.nodes.match_filters_node)
-        workflow.add_node("fill_values", self.nodes.fill_values_node)
-        workflow.add_node("prepare_response", self.nodes.prepare_response_node)
+        workflow.add_node("fast_path", self._timed_node("fast_path", self.nodes.fast_path_node))
+        # LLM-bound nodes carry both implementations: invoke() runs the sync one,
+        # ainvoke()/astream() await the async one instead of blocking a worker thread
+        workflow.add_node("extract_concepts", self._timed_node(
+            "extract_concepts", self.nodes.extract_concepts_node, self.nodes.aextract_concepts_node
+        ))
+        workflow.add_node("handle_drops", self._timed_node("handle_drops", self.nodes.handle_drops_node))
+        workflow.add_node("match_filters", self._timed_node(
+            "match_filters", self.nodes.match_filters_node, self.nodes.amatch_filters_node
+        ))
+        workflow.add_node("fill_values", self._timed_node(
+            "fill_values", self.nodes.fill_values_node, self.nodes.afill_values_node
+        ))
+        workflow.add_node("prepare_response", self._timed_node("prepare_response", self.nodes.prepare_response_node))
 
         # workflow.add_edge("mask_pii", "extract_concepts")
+        workflow.add_conditional_edges(
+            "fast_path", self._route_after_fast_path, ["extract_concepts", "prepare_response"]
+        )
         workflow.add_edge("extract_concepts", "handle_drops")
         workflow.add_edge("handle_drops", "match_filters")
         workflow.add_edge("match_filters", "fill_values")
         workflow.add_edge("fill_values", "prepare_response")
         workflow.add_edge("prepare_response", END)
 
-        workflow.set_entry_point("extract_concepts")
+        workflow.set_entry_point("fast_path")
+
+        return workflow.compile(checkpointer=self.checkpointer)
+
+    @staticmethod
+    def _timed_node(name: str, func, afunc=None):
+        """Node wrapped so every run is recorded under the node.<name> stage"""
+        stage = instrumented(f"node.{name}")
+        if afunc is None:
+            return stage(func)
+        return RunnableLambda(stage(func), afunc=stage(afunc), name=name)
 
-        return workflow.compile()
+    @staticmethod
+    def _route_after_fast_path(state: FilterState) -> str:
+        """Skip both LLM calls when the fast path already produced the filters"""
+        return "prepare_response" if state.fast_path_applied else "extract_concepts"
+
+    def _run_config(self, state) -> Optional[Dict[str, Any]]:
+        """One checkpoint thread per session, so memos carry over between its turns"""
+        if self.checkpointer is None:
+            return None
+        session_id = state["session_id"] if isinstance(state, dict) else state.session_id
+        return {"configurable": {"thread_id": session_id}}
 
     def invoke(self, state: FilterState) -> FilterState:
         """Execute graph"""
-        return self.graph.invoke(state)
\ No newline at end of file
+        return self.graph.invoke(state, self._run_config(state))
+
+    async def ainvoke(self, state: FilterState) -> FilterState:
+        """Execute graph asynchronously"""
+        return await self.graph.ainvoke(state, self._run_config(state))
+
+    def load_memos(self, session_id: str) -> Dict[str, Any]:
+        """match_memo and fill_memo from the session's checkpoint, for callers running nodes outside the graph"""
+        if self.checkpointer is None:
+            return {}
+        values = self.graph.get_state({"configurable": {"thread_id": session_id}}).values
+        return {key: values[key] for key in ("match_memo", "fill_memo") if key in values}
+
+    def save_state(self, state: FilterState):
+        """Checkpoint a turn run outside the graph as if prepare_response had just finished"""
+        if self.checkpointer is not None:
+            self.graph.update_state(self._run_config(state), vars(state), as_node="prepare_response")
+
+    def delete_session(self, session_id: str):
+        """Forget the session's checkpoints"""
+        if self.checkpointer is not None:
+            self.checkpointer.delete_thread(session_id)
+
+    def stream(self, state: FilterState) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Execute graph, yielding (node name, state update) as each node completes"""
+        for chunk in self.graph.stream(state, self._run_config(state), stream_mode="updates"):
+            for node_name, update in chunk.items():
+                yield node_name, update or {}
+
+    async def astream(self, state: FilterState) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async variant of stream()"""
+        async for chunk in self.graph.astream(state, self._run_config(state), stream_mode="updates"):
+            for node_name, update in chunk.items():
+                yield node_name, update or {}
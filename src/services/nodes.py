@@ -1,124 +1,268 @@
+import asyncio
 import json
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import LLMConfig, VectorStoreConfig
 
 from src.models.domain_models import FilterState, ExtractedConcept, FilterMatch, ActiveFilter
-from src.infrastructure.llm_client import LLMService
+from src.infrastructure.llm_client import LLMService, AsyncLLMService
 from src.infrastructure.embedding_client import EmbeddingService
-from src.infrastructure.redis_client import RedisFilterStore
-from src.infrastructure.pii_client import PIIService
-
-current_file_dir = Path(__file__).parent
-prompts_dir = current_file_dir / '../../config/prompts'
-template_env = Environment(loader=FileSystemLoader(prompts_dir))
+from src.infrastructure.redis_client import RedisFilterStore, AsyncRedisFilterStore
+from src.infrastructure.pii_client import PIIService, get_pii_service
+from src.infrastructure.concept_cache import ConceptCache
+from src.services.prompts import PromptLibrary
+from src.services.fast_path import RuleBasedExtractor
+from src.services.drop_matcher import ActiveFilterIndex
+from src.services.value_filling import fill_key, plan_fill_chunks, parse_fill_results
 
 class GraphNodes:
+    """Graph node implementations.
+
+    Nodes return partial updates, only the fields they changed: the graph
+    merges them into the state (memo fields through merge_memo), callers
+    running nodes directly use apply_update.
+    """
+
+    # KNN parameters for concept matching
+    MATCH_SEARCH = {"top_k": 2, "score_threshold": 0.3}
+
     def __init__(self,
                  llm_service: LLMService,
                  embedding_service: EmbeddingService,
                  vector_store: RedisFilterStore,
-                 pii_service: PIIService):
+                 pii_service: Optional[PIIService] = None,
+                 async_llm_service: Optional[AsyncLLMService] = None,
+                 concept_cache: Optional[ConceptCache] = None,
+                 prompts: Optional[PromptLibrary] = None,
+                 fast_path: Optional[RuleBasedExtractor] = None,
+                 fill_config=LLMConfig,
+                 search_config=VectorStoreConfig,
+                 async_vector_store: Optional[AsyncRedisFilterStore] = None):
         self.llm_service = llm_service
+        self.async_llm_service = async_llm_service
+        self.concept_cache = concept_cache
+        self.prompts = prompts or PromptLibrary()
+        self.fast_path = fast_path
+        self.fill_config = fill_config
+        self.category_prefilter = search_config.category_prefilter
         self.embedding_service = embedding_service
         self.vector_store = vector_store
+        self.async_vector_store = async_vector_store
         self.pii_service = pii_service
 
-    def mask_pii_node(self, state: FilterState) -> FilterState:
+    def mask_pii_node(self, state: FilterState) -> Dict[str, Any]:
         """Mask PII in user query"""
         query = state.query or ""
 
+        if self.pii_service is None:
+            self.pii_service = get_pii_service()
+
         masked_query, pii_mappings = self.pii_service.mask_text(query)
 
-        return FilterState(
-            query=masked_query,
-            pii_mappings=pii_mappings,  # Updated
-            concepts=state.concepts,
-            matched_filters=state.matched_filters,
-            clarification_request=state.clarification_request,
-            active_filters=state.active_filters,
-            message=state.message,
-            session_id=state.session_id
-        )
+        return {"query": masked_query, "pii_mappings": pii_mappings}
 
-    def extract_concepts_node(self, state: FilterState) -> FilterState:
-        """Extract filter concepts from query using LLM"""
-        query = state.query or ""
-        active_filters = state.active_filters or []
+    def fast_path_node(self, state: FilterState) -> Dict[str, Any]:
+        """Apply filters directly when the rule-based extractor covers the whole query"""
+        if self.fast_path is None:
+            return {}
 
-        template = template_env.get_template('concept_extraction.jinja2')
+        filters = self.fast_path.extract(state.query or "")
+        if filters is None:
+            return {}
 
-        system_prompt = template.render(current_filters=active_filters)
+        new_names = {f.filter_name for f in filters}
+        active_filters = [f for f in state.active_filters or [] if f.filter_name not in new_names]
 
-        response = self.llm_service.generate_completion(
-            system_prompt=system_prompt,
-            user_prompt=query,
-            json_mode=True
-        )
+        return {"active_filters": active_filters + filters, "fast_path_applied": True}
+
+    def _concept_extraction_prompt(self, state: FilterState) -> str:
+        return self.prompts.concept_extraction(state.active_filters or [])
 
+    def _parse_concepts(self, response: str) -> Optional[List[ExtractedConcept]]:
         try:
             concepts_data = json.loads(response)
-            concepts = [ExtractedConcept(**c) for c in concepts_data]
+            return [ExtractedConcept(**c) for c in concepts_data]
         except Exception as e:
             print(f"Error parsing concepts: {e}")
-            concepts = []
-
-        return FilterState(
-            query=state.query,
-            # pii_mappings=state.pii_mappings,
-            concepts=concepts,
-            matched_filters=state.matched_filters,
-            clarification_request=state.clarification_request,
-            active_filters=state.active_filters,
-            message=state.message,
-            session_id=state.session_id
+            return None
+
+    def _active_filter_names(self, state: FilterState) -> List[str]:
+        return [f.filter_name for f in state.active_filters or []]
+
+    def _cached_concepts(self, state: FilterState) -> Optional[List[ExtractedConcept]]:
+        if self.concept_cache is None:
+            return None
+        return self.concept_cache.get(state.query or "", self._active_filter_names(state))
+
+    def _with_concepts(self, state: FilterState, response: str, latency: float) -> Dict[str, Any]:
+        concepts = self._parse_concepts(response)
+
+        if concepts is not None and self.concept_cache is not None:
+            self.concept_cache.set(state.query or "", self._active_filter_names(state), concepts, latency)
+
+        return {"concepts": concepts or []}
+
+    def extract_concepts_node(self, state: FilterState) -> Dict[str, Any]:
+        """Extract filter concepts from query using LLM"""
+        cached = self._cached_concepts(state)
+        if cached is not None:
+            return {"concepts": cached}
+
+        start = time.perf_counter()
+        response = self.llm_service.generate_completion(
+            system_prompt=self._concept_extraction_prompt(state),
+            user_prompt=state.query or "",
+            json_mode=True
         )
 
-    def handle_drops_node(self, state: FilterState) -> FilterState:
-        """Handle filter removal requests"""
-        concepts = state.concepts.copy() if state.concepts else []
-        active_filters = state.active_filters.copy() if state.active_filters else []
+        return self._with_concepts(state, response, time.perf_counter() - start)
 
-        drop_concepts = [c for c in concepts if c.action == "drop"]
-        concepts = [c for c in concepts if c.action != "drop"]
+    async def aextract_concepts_node(self, state: FilterState) -> Dict[str, Any]:
+        """Async variant of extract_concepts_node"""
+        if self.async_llm_service is None:
+            return await asyncio.to_thread(self.extract_concepts_node, state)
+
+        cached = self._cached_concepts(state)
+        if cached is not None:
+            return {"concepts": cached}
+
+        start = time.perf_counter()
+        response = await self.async_llm_service.generate_completion(
+            system_prompt=self._concept_extraction_prompt(state),
+            user_prompt=state.query or "",
+            json_mode=True
+        )
 
+        return self._with_concepts(state, response, time.perf_counter() - start)
+
+    def handle_drops_node(self, state: FilterState) -> Dict[str, Any]:
+        """Handle filter removal requests"""
+        concepts = state.concepts or []
+        drop_concepts = [c for c in concepts if c.action == "drop"]
         if not drop_concepts:
-            return state
+            return {}
 
-        for concept in drop_concepts:
-            concept_lower = concept.filter_name.lower()
-            active_filters = [
-                f for f in active_filters
-                if f.filter_name.lower() not in concept_lower
-            ]
+        update = {"concepts": [c for c in concepts if c.action != "drop"]}
 
-        return FilterState(
-            query=state.query,
-            # pii_mappings=state.pii_mappings,
-            concepts=concepts,  # Updated
-            matched_filters=state.matched_filters,
-            clarification_request=state.clarification_request,
-            active_filters=active_filters,  # Updated
-            message=state.message,
-            session_id=state.session_id
-        )
+        active_filters = state.active_filters or []
+        dropped = ActiveFilterIndex(active_filters, self.embedding_service).resolve_all(drop_concepts)
+        if dropped:
+            update["active_filters"] = [f for i, f in enumerate(active_filters) if i not in dropped]
+        return update
 
-    def match_filters_node(self, state: FilterState) -> FilterState:
+    def match_filters_node(self, state: FilterState) -> Dict[str, Any]:
         """Match extracted concepts to available filters using batch processing"""
+        return self.match_filters_batch([state])[0]
 
-        if not state.concepts:
-            return state
+    async def amatch_filters_node(self, state: FilterState) -> Dict[str, Any]:
+        """Async variant of match_filters_node"""
+        return (await self.amatch_filters_batch([state]))[0]
 
-        matched_filters = state.matched_filters.copy() if state.matched_filters else []
+    def match_filters_batch(self, states: List[FilterState]) -> List[Dict[str, Any]]:
+        """Match the concepts of several states with one embedding call and one batched vector search.
 
-        concept_texts = [', '.join([concept.text] + concept.generated_keywords) for concept in state.concepts]
+        Returns one update per state. Concepts already in a state's match_memo
+        (seen earlier in the session, same catalog version) reuse the memoized
+        search hits.
+        """
+        if not any(state.concepts for state in states):
+            return [{} for _ in states]
 
-        embeddings = self.embedding_service.embed_batch(concept_texts)
+        memo_keys, misses = self._match_plan(states)
 
-        batch_results = self.redis_store.search_filters_batch(
-            embeddings,
-            top_k=2,
-            score_threshold=0.3
-        )
+        searched = {}
+        if misses:
+            embeddings, categories = self._embed_misses(misses)
+            batch_results = self.vector_store.search_filters_batch(
+                embeddings, categories=categories, **self.MATCH_SEARCH
+            )
+
+            # A wrong or unknown category must not cost the match, retry those unfiltered
+            retry = [i for i, (c, results) in enumerate(zip(categories, batch_results)) if c and not results]
+            if retry:
+                retried = self.vector_store.search_filters_batch([embeddings[i] for i in retry], **self.MATCH_SEARCH)
+                for i, results in zip(retry, retried):
+                    batch_results[i] = results
+
+            searched = dict(zip(misses, batch_results))
+
+        return self._match_updates(states, memo_keys, searched)
+
+    async def amatch_filters_batch(self, states: List[FilterState]) -> List[Dict[str, Any]]:
+        """Async variant of match_filters_batch, the vector searches are awaited on the async store"""
+        if self.async_vector_store is None:
+            return await asyncio.to_thread(self.match_filters_batch, states)
+
+        if not any(state.concepts for state in states):
+            return [{} for _ in states]
+
+        memo_keys, misses = await asyncio.to_thread(self._match_plan, states)
+
+        searched = {}
+        if misses:
+            embeddings, categories = await asyncio.to_thread(self._embed_misses, misses)
+            batch_results = await self.async_vector_store.search_filters_batch(
+                embeddings, categories=categories, **self.MATCH_SEARCH
+            )
+
+            retry = [i for i, (c, results) in enumerate(zip(categories, batch_results)) if c and not results]
+            if retry:
+                retried = await self.async_vector_store.search_filters_batch(
+                    [embeddings[i] for i in retry], **self.MATCH_SEARCH
+                )
+                for i, results in zip(retry, retried):
+                    batch_results[i] = results
+
+            searched = dict(zip(misses, batch_results))
+
+        return self._match_updates(states, memo_keys, searched)
+
+    def _match_plan(self, states: List[FilterState]) -> Tuple[List[List[str]], Dict[str, Tuple[str, Optional[str]]]]:
+        """Memo keys per state's concepts, and the searches missing from the memos"""
+        catalog_version = self.vector_store.catalog_version()
+        memo_keys = [
+            [f"{catalog_version}\x00{self._search_category(concept) or ''}\x00"
+             f"{', '.join([concept.text] + concept.generated_keywords)}"
+             for concept in state.concepts or []]
+            for state in states
+        ]
+
+        # memo key -> (concept text to embed, category), deduplicated across the batch
+        misses = {}
+        for state, keys in zip(states, memo_keys):
+            for key in keys:
+                if key not in state.match_memo:
+                    _, category, text = key.split("\x00", 2)
+                    misses[key] = (text, category or None)
+
+        return memo_keys, misses
+
+    def _embed_misses(self, misses: Dict[str, Tuple[str, Optional[str]]]) -> Tuple[List, List[Optional[str]]]:
+        texts, categories = zip(*misses.values())
+        return self.embedding_service.embed_batch(list(texts)), list(categories)
+
+    def _match_updates(self, states: List[FilterState], memo_keys: List[List[str]],
+                       searched: Dict[str, List[dict]]) -> List[Dict[str, Any]]:
+        updates = []
+        for state, keys in zip(states, memo_keys):
+            if not state.concepts:
+                updates.append({})
+                continue
+
+            new_memo = {key: searched[key] for key in keys if key not in state.match_memo}
+            results = [state.match_memo[key] if key in state.match_memo else searched[key] for key in keys]
+            updates.append(self._with_matches(state, results, new_memo))
+
+        return updates
+
+    def _search_category(self, concept: ExtractedConcept) -> Optional[str]:
+        return concept.category if self.category_prefilter and concept.category else None
+
+    def _with_matches(self, state: FilterState, batch_results: List[List[dict]], match_memo: dict) -> Dict[str, Any]:
+        new_matches = []
 
         HIGH_CONFIDENCE_THRESHOLD = 0.5
         CLOSE_CONFIDENCE_GAP = 0.3
@@ -150,98 +294,188 @@ class GraphNodes:
                     confidence=match["confidence"],
                     matched_concept=concept.text
                 )
-                matched_filters.append(filter_match)
-
-        return FilterState(
-            query=state.query,
-            # pii_mappings=state.pii_mappings,
-            concepts=state.concepts,
-            matched_filters=matched_filters,  # Updated
-            clarification_request=state.clarification_request,
-            active_filters=state.active_filters,
-            message=state.message,
-            session_id=state.session_id
+                new_matches.append(filter_match)
+
+        update = {"match_memo": match_memo}  # New entries only, merged by the reducer
+        if new_matches:
+            update["matched_filters"] = (state.matched_filters or []) + new_matches
+        return update
+
+    def _fill_chunks(self, matches: List[FilterMatch]) -> List[List[FilterMatch]]:
+        return plan_fill_chunks(
+            matches,
+            max_matches_per_call=self.fill_config.fill_max_matches_per_call,
+            token_budget=self.fill_config.fill_token_budget,
+            max_parallel_calls=self.fill_config.fill_max_parallel_calls
         )
 
-    def fill_values_node(self, state: FilterState) -> FilterState:
-        """Fill in filters using LLM to select operators and values"""
-        if not state.matched_filters:
-            return state
-
-        template = template_env.get_template('value_filling.jinja2')
-        system_prompt = template.render(matched_filters=state.matched_filters)
+    def _fill_request(self, matches: List[FilterMatch]) -> dict:
+        # Parsed here item by item, so skip the service's all-or-nothing JSON handling
+        return {"system_prompt": self.prompts.value_filling(matches), "user_prompt": "", "json_mode": False}
 
+    def _call_fill(self, matches: List[FilterMatch]):
         try:
-            response = self.llm_service.generate_completion(
-                system_prompt=system_prompt,
-                user_prompt="",
-                json_mode=True
+            return self.llm_service.generate_completion(**self._fill_request(matches))
+        except Exception as e:
+            return e
+
+    def _collect_fill_results(self, chunks, responses, results: dict, lost: List[FilterMatch]) -> List[FilterMatch]:
+        """Merge chunk responses into results, return the matches to retry.
+
+        Calls that failed outright already went through the LLM service's own
+        retries, their matches go to lost instead of being asked again.
+        """
+        retry = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                print(f"Error processing LLM response: {response}")
+                lost.extend(chunk)
+                continue
+
+            chunk_results, failed = parse_fill_results(response, chunk)
+            results.update(chunk_results)
+            retry.extend(failed)
+        return retry
+
+    _fill_key = staticmethod(fill_key)
+
+    def _memoized_fills(self, state: FilterState) -> dict:
+        """Filled values from earlier turns of the session, by fill key"""
+        return {
+            self._fill_key(match): state.fill_memo[self._fill_key(match)]
+            for match in state.matched_filters if self._fill_key(match) in state.fill_memo
+        }
+
+    def _with_filled_values(self, state: FilterState, llm_results: dict,
+                            failed: List[FilterMatch]) -> Dict[str, Any]:
+        """State update from the filled values, llm_results keyed by fill key.
+
+        Each concept adds its own filter, so "older than 30 but younger than 60"
+        adds two Client Age filters; they replace active filters of that name.
+        """
+        failed_keys = {self._fill_key(match) for match in failed}
+
+        # Group filters by matched_concept to identify duplicates
+        concept_groups = {}
+        for match in state.matched_filters:
+            concept = match.matched_concept
+            if concept not in concept_groups:
+                concept_groups[concept] = []
+            concept_groups[concept].append(match)
+
+        added_filters: Dict[str, ActiveFilter] = {}
+        new_clarification_requests = []
+
+        for concept, matches in concept_groups.items():
+            if len(matches) > 1:
+                options = []
+                for match in matches:
+                    if self._fill_key(match) in failed_keys:
+                        continue
+                    llm_result = llm_results.get(self._fill_key(match), {})
+                    options.append({
+                        'filter_id': match.filter_id,
+                        'filter_name': match.filter_name,
+                        'operator': llm_result.get('operator', 'EQUAL'),
+                        'value': llm_result.get('value', '')
+                    })
+
+                if not options:
+                    continue
+
+                clarification = {
+                    'concept_text': concept,
+                    'options': options
+                }
+                new_clarification_requests.append(clarification)
+            else:
+                match = matches[0]
+                if self._fill_key(match) in failed_keys:
+                    continue
+                llm_result = llm_results.get(self._fill_key(match), {})
+
+                active_filter = ActiveFilter(
+                    filter_id=match.filter_id,
+                    filter_name=match.filter_name,
+                    description=match.description,
+                    operator=llm_result.get('operator', 'EQUAL'),
+                    value=llm_result.get('value', ''),
+                )
+                # The latest one goes last
+                added_filters.pop(self._fill_key(match), None)
+                added_filters[self._fill_key(match)] = active_filter
+
+        update = {
+            "fill_memo": {
+                self._fill_key(match): llm_results[self._fill_key(match)]
+                for match in state.matched_filters
+                if self._fill_key(match) in llm_results and self._fill_key(match) not in state.fill_memo
+            }
+        }
+        if added_filters:
+            active_filters = state.active_filters or []
+            replaced = {f.filter_name for f in added_filters.values()}
+            update["active_filters"] = [
+                f for f in active_filters if f.filter_name not in replaced
+            ] + list(added_filters.values())
+        if new_clarification_requests:
+            update["clarification_request"] = (state.clarification_request or []) + new_clarification_requests
+        return update
+
+    def fill_values_node(self, state: FilterState) -> Dict[str, Any]:
+        """Fill in filters using LLM to select operators and values.
+
+        Matches filled earlier in the session come from fill_memo. The rest
+        are split into parallel calls when large (see plan_fill_chunks), and
+        only the items that failed to parse are sent again.
+        """
+        if not state.matched_filters:
+            return {}
+
+        results, lost = self._memoized_fills(state), []
+        pending = [match for match in state.matched_filters if self._fill_key(match) not in results]
+        for _ in range(1 + self.fill_config.fill_parse_retries):
+            if not pending:
+                break
+            chunks = self._fill_chunks(pending)
+            if len(chunks) == 1:
+                responses = [self._call_fill(chunks[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                    # Each call runs in a copy of this context, so its timing lands in the request's breakdown
+                    futures = [executor.submit(copy_context().run, self._call_fill, chunk) for chunk in chunks]
+                    responses = [future.result() for future in futures]
+
+            pending = self._collect_fill_results(chunks, responses, results, lost)
+
+        return self._with_filled_values(state, results, pending + lost)
+
+    async def afill_values_node(self, state: FilterState) -> Dict[str, Any]:
+        """Async variant of fill_values_node"""
+        if not state.matched_filters:
+            return {}
+
+        if self.async_llm_service is None:
+            return await asyncio.to_thread(self.fill_values_node, state)
+
+        results, lost = self._memoized_fills(state), []
+        pending = [match for match in state.matched_filters if self._fill_key(match) not in results]
+        for _ in range(1 + self.fill_config.fill_parse_retries):
+            if not pending:
+                break
+            chunks = self._fill_chunks(pending)
+            responses = await asyncio.gather(
+                *(self.async_llm_service.generate_completion(**self._fill_request(chunk)) for chunk in chunks),
+                return_exceptions=True
             )
 
-            filter_results = json.loads(response)
-
-            # Group filters by matched_concept to identify duplicates
-            concept_groups = {}
-            for match in state.matched_filters:
-                concept = match.matched_concept
-                if concept not in concept_groups:
-                    concept_groups[concept] = []
-                concept_groups[concept].append(match)
-
-            new_active_filters = state.active_filters.copy() if state.active_filters else []
-            new_clarification_requests = state.clarification_request.copy() if state.clarification_request else []
-
-            llm_results_by_name = {result['filter_display_name']: result for result in filter_results}
-
-            for concept, matches in concept_groups.items():
-                if len(matches) > 1:
-                    options = []
-                    for match in matches:
-                        llm_result = llm_results_by_name.get(match.filter_name, {})
-                        options.append({
-                            'filter_id': match.filter_id,
-                            'filter_name': match.filter_name,
-                            'operator': llm_result.get('operator', 'EQUAL'),
-                            'value': llm_result.get('value', '')
-                        })
-
-                    clarification = {
-                        'concept_text': concept,
-                        'options': options
-                    }
-                    new_clarification_requests.append(clarification)
-                else:
-                    match = matches[0]
-                    llm_result = llm_results_by_name.get(match.filter_name, {})
-
-                    active_filter = ActiveFilter(
-                        filter_id=match.filter_id,
-                        filter_name=match.filter_name,
-                        description=match.description,
-                        operator=llm_result.get('operator', 'EQUAL'),
-                        value=llm_result.get('value', ''),
-                    )
-                    new_active_filters = [f for f in new_active_filters if f.filter_name != match.filter_name]
-                    new_active_filters.append(active_filter)
+            pending = self._collect_fill_results(chunks, responses, results, lost)
 
-        except Exception as e:
-            print(f"Error processing LLM response: {e}")
-            return state
-
-        return FilterState(
-            query=state.query,
-            # pii_mappings=state.pii_mappings,
-            concepts=state.concepts,
-            matched_filters=state.matched_filters,
-            clarification_request=new_clarification_requests,
-            active_filters=new_active_filters,
-            message=state.message,
-            session_id=state.session_id
-        )
+        return self._with_filled_values(state, results, pending + lost)
 
-    def prepare_response_node(self, state: FilterState) -> FilterState:
+    def prepare_response_node(self, state: FilterState) -> Dict[str, Any]:
         """Prepare final response with unmasked values"""
-        active_filters = state.active_filters.copy() if state.active_filters else []
+        active_filters = state.active_filters or []
         clarification_request = state.clarification_request or []
         # pii_mappings = state.pii_mappings or {}
 
@@ -260,13 +494,4 @@ class GraphNodes:
         #     if isinstance(filter_item.value, str):
         #         filter_item.value = pii_service.unmask_text(filter_item.value, pii_mappings)
 
-        return FilterState(
-            query=state.query,
-            # pii_mappings=state.pii_mappings,
-            concepts=state.concepts,
-            matched_filters=state.matched_filters,
-            clarification_request=state.clarification_request,
-            active_filters=active_filters,
-            message=message,  # Updated
-            session_id=state.session_id
-        )
\ No newline at end of file
+        return {"message": message}
\ No newline at end of file
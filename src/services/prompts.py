@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import Any, List
+
+from jinja2 import Environment, FileSystemLoader
+
+
+current_file_dir = Path(__file__).parent
+prompts_dir = current_file_dir / '../../config/prompts'
+
+
+class PromptLibrary:
+    """System prompts compiled once at startup.
+
+    Each prompt is split into a large static preamble, rendered a single time,
+    and a small dynamic tail rendered per request. Keeping the preamble
+    byte-identical across requests also makes it eligible for provider-side
+    prompt caching.
+    """
+
+    def __init__(self, templates_dir: Path = prompts_dir):
+        env = Environment(loader=FileSystemLoader(templates_dir), auto_reload=False)
+
+        self.concept_extraction_prefix = env.get_template('concept_extraction.jinja2').render()
+        self.value_filling_prefix = env.get_template('value_filling.jinja2').render()
+
+        self._concept_extraction_tail = env.get_template('concept_extraction_filters.jinja2')
+        self._value_filling_tail = env.get_template('value_filling_matches.jinja2')
+
+    def concept_extraction(self, current_filters: List[Any]) -> str:
+        tail = self._concept_extraction_tail.render(current_filters=current_filters)
+        return f"{self.concept_extraction_prefix}\n{tail}"
+
+    def value_filling(self, matched_filters: List[Any]) -> str:
+        tail = self._value_filling_tail.render(matched_filters=matched_filters)
+        return f"{self.value_filling_prefix}\n{tail}"
@@ -0,0 +1,130 @@
+import json
+import math
+from typing import Any, Dict, List, Tuple
+
+from src.models.domain_models import FilterMatch
+
+
+# Rough completion size of one filled filter, operator + value + short reasoning
+OUTPUT_TOKENS_PER_MATCH = 50
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, good enough for budgeting prompt chunks"""
+    return len(text) // 4 + 1
+
+
+def match_cost(match: FilterMatch) -> int:
+    """Estimated prompt + completion tokens a match adds to a value filling call"""
+    rendered = json.dumps({
+        "filter_name": match.filter_name,
+        "operators": match.operators,
+        "options": match.options,
+        "matched_concept": match.matched_concept,
+    })
+    return estimate_tokens(rendered) + OUTPUT_TOKENS_PER_MATCH
+
+
+def plan_fill_chunks(matches: List[FilterMatch],
+                     max_matches_per_call: int,
+                     token_budget: int,
+                     max_parallel_calls: int) -> List[List[FilterMatch]]:
+    """Split matches into the prompts to send for value filling.
+
+    Small requests go out as a single call. When the match count or the
+    estimated token cost exceeds a single call's budget, matches are spread
+    over up to `max_parallel_calls` calls of roughly equal cost, so the
+    slowest call (and with it the request) stays bounded. Matches of the same
+    concept always share a call.
+    """
+    groups: Dict[str, List[FilterMatch]] = {}
+    for match in matches:
+        groups.setdefault(match.matched_concept, []).append(match)
+
+    total_cost = sum(match_cost(match) for match in matches)
+    num_calls = max(
+        math.ceil(len(matches) / max(1, max_matches_per_call)),
+        math.ceil(total_cost / max(1, token_budget)),
+    )
+    num_calls = max(1, min(num_calls, max_parallel_calls, len(groups)))
+
+    if num_calls == 1:
+        return [list(matches)]
+
+    # Longest-processing-time first: biggest group goes to the cheapest call
+    chunks: List[List[FilterMatch]] = [[] for _ in range(num_calls)]
+    costs = [0] * num_calls
+    for group in sorted(groups.values(), key=lambda g: sum(map(match_cost, g)), reverse=True):
+        cheapest = costs.index(min(costs))
+        chunks[cheapest].extend(group)
+        costs[cheapest] += sum(map(match_cost, group))
+
+    return chunks
+
+
+def fill_key(match: FilterMatch) -> str:
+    """Identifies a match's filled value, one filter can be matched by several concepts of a query"""
+    return f"{match.matched_concept}\x00{match.filter_name}"
+
+
+def _json_objects(response: str) -> Tuple[List[Any], bool]:
+    """Parse an LLM JSON array, salvaging complete objects from a malformed one.
+
+    Returns the items and whether the response parsed cleanly.
+    """
+    try:
+        data = json.loads(response)
+        return (data if isinstance(data, list) else [data]), True
+    except json.JSONDecodeError:
+        pass
+
+    decoder = json.JSONDecoder()
+    items = []
+    index = response.find('{')
+    while index != -1:
+        try:
+            item, end = decoder.raw_decode(response, index)
+            items.append(item)
+            index = response.find('{', end)
+        except json.JSONDecodeError:
+            index = response.find('{', index + 1)
+
+    return items, False
+
+
+def parse_fill_results(response: str, matches: List[FilterMatch]) -> Tuple[Dict[str, Dict[str, Any]], List[FilterMatch]]:
+    """Map a value filling response to {fill_key(match): result}.
+
+    Items are matched by filter display name, and by the echoed
+    matched_concept when several concepts of the call share a filter, e.g.
+    "older than 30" and "younger than 60" both matching Client Age.
+
+    Returns the results and the matches that need a retry. A match is retried
+    only when the response was malformed and no valid entry for it survived;
+    filters the LLM deliberately left out of a clean response are not retried.
+    """
+    keys_by_name: Dict[str, Dict[str, str]] = {}  # filter name -> matched_concept -> fill key
+    for match in matches:
+        keys_by_name.setdefault(match.filter_name, {})[match.matched_concept] = fill_key(match)
+    items, clean = _json_objects(response)
+
+    results = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get('filter_display_name') not in keys_by_name:
+            clean = False
+            continue
+        if 'operator' not in item or 'value' not in item:
+            clean = False
+            continue
+
+        keys = keys_by_name[item['filter_display_name']]
+        key = next(iter(keys.values())) if len(keys) == 1 else keys.get(item.get('matched_concept'))
+        if key is None:
+            clean = False
+            continue
+        results[key] = item
+
+    if clean:
+        return results, []
+
+    return results, [match for match in matches if fill_key(match) not in results]
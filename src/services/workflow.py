@@ -0,0 +1,47 @@
+from config.settings import VectorStoreConfig, CacheConfig, FastPathConfig, SessionConfig
+from scripts.sample_filters import SAMPLE_FILTERS
+from src.infrastructure.llm_client import get_llm_service, get_async_llm_service
+from src.infrastructure.embedding_client import get_embedding_service
+from src.infrastructure.redis_client import RedisFilterStore, get_redis_store, get_async_redis_store
+from src.infrastructure.memory_store import InMemoryFilterStore
+from src.infrastructure.concept_cache import ConceptCache
+from src.infrastructure.checkpointer import create_checkpointer
+from src.services.catalog import load_catalog
+from src.services.fast_path import RuleBasedExtractor
+from src.services.graph import NLP2FiltersGraph
+from src.services.nodes import GraphNodes
+
+
+def create_vector_store(config=VectorStoreConfig):
+    """Select filter store backend from config"""
+    if config.vector_store_backend == "memory":
+        store = InMemoryFilterStore(config)
+        load_catalog(store, SAMPLE_FILTERS, get_embedding_service())
+        return store
+
+    if config.vector_store_backend == "redis":
+        return get_redis_store()
+
+    raise ValueError(f"Unknown vector store backend: {config.vector_store_backend}")
+
+
+def create_workflow(cache_config=CacheConfig,
+                    fast_path_config=FastPathConfig,
+                    session_config=SessionConfig) -> NLP2FiltersGraph:
+    concept_cache = ConceptCache.from_config(cache_config) if cache_config.concept_cache_enabled else None
+    fast_path = RuleBasedExtractor(SAMPLE_FILTERS) if fast_path_config.fast_path_enabled else None
+
+    vector_store = create_vector_store()
+    nodes = GraphNodes(
+        llm_service=get_llm_service(),
+        embedding_service=get_embedding_service(),
+        vector_store=vector_store,
+        # PII masking isn't wired into the graph, so spaCy is only loaded if mask_pii_node runs
+        pii_service=None,
+        async_llm_service=get_async_llm_service(),
+        concept_cache=concept_cache,
+        fast_path=fast_path,
+        # The in-memory store searches in-process, only Redis round trips are worth awaiting
+        async_vector_store=get_async_redis_store() if isinstance(vector_store, RedisFilterStore) else None
+    )
+    return NLP2FiltersGraph(nodes, checkpointer=create_checkpointer(session_config))
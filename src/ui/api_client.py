@@ -0,0 +1,28 @@
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+import requests
+
+
+def iter_sse_events(response: requests.Response) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Parse a text/event-stream response into (event, data) pairs"""
+    event, data_lines = "message", []
+
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
+def stream_chat(api_url: str, request_data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """POST to /api/chat/stream and yield events as graph nodes complete"""
+    with requests.post(f"{api_url}/api/chat/stream", json=request_data, stream=True, timeout=None) as response:
+        response.raise_for_status()
+        yield from iter_sse_events(response)
@@ -4,6 +4,8 @@ from typing import List, Dict, Any, Optional
 from colorama import init, Fore, Style
 import textwrap
 
+from src.ui.api_client import stream_chat
+
 init()
 
 mock_suggestions = {'concept_text': 'Washington', 'options': [
@@ -12,12 +14,13 @@ mock_suggestions = {'concept_text': 'Washington', 'options': [
 ]}
 
 class ConsoleFilterAssistant:
-    def __init__(self, api_url: str = "http://localhost:5000"):
+    def __init__(self, api_url: str = "http://localhost:5000", stream: bool = True):
         self.api_url = api_url
+        self.stream = stream
         self.active_filters = []
         self.clarification_request = []
         self.chat_history = []
-        self.session_id = str(uuid.uuid4())
+        self.session_id = None  # assigned by the server on the first query
 
     def display_banner(self):
         """Display welcome banner"""
@@ -106,7 +109,8 @@ class ConsoleFilterAssistant:
             'operator': selected_option['operator'],
             'value': selected_option['value']
         }
-        self.active_filters.append(new_filter)
+        if not self.update_session({'add': [new_filter]}):
+            return True  # valid selection, the error is already shown
 
         display_text = f"{selected_option['filter_name']} {selected_option['operator']} '{selected_option['value']}'"
         print(f"{Fore.GREEN}✓ Applied filter: {display_text}{Style.RESET_ALL}")
@@ -115,20 +119,88 @@ class ConsoleFilterAssistant:
 
         return True
 
+    def resync_delta(self, filter_delta: Dict[str, Any]) -> Dict[str, Any]:
+        """The same change as a full replacement built from the local filters, for a session the server lost"""
+        if filter_delta.get('clear'):
+            return filter_delta
+        added = filter_delta.get('add') or []
+        replaced = set(filter_delta.get('remove') or []) | {f['filter_name'] for f in added}
+        kept = [f for f in self.active_filters if f.get('filter_name') not in replaced]
+        return {'clear': True, 'add': kept + added}
+
+    def update_session(self, filter_delta: Dict[str, Any]) -> bool:
+        """Send a filter change to the server-side session and mirror the result"""
+        if self.session_id is None:
+            self.session_id = str(uuid.uuid4())
+            filter_delta = self.resync_delta(filter_delta)
+        try:
+            url = f"{self.api_url}/api/session/{self.session_id}"
+            response = requests.patch(url, json=filter_delta, timeout=10)
+            if response.status_code == 409:
+                response = requests.patch(url, json=self.resync_delta(filter_delta), timeout=10)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"{Fore.RED}❌ Error: could not update filters ({e}){Style.RESET_ALL}")
+            return False
+
+        session = response.json()
+        self.active_filters = session.get('active_filters', [])
+        self.clarification_request = session.get('clarification_request', [])
+        return True
+
+    def display_progress(self, event: str, data: Dict[str, Any]):
+        """Render partial results while the server is still working"""
+        if event == "concepts_extracted":
+            concepts = ", ".join(c.get('text', '') for c in data.get('concepts', []))
+            print(f"{Fore.BLUE}  🔎 Understood: {concepts or 'no criteria'}{Style.RESET_ALL}")
+        elif event == "matches_found":
+            matches = ", ".join(dict.fromkeys(m.get('filter_name', '') for m in data.get('matched_filters', [])))
+            print(f"{Fore.BLUE}  🧩 Matched filters: {matches or 'none'}{Style.RESET_ALL}")
+        elif event == "filters_filled":
+            print(f"{Fore.BLUE}  ⚙️  Filling in values...{Style.RESET_ALL}")
+
+    def process_query_stream(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Consume /api/chat/stream, showing progress, and return the final response"""
+        try:
+            for event, data in stream_chat(self.api_url, request_data):
+                if event in ("done", "error"):
+                    return data
+                self.display_progress(event, data)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 409 or "active_filters" in request_data:
+                raise
+            # The server lost the session, resend the filters shown here
+            return self.process_query_stream({**request_data, "active_filters": self.active_filters})
+
+        return {
+            "error": "Stream ended without a response",
+            "message": "Failed to process query"
+        }
+
     def process_query(self, query: str) -> Dict[str, Any]:
         """Send query to API and get response"""
         try:
+            # Filters live in the server-side session, only the query goes over the wire.
+            # A 409 means the server lost the session, the filters are then resent once
             request_data = {
                 "query": query,
-                "active_filters": self.active_filters,
                 "session_id": self.session_id
             }
 
+            if self.stream:
+                return self.process_query_stream(request_data)
+
             response = requests.post(
                 f"{self.api_url}/api/chat",
                 json=request_data,
                 timeout=None
             )
+            if response.status_code == 409:
+                response = requests.post(
+                    f"{self.api_url}/api/chat",
+                    json={**request_data, "active_filters": self.active_filters},
+                    timeout=None
+                )
 
             if response.status_code == 200:
                 return response.json()
@@ -226,9 +298,8 @@ class ConsoleFilterAssistant:
                     continue
 
                 elif user_input.lower() == 'clear':
-                    self.active_filters = []
-                    self.clarification_request = []
-                    print(f"{Fore.GREEN}✅ All filters cleared!{Style.RESET_ALL}")
+                    if self.update_session({'clear': True}):
+                        print(f"{Fore.GREEN}✅ All filters cleared!{Style.RESET_ALL}")
                     continue
 
                 elif user_input.lower() == 'history':
@@ -264,7 +335,7 @@ class ConsoleFilterAssistant:
                 traceback.print_exc()
 
 
-def run_console_app(api_url: str = "http://localhost:5000"):
+def run_console_app(api_url: str = "http://localhost:5000", stream: bool = True):
     """Run the console application"""
-    app = ConsoleFilterAssistant(api_url)
+    app = ConsoleFilterAssistant(api_url, stream=stream)
     app.run()
\ No newline at end of file
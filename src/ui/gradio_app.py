@@ -1,8 +1,17 @@
 import gradio as gr
 import json
 import datetime
+import itertools
+import os
 from functools import partial  # For creating event handlers with arguments
 
+import requests
+
+from src.ui.api_client import stream_chat
+
+# Point at the Flask API (e.g. http://localhost:5001) to use the real pipeline instead of the mock
+FILTER_API_URL = os.getenv("FILTER_API_URL")
+
 # --- Filter Definitions (This would be extensive, loaded from config) ---
 ALL_POSSIBLE_FILTERS_CONFIG = {
     "marital_status": {
@@ -212,7 +221,8 @@ def handle_drop_filter_button_click(
 def handle_chat_submit(
         user_message: str,
         chat_history: list,
-        current_active_filter_data_from_state: dict
+        current_active_filter_data_from_state: dict,
+        api_session: dict = None
 ):
     if current_active_filter_data_from_state is None:
         current_active_filter_data_from_state = {}
@@ -231,10 +241,117 @@ def handle_chat_submit(
     return (
         chat_history,
         new_active_filter_data_for_state,
+        api_session,
         ""
     )
 
 
+STREAM_PROGRESS_MESSAGES = {
+    "concepts_extracted": lambda data: "Understood: " + (
+        ", ".join(c.get("text", "") for c in data.get("concepts", [])) or "no criteria"),
+    "matches_found": lambda data: "Matched filters: " + (
+        ", ".join(dict.fromkeys(m.get("filter_name", "") for m in data.get("matched_filters", []))) or "none"),
+    "filters_filled": lambda data: "Filling in values...",
+}
+
+
+def pane_filter_delta(server_filters: list, pane_filters: dict) -> dict:
+    """Edits and drops made in the filters pane, as a filter_delta against the server's filters.
+
+    The pane only holds name -> value, edited filters are sent back as the
+    server's own dicts (filter_id, operator, ...) with the new value.
+    """
+    delta = {
+        "remove": [f["filter_name"] for f in server_filters if f["filter_name"] not in pane_filters],
+        "add": [
+            {**f, "value": pane_filters[f["filter_name"]]}
+            for f in server_filters
+            if f["filter_name"] in pane_filters and pane_filters[f["filter_name"]] != f.get("value")
+        ],
+    }
+    return {key: value for key, value in delta.items() if value}
+
+
+def open_chat_stream(request_data: dict, resend_data: dict):
+    """stream_chat, retried once with resend_data if the server answers 409 (unknown session)"""
+    events = stream_chat(FILTER_API_URL, request_data)
+    try:
+        first = next(events, None)  # The HTTP status is only checked once the stream is started
+    except requests.exceptions.HTTPError as e:
+        if e.response is None or e.response.status_code != 409:
+            raise
+        events = stream_chat(FILTER_API_URL, resend_data)
+        first = next(events, None)
+
+    return itertools.chain([first] if first else [], events)
+
+
+def handle_chat_submit_streaming(
+        user_message: str,
+        chat_history: list,
+        current_active_filter_data_from_state: dict,
+        api_session: dict
+):
+    """Same contract as handle_chat_submit, backed by /api/chat/stream.
+    Yields after every graph node so partial results show up immediately.
+
+    Filters live in the server-side session: only the query, the session_id
+    and the pane's edits go over the wire. api_session keeps the session_id
+    and the full filter dicts of the last response, which are resent if the
+    server lost the session (409).
+    """
+    current_active_filter_data_from_state = current_active_filter_data_from_state or {}
+    api_session = api_session or {"session_id": None, "active_filters": []}
+
+    chat_history.append((user_message, None))
+    chat_history.append((None, "Working on it..."))
+    yield chat_history, current_active_filter_data_from_state, api_session, ""
+
+    filter_delta = pane_filter_delta(api_session["active_filters"], current_active_filter_data_from_state)
+    request_data = {"query": user_message, "session_id": api_session["session_id"]}
+    if filter_delta:
+        request_data["filter_delta"] = filter_delta
+
+    # The server lost the session, resend the filters shown in the pane
+    resend_data = {
+        "query": user_message,
+        "session_id": api_session["session_id"],
+        "active_filters": [
+            {**f, "value": current_active_filter_data_from_state[f["filter_name"]]}
+            for f in api_session["active_filters"] if f["filter_name"] in current_active_filter_data_from_state
+        ]
+    }
+
+    progress = []
+    try:
+        for event, data in open_chat_stream(request_data, resend_data):
+            if event == "done":
+                api_session = {"session_id": data.get("session_id"), "active_filters": data.get("active_filters", [])}
+                new_active_filter_data_for_state = {
+                    f["filter_name"]: f.get("value") for f in api_session["active_filters"]
+                }
+                chat_history[-1] = (None, data.get("message", ""))
+                yield chat_history, new_active_filter_data_for_state, api_session, ""
+                return
+
+            if event == "error":
+                chat_history[-1] = (None, data.get("message", "Sorry, an error occurred."))
+                yield chat_history, current_active_filter_data_from_state, api_session, ""
+                return
+
+            if event in STREAM_PROGRESS_MESSAGES:
+                progress.append(STREAM_PROGRESS_MESSAGES[event](data))
+                chat_history[-1] = (None, "\n".join(progress))
+                yield chat_history, current_active_filter_data_from_state, api_session, ""
+
+    except Exception as e:
+        chat_history[-1] = (None, f"Sorry, an error occurred: {e}")
+        yield chat_history, current_active_filter_data_from_state, api_session, ""
+
+
+chat_submit_handler = handle_chat_submit_streaming if FILTER_API_URL else handle_chat_submit
+
+
 theme = gr.themes.Soft(
     primary_hue=gr.themes.colors.sky,
     secondary_hue=gr.themes.colors.blue,
@@ -243,6 +360,8 @@ theme = gr.themes.Soft(
 
 with gr.Blocks(theme=theme) as demo:
     active_filter_data_state = gr.State({})
+    # Server session_id and full filter dicts, only used with FILTER_API_URL
+    api_session_state = gr.State({"session_id": None, "active_filters": []})
 
     gr.Markdown("# LLM Filter Assistant")
     gr.Markdown(
@@ -282,14 +401,14 @@ with gr.Blocks(theme=theme) as demo:
     )
 
     chat_submit_btn.click(
-        fn=handle_chat_submit,
-        inputs=[chat_input, chatbot, active_filter_data_state],
-        outputs=[chatbot, active_filter_data_state, chat_input]
+        fn=chat_submit_handler,
+        inputs=[chat_input, chatbot, active_filter_data_state, api_session_state],
+        outputs=[chatbot, active_filter_data_state, api_session_state, chat_input]
     )
     chat_input.submit(
-        fn=handle_chat_submit,
-        inputs=[chat_input, chatbot, active_filter_data_state],
-        outputs=[chatbot, active_filter_data_state, chat_input]
+        fn=chat_submit_handler,
+        inputs=[chat_input, chatbot, active_filter_data_state, api_session_state],
+        outputs=[chatbot, active_filter_data_state, api_session_state, chat_input]
     )
 
 if __name__ == "__main__":